@@ -0,0 +1,85 @@
+"""
+Requests/sec of the aggregate API on a single process
+
+Drives the ASGI app in-process (no network stack) so the numbers isolate the
+handler, filtering and response-cache cost. For an end-to-end figure run the
+app under uvicorn and point a load generator such as `wrk` or `hey` at it.
+
+    python benchmarks/bench_api.py [--requests 20000] [--concurrency 64]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dashboard import api
+
+QUERIES = [
+    ("/summary", "population=female"),
+    ("/summary", "population=male&state=Florida"),
+    ("/genders", "population=all"),
+    ("/states", "population=female&metric=depression"),
+    ("/states", "population=all&metric=distress"),
+    ("/groups", "by=Income_Group&gender_split=1"),
+    ("/groups", "by=Emotional_Support&population=female"),
+]
+
+
+async def request(path, query):
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": query.encode(),
+    }
+    sent = []
+
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message):
+        sent.append(message)
+
+    await api.app(scope, receive, send)
+    return sent[0]["status"]
+
+
+async def run(total, concurrency):
+    async def worker(offset):
+        for i in range(offset, total, concurrency):
+            path, query = QUERIES[i % len(QUERIES)]
+            await request(path, query)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    api.get_frame()
+    print(f"load:      {time.perf_counter() - start:8.3f} s")
+
+    # Cold: every query computed once from the resident frame
+    api._cache.clear()
+    start = time.perf_counter()
+    for path, query in QUERIES:
+        asyncio.run(request(path, query))
+    cold = (time.perf_counter() - start) / len(QUERIES)
+    print(f"uncached:  {cold * 1000:8.2f} ms/request")
+
+    elapsed = asyncio.run(run(args.requests, args.concurrency))
+    print(f"cached:    {args.requests / elapsed:8.0f} requests/s")
+
+
+if __name__ == "__main__":
+    main()
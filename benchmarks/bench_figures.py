@@ -0,0 +1,102 @@
+"""
+Chart output time per page: plain st.plotly_chart vs the cached figure layer
+
+Drives the app in-process with Streamlit's AppTest harness and times every
+`figures.plotly_chart` call on each page, three ways:
+
+- before: `VMH_FIGURE_CACHE_SIZE=0`, plain `st.plotly_chart` with Plotly's
+  default JSON engine (orjson when installed)
+- first: the layer with its cache cleared before each run, so every figure
+  is compacted and encoded
+- repeat: the layer on a rerun with nothing changed, so every chart is
+  replayed from the cache
+
+It also prints the Plotly JSON sent per page before and after float32
+typed arrays.
+
+    python benchmarks/bench_figures.py [--repeat 5] [--population "All Veterans"]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Pages with charts
+PAGES = [
+    "Executive Overview",
+    "Mental Health Analysis",
+    "Geographic Patterns",
+    "Trends Over Time",
+    "Intersectional Analysis",
+    "🔍 Interactive Explorer",
+    "Risk Factors",
+    "Recommendations",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--population", default="All Veterans")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+    import plotly.io as pio
+    from streamlit.testing.v1 import AppTest
+
+    from dashboard import figures
+
+    seconds = []
+    chart = figures.plotly_chart
+
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        chart(*args, **kwargs)
+        seconds.append(time.perf_counter() - start)
+
+    figures.plotly_chart = timed
+
+    def configure(mode):
+        figures.FIGURE_CACHE_SIZE = 0 if mode == "before" else 64
+        pio.json.config.default_engine = "auto" if mode == "before" else "json"
+
+    def run(app, mode):
+        """Median chart output ms per run of the current page, and JSON kB"""
+        configure(mode)
+        app.run()  # warm page imports, data caches and (for repeat) figures
+        totals = []
+        for _ in range(args.repeat):
+            if mode == "first":
+                figures._draw.clear()
+            seconds.clear()
+            app.run()
+            totals.append(sum(seconds))
+        size = sum(len(element.proto.spec) for element in app.get("plotly_chart"))
+        return statistics.median(totals) * 1000, size / 1000
+
+    app = AppTest.from_file(os.path.join(ROOT, "streamlit_app.py"), default_timeout=300)
+    app.run()
+    app.sidebar.radio[1].set_value(args.population)
+
+    print(
+        f"{'page':<26} {'before ms':>10} {'first ms':>9} {'repeat ms':>10} "
+        f"{'before kB':>10} {'after kB':>9}"
+    )
+    for page in PAGES:
+        app.sidebar.radio[0].set_value(page)
+        before, before_kb = run(app, "before")
+        first, after_kb = run(app, "first")
+        repeat, _ = run(app, "repeat")
+        print(
+            f"{page:<26} {before:10.1f} {first:9.1f} {repeat:10.1f} "
+            f"{before_kb:10.0f} {after_kb:9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Size and speed of the sparse intersectional cube against a dense one
+
+The prepared frame is tiled up to the requested number of rows. The sparse
+cube is built over a growing list of axes, from state x gender x age to all
+four race/ethnicity codings, and its cell count and memory are printed
+next to the size a dense float64 cube over the same axes would need. A
+race x gender x age table for one state, with small cells suppressed, is
+then timed on the full cube.
+
+    python benchmarks/bench_intersections.py [--rows 1000000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    import numpy as np
+    import pandas as pd
+
+    from dashboard import intersections, suppression
+    from dashboard.data import load_prepared_frame
+
+    df = load_prepared_frame()
+    copies = -(-args.rows // len(df))
+    df = pd.concat([df] * copies, ignore_index=True).iloc[: args.rows]
+    print(f"{len(df):,} rows")
+    print(
+        f"{'axes':<10} {'cells':>8} {'sparse MB':>10} {'dense MB':>10} {'build ms':>9}"
+    )
+
+    axes = list(intersections.DIMENSIONS)
+    for count in range(3, len(axes) + 1):
+        start = time.perf_counter()
+        cube = intersections.build_cube(df, axes[:count])
+        seconds = time.perf_counter() - start
+        dense = np.prod(cube.shape, dtype=float) * 8
+        print(
+            f"{count:<10} {len(cube):>8,} {cube.nbytes / 1e6:>10.2f} "
+            f"{dense / 1e6:>10.1f} {seconds * 1000:>9.0f}"
+        )
+
+    keys = ["_IMPRACE", "Gender", "Age_Group"]
+    state = df["State_Name"].mode()[0]
+    start = time.perf_counter()
+    table = intersections.table(cube, keys, {"State_Name": [state]})
+    table = suppression.suppress(
+        table, "n", ["Distress", "Depression"], suppression.margins(keys)
+    )
+    seconds = time.perf_counter() - start
+    print(f"{state} table: {len(table)} cells in {seconds * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
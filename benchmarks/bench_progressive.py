@@ -0,0 +1,84 @@
+"""
+First-paint and final-paint time of progressive charts, and interval coverage
+
+The prepared frame is tiled up to the requested number of rows. The
+Explorer's mean mental health days by age group and gender is computed from
+the stratified sample (the first paint) and exactly (the final paint), both
+timed best of five. The sample is then redrawn with different seeds and the
+share of groups whose 95% interval holds the exact mean is printed, which
+should be close to 95%.
+
+    python benchmarks/bench_progressive.py [--rows 1000000] [--draws 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def best(function, *args):
+    seconds = []
+    for _ in range(5):
+        start = time.perf_counter()
+        result = function(*args)
+        seconds.append(time.perf_counter() - start)
+    return result, min(seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--draws", type=int, default=200)
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    import numpy as np
+    import pandas as pd
+
+    from dashboard import progressive, sampling, suppression
+    from dashboard.data import load_prepared_frame
+
+    df = load_prepared_frame()
+    copies = -(-args.rows // len(df))
+    df = pd.concat([df] * copies, ignore_index=True).iloc[: args.rows]
+    value, keys = "Mental_Health_Days_Clean", ["Age_Group", "Gender"]
+    print(f"{len(df):,} rows")
+
+    sample, seconds = best(sampling.build_sample, df)
+    print(f"sample of {len(sample):,} rows built in {seconds * 1000:.0f} ms")
+
+    # A sidebar selection: every row but one state
+    state = df["State_Name"].mode()[0]
+    selected = df[df["State_Name"] != state]
+
+    def first_paint():
+        rows = df.index.get_indexer(selected.index)
+        return sampling.estimate(sample, df, value, keys, rows)
+
+    approximate, first = best(first_paint)
+    exact, final = best(suppression.group_means, selected, keys, value)
+    print(f"first paint {first * 1000:.1f} ms, final paint {final * 1000:.1f} ms")
+
+    merged = approximate.merge(exact, on=keys, suffixes=("", "_exact"))
+    error = (merged[value] - merged[f"{value}_exact"]).abs().max()
+    print(f"largest error {error:.3f} days over {len(merged)} groups")
+
+    rows = df.index.get_indexer(selected.index)
+    exact = exact.set_index(keys)[value]
+    inside = total = 0
+    for seed in range(args.draws):
+        draw = sampling.estimate(
+            sampling.build_sample(df, seed=seed + 1), df, value, keys, rows
+        ).set_index(keys)
+        half = draw["se"] * progressive.Z_95
+        truth = exact.reindex(draw.index)
+        inside += int(((draw[value] - truth).abs() <= half).sum())
+        total += int(np.isfinite(truth).sum())
+    print(f"95% interval coverage {inside / total:.1%} over {args.draws} samples")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Aggregate query latency of the pandas and DuckDB query backends
+
+The prepared frame is tiled up to the requested number of rows and written
+to a temporary Parquet file, then the same dashboard-style queries run on
+both backends. The DuckDB backend is skipped when duckdb is not installed.
+
+    python benchmarks/bench_query.py [--rows 1000000] [--repeat 5]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DAYS = "Mental_Health_Days_Clean"
+
+
+def timed(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples), result
+
+
+def report(label, seconds):
+    print(f"{label:<44} {seconds * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    import pandas as pd
+
+    from dashboard import query
+    from dashboard.data import load_prepared_frame
+
+    df = load_prepared_frame()
+    copies = -(-args.rows // len(df))
+    df = pd.concat([df] * copies, ignore_index=True).iloc[: args.rows]
+    print(f"{len(df):,} rows x {len(df.columns)} columns")
+
+    queries = {
+        "state means": query.Query(
+            {"mean": ("mean", DAYS), "count": ("count", DAYS)}, ["State_Name"]
+        ),
+        "state x gender means": query.Query(
+            {"mean": ("mean", DAYS)}, ["State_Name", "Gender"]
+        ),
+        "female depression by income": query.Query(
+            {"rate": ("share", "Depression", "Yes"), "n": ("size",)},
+            ["Income_Group"],
+            {"Gender": ["Female"]},
+        ),
+        "distress, two states, one age group": query.Query(
+            {"rate": ("share_at_least", DAYS, 14)},
+            ["Gender"],
+            {"State_Name": ["Texas", "Florida"], "Age_Group": ["65-69"]},
+        ),
+    }
+
+    backends = {"pandas": query.PandasBackend(df)}
+    with tempfile.TemporaryDirectory() as cache_dir:
+        try:
+            import duckdb  # noqa: F401
+        except ImportError:
+            print("duckdb not installed; timing the pandas backend only")
+        else:
+            seconds, path = timed(lambda: query.export_parquet(df, cache_dir), 1)
+            report("export Parquet", seconds)
+            backends["duckdb"] = query.DuckDBBackend(path)
+
+        for label, request in queries.items():
+            for name, backend in backends.items():
+                seconds, _ = timed(
+                    lambda b=backend, r=request: b.execute(r), args.repeat
+                )
+                report(f"{label} [{name}]", seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Fit time of the survey-weighted regression at interactive sizes
+
+The prepared frame is tiled up to the requested number of rows, then the
+design matrix build and logistic / Poisson fits are timed separately since
+the design is built once per dataset version while fits run per filter.
+The propensity-score matching behind the Overview's matched gender
+comparison is timed the same way.
+
+    python benchmarks/bench_regression.py [--rows 100000] [--repeat 5]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def timed(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples), result
+
+
+def report(label, seconds):
+    print(f"{label:<30} {seconds * 1000:7.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    import numpy as np
+    import pandas as pd
+
+    from dashboard import matching, regression
+    from dashboard.data import load_prepared_frame
+
+    df = load_prepared_frame()
+    copies = -(-args.rows // len(df))
+    df = pd.concat([df] * copies, ignore_index=True).iloc[: args.rows]
+    print(f"{len(df):,} rows")
+
+    seconds, design = timed(lambda: regression.build_design(df), args.repeat)
+    report(f"build design ({design.X.shape[1]} columns)", seconds)
+    for family in ("logit", "poisson"):
+        seconds, _ = timed(
+            lambda family=family: regression.fit(design, family=family), args.repeat
+        )
+        report(f"fit {family}", seconds)
+
+    rows = np.flatnonzero(df["Gender"].to_numpy() == "Female")
+    seconds, _ = timed(lambda: regression.fit(design, rows), args.repeat)
+    report("fit logit, female rows only", seconds)
+
+    seconds, design = timed(lambda: matching.build_design(df), args.repeat)
+    report("build propensity design", seconds)
+    seconds, _ = timed(lambda: matching.match(design), args.repeat)
+    report("propensity match", seconds)
+    seconds, _ = timed(lambda: matching.matched_comparison(df, design), args.repeat)
+    report("matched comparison", seconds)
+
+
+if __name__ == "__main__":
+    main()
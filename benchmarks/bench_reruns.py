@@ -0,0 +1,70 @@
+"""
+Rerun scope of page widgets: full script run vs the fragment they sit in
+
+Widgets inside a page fragment (Explorer chart controls, the Overview
+threshold slider, Geographic, Trends and Risk Factors options, the
+Recommendations what-if sliders) rerun only that fragment instead of the
+whole script with its sidebar filtering. This drives the app in-process with
+Streamlit's AppTest harness and VMH_PROFILE=1, then reports the median time
+of a full run next to each fragment's own time, which is what one
+interaction with its widgets now costs.
+
+    python benchmarks/bench_reruns.py [--repeat 5] [--population "All Veterans"]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Page -> fragment labels recorded on it
+FRAGMENTS = {
+    "Executive Overview": ["overview metrics"],
+    "Geographic Patterns": ["state rankings", "area drilldown"],
+    "Trends Over Time": ["trends chart"],
+    "Intersectional Analysis": ["intersections"],
+    "🔍 Interactive Explorer": ["explorer chart", "explorer associations"],
+    "Risk Factors": ["adjusted ratios", "attributions"],
+    "Recommendations": ["what-if simulator"],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--population", default="All Veterans")
+    args = parser.parse_args()
+
+    os.environ["VMH_PROFILE"] = "1"
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+    from streamlit.testing.v1 import AppTest
+
+    from dashboard import profiling
+
+    app = AppTest.from_file(os.path.join(ROOT, "streamlit_app.py"), default_timeout=300)
+    app.run()
+    app.sidebar.radio[1].set_value(args.population)
+
+    print(f"{'page / fragment':<44} {'ms':>8} {'of run':>7}")
+    for page, labels in FRAGMENTS.items():
+        app.sidebar.radio[0].set_value(page)
+        app.run()  # warm page imports and caches
+        samples = defaultdict(list)
+        for _ in range(args.repeat):
+            profiling.TIMINGS.clear()
+            app.run()
+            for label, seconds in profiling.TIMINGS:
+                samples[label].append(seconds)
+        full = statistics.median(samples["full run"])
+        print(f"{page + ' (full run)':<44} {full * 1000:8.1f}")
+        for label in labels:
+            seconds = statistics.median(samples[label])
+            print(f"  {label:<42} {seconds * 1000:8.1f} {seconds / full:7.0%}")
+
+
+if __name__ == "__main__":
+    main()
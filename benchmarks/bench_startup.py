@@ -0,0 +1,85 @@
+"""
+Cold-start cost of the dashboard: module imports and first full run
+
+Import times are measured in fresh interpreters so nothing is already in
+`sys.modules`. "app shell" is everything streamlit_app.py imports before the
+sidebar is drawn; each page module is timed separately because it is only
+imported when that page is first opened. The first run uses Streamlit's
+headless AppTest harness and includes loading the data.
+
+    python benchmarks/bench_startup.py [--repeat 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORTS = {
+    "streamlit": "import streamlit",
+    "plotly.express": "import plotly.express",
+    "app shell": "import streamlit, dashboard.store, dashboard.theme, dashboard.views",
+}
+
+
+def time_import(statement, repeat):
+    code = (
+        "import time; t = time.perf_counter(); "
+        f"{statement}; print(time.perf_counter() - t)"
+    )
+    samples = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        samples.append(float(out.stdout.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+def time_first_run():
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.join(ROOT, "streamlit_app.py"), default_timeout=120)
+    start = time.perf_counter()
+    app.run()
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    app.run()
+    return first, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    from dashboard.views import PAGES
+
+    for label, statement in IMPORTS.items():
+        print(
+            f"import {label:<28} {time_import(statement, args.repeat) * 1000:7.0f} ms"
+        )
+    # Page imports on top of the shell, i.e. the cost of first navigation
+    shell = time_import(IMPORTS["app shell"], args.repeat)
+    for module in PAGES.values():
+        total = time_import(
+            f"{IMPORTS['app shell']}; import dashboard.views.{module}", args.repeat
+        )
+        print(f"  + page {module:<27} {(total - shell) * 1000:7.0f} ms")
+
+    first, rerun = time_first_run()
+    print(f"first run (incl. data load)        {first * 1000:7.0f} ms")
+    print(f"warm rerun                         {rerun * 1000:7.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
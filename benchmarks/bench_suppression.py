@@ -0,0 +1,99 @@
+"""
+Small-cell suppression cost against the aggregation it protects
+
+Synthetic respondents are spread unevenly over state x gender x age x
+income, so many cells are small. Each table is aggregated with a pandas
+groupby and then suppressed against its margins; both are timed (best of
+five). The suppression invariants are tested in tests/test_suppression.py.
+
+    python benchmarks/bench_suppression.py [--rows 1000000] [--min-n 10]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TABLES = [
+    ["State"],
+    ["State", "Gender"],
+    ["Age", "Gender"],
+    ["State", "Gender", "Age"],
+    ["State", "Gender", "Age", "Income"],
+]
+
+
+def report(label, seconds):
+    print(f"{label:<44} {seconds * 1000:8.1f} ms")
+
+
+def best(function, *args, repeat=5):
+    """Result of `function(*args)` and its fastest time over `repeat` calls"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        times.append(time.perf_counter() - start)
+    return result, min(times)
+
+
+def synthetic_frame(rows, seed=0):
+    """Respondents with skewed key frequencies and a day-count outcome"""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    levels = {"State": 54, "Gender": 2, "Age": 13, "Income": 6}
+    columns = {}
+    for column, size in levels.items():
+        p = rng.pareto(1.5, size) + 0.05
+        columns[column] = rng.choice(size, rows, p=p / p.sum())
+    columns["Days"] = rng.integers(0, 31, rows).astype(float)
+    return pd.DataFrame(columns)
+
+
+def aggregate(df, keys):
+    """Mean days and answering respondents `n` per group of `keys`"""
+    grouped = df.groupby(keys)["Days"].agg(["mean", "count"]).reset_index()
+    return grouped.rename(columns={"mean": "Days", "count": "n"})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--min-n", type=int, default=10)
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    import numpy as np
+
+    from dashboard import suppression
+
+    df = synthetic_frame(args.rows)
+    print(f"{len(df):,} rows, min-n {args.min_n}")
+
+    for keys in TABLES:
+        grouped, grouping = best(aggregate, df, keys)
+        table, suppress = best(
+            suppression.suppress,
+            grouped,
+            "n",
+            ["Days"],
+            suppression.margins(keys),
+            args.min_n,
+        )
+        label = " x ".join(keys)
+        hidden = int(table["suppressed"].sum())
+        print(f"{label}: {len(table):,} cells, {hidden:,} hidden")
+        report("  groupby aggregation", grouping)
+        report("  suppression", suppress)
+
+    counts = np.bincount(df["Age"] * 2 + df["Gender"], minlength=26).reshape(13, 2)
+    _, seconds = best(suppression.hide_grid, counts, (0, 1), args.min_n)
+    report("13 x 2 grid suppression", seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+"""
+Shared data preparation and metric logic for the veterans mental health
+dashboard, usable both from the Streamlit app and headless tools
+"""
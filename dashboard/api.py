@@ -0,0 +1,330 @@
+"""
+Headless JSON API serving the dashboard's aggregate metrics
+
+A dependency-free ASGI application so other internal tools can read the
+depression rates, distress rates and state rankings without scraping the
+Streamlit UI. Run it with any ASGI server, for example:
+
+    uvicorn dashboard.api:app --workers 4
+
+Endpoints (all GET, all accept `population=female|male|all` plus repeated
+`state=` and `age=` filters):
+
+    /health       dataset size
+    /summary      headline metrics for the selection
+    /genders      female vs male comparison table
+    /states       per-state ranking (`metric=days|depression|distress`)
+    /groups       per-category means (`by=Income_Group`, `gender_split=1`)
+
+    Groups too small to publish come back with null measures and
+    `suppressed: true` (see dashboard.suppression).
+
+    POST /refresh applies pending files from data/updates/ incrementally
+    (see dashboard.store) and invalidates the response cache. It needs an
+    `Authorization: Bearer <token>` header matching VMH_REFRESH_TOKEN; when
+    that is unset, only clients on the loopback interface may call it.
+
+The prepared frame is loaded once per worker and kept resident (or attached
+from the shared Arrow file when VMH_SHARED_DATASET is set, see
+dashboard.shared); responses are cached per normalised query string so
+repeated requests skip pandas.
+"""
+
+import asyncio
+import hmac
+import json
+import math
+import os
+from collections import OrderedDict
+from urllib.parse import parse_qs
+
+from dashboard import metrics, query, suppression
+from dashboard.constants import (
+    AGE_GROUP_ORDER,
+    EDUCATION_ORDER,
+    HEALTH_ORDER,
+    INCOME_ORDER,
+    SUPPORT_ORDER,
+)
+from dashboard.store import load_store
+
+# Maximum number of cached response bodies per worker
+RESPONSE_CACHE_SIZE = 2048
+
+# Bearer token required by POST /refresh; unset means loopback clients only
+REFRESH_TOKEN = os.environ.get("VMH_REFRESH_TOKEN")
+
+# Client addresses allowed to refresh without a token
+LOOPBACK = {"127.0.0.1", "::1"}
+
+# Query-string populations and the sidebar label they correspond to
+POPULATION_FILTERS = {
+    "female": "Female Veterans Only",
+    "male": "Male Veterans Only",
+    "all": "All Veterans",
+}
+
+# Columns accepted by /groups and their chart ordering
+GROUP_ORDERS = {
+    "Age_Group": AGE_GROUP_ORDER,
+    "Income_Group": INCOME_ORDER,
+    "Education": EDUCATION_ORDER,
+    "General_Health": HEALTH_ORDER,
+    "Emotional_Support": SUPPORT_ORDER,
+    "Employment": None,
+    "Marital": None,
+    "Has_Insurance": None,
+    "Depression": None,
+}
+
+# Measures ranked by /states: (mean measure, count measure)
+STATE_METRICS = {
+    "days": (
+        ("mean", "Mental_Health_Days_Clean"),
+        ("count", "Mental_Health_Days_Clean"),
+    ),
+    "depression": (("share", "Depression", "Yes"), ("size",)),
+    "distress": (
+        ("share_at_least", "Mental_Health_Days_Clean", metrics.DISTRESS_THRESHOLD),
+        ("size",),
+    ),
+}
+
+
+class BadRequest(Exception):
+    """Raised by handlers for invalid query parameters"""
+
+
+_store = None
+_cache = OrderedDict()
+_cache_version = None
+
+
+def get_store():
+    """Dataset store, loaded on first use and kept for the worker lifetime"""
+    global _store
+    if _store is None:
+        _store = load_store()
+    return _store
+
+
+def get_frame():
+    """Prepared frame currently held by the store"""
+    return get_store().frame
+
+
+def _to_json(value):
+    """Convert numpy scalars and NaN to JSON-safe Python values"""
+    if isinstance(value, dict):
+        return {k: _to_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(v) for v in value]
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _records(df):
+    return _to_json(df.astype(object).to_dict(orient="records"))
+
+
+def _selection(params):
+    """Filtered frame and sidebar label for the request's filters"""
+    population = params.get("population", ["all"])[0].lower()
+    if population not in POPULATION_FILTERS:
+        raise BadRequest(f"population must be one of {sorted(POPULATION_FILTERS)}")
+    return metrics.filter_population(
+        get_frame(),
+        POPULATION_FILTERS[population],
+        params.get("state"),
+        params.get("age"),
+    )
+
+
+def _run_query(request, params):
+    """Execute a `query.Query` against the request's filters"""
+    population = params.get("population", ["all"])[0].lower()
+    if population not in POPULATION_FILTERS:
+        raise BadRequest(f"population must be one of {sorted(POPULATION_FILTERS)}")
+    filters = {}
+    gender = metrics.POPULATIONS[POPULATION_FILTERS[population]]
+    if gender:
+        filters["Gender"] = [gender]
+    for column, key, all_option in (
+        ("State_Name", "state", "All States"),
+        ("Age_Group", "age", "All Ages"),
+    ):
+        values = params.get(key)
+        if values and all_option not in values:
+            filters[column] = values
+    backend = get_store().aggregate("query_backend", query.build_backend)
+    return suppression.run_query(backend, request.where(filters))
+
+
+def health(params):
+    return {"status": "ok", "rows": len(get_frame())}
+
+
+def summary(params):
+    return metrics.summary_metrics(_selection(params))
+
+
+def genders(params):
+    return _records(metrics.gender_comparison(_selection(params)))
+
+
+def states(params):
+    metric = params.get("metric", ["days"])[0]
+    if metric not in STATE_METRICS:
+        raise BadRequest(f"metric must be one of {sorted(STATE_METRICS)}")
+    mean, count = STATE_METRICS[metric]
+    stats = _run_query(
+        query.Query({"mean": mean, "count": count}, ["State_Name"]), params
+    ).sort_values("mean", ascending=False)
+    return _records(stats.rename(columns={"State_Name": "state"}))
+
+
+def groups(params):
+    by = params.get("by", ["Income_Group"])[0]
+    if by not in GROUP_ORDERS:
+        raise BadRequest(f"by must be one of {sorted(GROUP_ORDERS)}")
+    by_gender = params.get("gender_split", ["0"])[0] in ("1", "true")
+    days = "Mental_Health_Days_Clean"
+    stats = _run_query(
+        query.Query(
+            {"mean": ("mean", days), "count": ("count", days)},
+            [by, "Gender"] if by_gender else [by],
+        ),
+        params,
+    )
+    stats = metrics.order_groups(stats, by, GROUP_ORDERS[by])
+    stats[by] = stats[by].astype(str)
+    return _records(stats)
+
+
+ROUTES = {
+    "/health": health,
+    "/summary": summary,
+    "/genders": genders,
+    "/states": states,
+    "/groups": groups,
+}
+
+
+def _cache_key(path, query_string):
+    """Normalise the query so parameter order does not split cache entries"""
+    params = parse_qs(query_string, keep_blank_values=False)
+    normalised = tuple(sorted((k, tuple(sorted(v))) for k, v in params.items()))
+    return (path, normalised), params
+
+
+def _check_cache_version():
+    """Drop cached bodies computed from an older version of the data
+
+    Returns the current version.
+    """
+    global _cache_version
+    store = get_store()
+    store.sync_shared()
+    if store.version != _cache_version:
+        _cache.clear()
+        _cache_version = store.version
+    return store.version
+
+
+def _may_refresh(scope):
+    """Whether a /refresh request carries the token, or is local without one"""
+    if REFRESH_TOKEN is None:
+        client = scope.get("client") or ("",)
+        return client[0] in LOOPBACK
+    headers = dict(scope.get("headers") or [])
+    expected = f"Bearer {REFRESH_TOKEN}".encode()
+    return hmac.compare_digest(headers.get(b"authorization", b""), expected)
+
+
+async def refresh():
+    """Apply pending update files and report what changed"""
+    summary = await asyncio.to_thread(get_store().apply_update_files)
+    _check_cache_version()
+    return 200, json.dumps(_to_json(summary)).encode()
+
+
+async def handle(path, query_string):
+    """Status and encoded body for one GET request, served from cache if possible"""
+    handler = ROUTES.get(path)
+    if handler is None:
+        return 404, json.dumps({"error": f"unknown endpoint {path}"}).encode()
+
+    version = _check_cache_version()
+    key, params = _cache_key(path, query_string)
+    key = (version, *key)
+    body = _cache.get(key)
+    if body is not None:
+        _cache.move_to_end(key)
+        return 200, body
+
+    try:
+        # pandas work runs off the event loop so slow queries don't block
+        # cache hits being served concurrently
+        result = await asyncio.to_thread(handler, params)
+    except BadRequest as exc:
+        return 400, json.dumps({"error": str(exc)}).encode()
+
+    body = json.dumps(_to_json(result)).encode()
+    if get_store().version != version:
+        # A refresh landed while this was computed; don't cache a mixed body
+        return 200, body
+    _cache[key] = body
+    if len(_cache) > RESPONSE_CACHE_SIZE:
+        _cache.popitem(last=False)
+    return 200, body
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            try:
+                await asyncio.to_thread(get_store)
+            except FileNotFoundError as exc:
+                await send({"type": "lifespan.startup.failed", "message": str(exc)})
+                return
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    """ASGI entry point"""
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    if scope["method"] == "POST" and scope["path"] == "/refresh":
+        if _may_refresh(scope):
+            status, body = await refresh()
+        else:
+            status, body = 403, b'{"error": "refresh not allowed"}'
+    elif scope["method"] != "GET":
+        status, body = 405, b'{"error": "method not allowed"}'
+    else:
+        status, body = await handle(
+            scope["path"], scope.get("query_string", b"").decode("latin-1")
+        )
+
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
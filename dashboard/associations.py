@@ -0,0 +1,228 @@
+"""
+Association scan of every coded BRFSS column against the mental health outcomes
+
+For each column this computes Cramér's V and mutual information (bits) with
+`poor_mental_health` and with `MENTHLTH`, so analysts can rank candidate
+predictors instead of guessing. Columns are integer-coded once; columns with
+many distinct values (body weight, BMI, exact age) are cut into deciles first.
+The contingency tables of a whole chunk of columns come out of a single
+`np.bincount` by offsetting each column's codes, and chunks are spread over a
+process pool when the frame is large enough to be worth it.
+
+Results are written to `<data dir>/cache/` keyed by a fingerprint of the
+rows, so a given selection is only scanned once. Only the
+`MAX_CACHE_FILES` most recently used results are kept. Older ones, such as
+selections of a dataset version since refreshed, are deleted.
+
+    python -m dashboard.associations [--target MENTHLTH] [--top 25] [--min-n 500]
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from dashboard.data import DATA_DIR
+
+TARGETS = ["poor_mental_health", "MENTHLTH"]
+
+# Restatements of the outcome itself; scanning them would only rank the target
+LEAKAGE = {
+    "MENTHLTH",
+    "Mental_Health_Days_Clean",
+    "poor_mental_health",
+    "mental_health_category",
+    "_MENT14D",
+}
+
+# Identifiers and survey design variables rather than respondent answers
+EXCLUDE = {
+    "SEQNO",
+    "_PSU",
+    "_STSTR",
+    "_STRWT",
+    "_RAWRAKE",
+    "_WT2RAKE",
+    "_LLCPWT",
+    "_LLCPWT2",
+    "_CLLCPWT",
+    "_DUALUSE",
+    "_DUALCOR",
+}
+
+# Columns with more distinct values than this are binned into deciles
+MAX_LEVELS = 64
+N_QUANTILE_BINS = 10
+
+# Columns per bincount batch, and the frame size (rows x columns) from which
+# batches go to a process pool instead of running inline
+CHUNK_COLUMNS = 32
+PARALLEL_MIN_CELLS = 20_000_000
+
+CACHE_DIR = os.path.join(DATA_DIR, "cache")
+
+# Scan results kept on disk, least recently used deleted first
+MAX_CACHE_FILES = 64
+
+
+def candidate_columns(df):
+    """Numeric answer columns worth scanning"""
+    return [
+        column
+        for column in df.columns
+        if column not in LEAKAGE
+        and column not in EXCLUDE
+        and not column.endswith("_Clean")
+        and df[column].dtype.kind in "biuf"
+    ]
+
+
+def encode(values):
+    """Integer codes (-1 for missing) and level count for one column"""
+    values = np.asarray(values, dtype=float)
+    valid = ~np.isnan(values)
+    distinct = np.unique(values[valid])
+    if len(distinct) > MAX_LEVELS:
+        edges = np.unique(
+            np.quantile(values[valid], np.linspace(0, 1, N_QUANTILE_BINS + 1)[1:-1])
+        )
+        codes = np.searchsorted(edges, values, side="right")
+        n_levels = len(edges) + 1
+    else:
+        codes = np.searchsorted(distinct, values)
+        n_levels = len(distinct)
+    return np.where(valid, codes, -1), n_levels
+
+
+def _scores(table):
+    """Cramér's V, mutual information (bits) and n for one contingency table"""
+    table = table[table.sum(axis=1) > 0][:, table.sum(axis=0) > 0]
+    n = table.sum()
+    r, k = table.shape
+    if n == 0 or min(r, k) < 2:
+        return np.nan, np.nan, int(n)
+    rows = table.sum(axis=1, keepdims=True)
+    cols = table.sum(axis=0, keepdims=True)
+    expected = rows * cols / n
+    chi2 = ((table - expected) ** 2 / expected).sum()
+    v = np.sqrt(chi2 / n / (min(r, k) - 1))
+    nonzero = table > 0
+    joint = table[nonzero] / n
+    mi = (joint * np.log2(table[nonzero] * n / (rows * cols)[nonzero])).sum()
+    return v, mi, int(n)
+
+
+def scan_chunk(codes, n_levels, target_codes, n_target):
+    """Scores for a block of coded columns against one coded target
+
+    `codes` is (rows, columns); every column's table comes from one bincount
+    over `(column offset + code) * n_target + target`.
+    """
+    offsets = np.concatenate([[0], np.cumsum(n_levels)[:-1]])
+    valid = (codes >= 0) & (target_codes >= 0)[:, None]
+    flat = (codes + offsets) * n_target + target_codes[:, None]
+    counts = np.bincount(flat[valid], minlength=int(sum(n_levels)) * n_target)
+    results = []
+    for offset, levels in zip(offsets, n_levels):
+        table = counts[offset * n_target : (offset + levels) * n_target]
+        results.append(_scores(table.reshape(levels, n_target).astype(float)))
+    return results
+
+
+def scan(df, target="poor_mental_health", workers=None):
+    """Cramér's V and mutual information of every candidate column vs `target`
+
+    Returns a DataFrame sorted by Cramér's V with the number of respondents
+    answering both the column and the target.
+    """
+    columns = candidate_columns(df)
+    target_codes, n_target = encode(df[target].to_numpy())
+    encoded = [encode(df[column].to_numpy()) for column in columns]
+
+    chunks = []
+    for start in range(0, len(columns), CHUNK_COLUMNS):
+        block = encoded[start : start + CHUNK_COLUMNS]
+        chunks.append(
+            (
+                np.column_stack([codes for codes, _ in block]),
+                [levels for _, levels in block],
+                target_codes,
+                n_target,
+            )
+        )
+
+    if workers is None:
+        workers = os.cpu_count() if len(df) * len(columns) >= PARALLEL_MIN_CELLS else 1
+    if workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            scored = list(pool.map(scan_chunk, *zip(*chunks)))
+    else:
+        scored = [scan_chunk(*chunk) for chunk in chunks]
+
+    rows = [score for chunk in scored for score in chunk]
+    result = pd.DataFrame(rows, columns=["Cramers_V", "Mutual_Info", "n"])
+    result.insert(0, "Column", columns)
+    result["Levels"] = [levels for _, levels in encoded]
+    return result.sort_values("Cramers_V", ascending=False, ignore_index=True)
+
+
+def fingerprint(df):
+    """Short hash identifying the rows (and columns) of a frame"""
+    hashed = pd.util.hash_pandas_object(df[candidate_columns(df)], index=False)
+    return f"{len(df)}_{int(hashed.sum()) & 0xFFFFFFFFFFFF:012x}"
+
+
+def load_or_scan(df, target="poor_mental_health", cache_dir=None, workers=None):
+    """Scan results for `df`, read from the on-disk cache when present"""
+    cache_dir = cache_dir or CACHE_DIR
+    path = os.path.join(cache_dir, f"associations_{target}_{fingerprint(df)}.csv")
+    if os.path.exists(path):
+        os.utime(path)  # Mark as recently used
+        return pd.read_csv(path)
+    result = scan(df, target, workers)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    result.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    prune_cache(cache_dir)
+    return result
+
+
+def prune_cache(cache_dir=None, keep=None):
+    """Delete all but the `keep` most recently used scan results"""
+    cache_dir = cache_dir or CACHE_DIR
+    keep = MAX_CACHE_FILES if keep is None else keep
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.startswith("associations_") and entry.name.endswith(".csv"):
+            try:
+                entries.append((entry.stat().st_mtime, entry.path))
+            except FileNotFoundError:
+                continue
+    for _, path in sorted(entries, reverse=True)[keep:]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass  # Pruned by another worker
+
+
+def main(argv=None):
+    """Command line entry point: scan the full dataset and print the top columns"""
+    from dashboard.data import load_prepared_frame
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--target", choices=TARGETS, default=TARGETS[0])
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--min-n", type=int, default=500, help="minimum respondents")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    result = load_or_scan(load_prepared_frame(), args.target, workers=args.workers)
+    result = result[result["n"] >= args.min_n]
+    print(result.head(args.top).to_string(index=False, float_format="{:.4f}".format))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+"""
+Exact per-respondent feature attributions for a tree model of frequent distress
+
+A gradient-boosted ensemble of shallow trees (scikit-learn, depth 3) predicts
+`poor_mental_health` from the regression covariates plus poor physical health
+days, weighted by `_LLCPWT`. Each respondent's log-odds prediction is split
+into one contribution per feature with path-dependent TreeSHAP: the Shapley
+values of the tree's conditional expectation, where features outside a
+subset follow both branches in proportion to the training cover. Summed over
+features the contributions plus the model's expected log-odds give back the
+prediction exactly.
+
+The values depend only on which branch a respondent takes at each split, and
+a depth-3 tree has at most 7 splits, so at most 128 distinct patterns per
+tree. For every tree the Shapley values of its observed patterns are
+computed exactly by enumerating the subsets of the features it uses, then
+gathered back to all respondents in one indexing step. Trees are split over a
+process pool when the data is large enough to be worth it.
+
+The fitted model and attributions are written to `<data dir>/cache/` keyed by
+a fingerprint of the model inputs, so they are computed once per dataset.
+Only the `MAX_CACHED_MODELS` most recently used are kept; those of replaced
+datasets are deleted:
+
+    python -m dashboard.attributions [--workers 4]
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from math import factorial
+
+import numpy as np
+import pandas as pd
+
+from dashboard import regression
+from dashboard.data import DATA_DIR
+
+OUTCOME = regression.OUTCOME
+WEIGHT_COLUMN = regression.WEIGHT_COLUMN
+
+# Feature column -> levels in display order (coded by position), or None for
+# numeric columns used as is
+FEATURES = {
+    **{column: levels for column, (levels, _) in regression.COVARIATES.items()},
+    "Physical_Health_Days_Clean": None,
+}
+
+# Bins for showing numeric features by level
+NUMERIC_BINS = {"Physical_Health_Days_Clean": ([0, 1, 5, 14, 31], "0|1-4|5-13|14+")}
+
+N_TREES = 100
+MAX_DEPTH = 3
+LEARNING_RATE = 0.1
+
+# Rows x trees from which trees go to a process pool instead of running inline
+PARALLEL_MIN_CELLS = 5_000_000
+
+CACHE_DIR = os.path.join(DATA_DIR, "cache")
+
+# Cached model + attribution pairs kept on disk, least recently used deleted first
+MAX_CACHED_MODELS = 8
+CACHE_SUFFIXES = (".joblib", "_attributions.npz")
+
+
+class Attributions:
+    """Per-respondent contributions (log-odds) for the complete rows of a frame
+
+    `values[i, j]` is the contribution of feature j to the prediction for the
+    respondent at frame position `positions[i]`; `expected` is the model's
+    expected log-odds, `codes` the encoded feature values and `weights` the
+    survey weights.
+    """
+
+    def __init__(self, positions, values, expected, codes, weights, n_rows):
+        self.positions = positions
+        self.values = values
+        self.expected = expected
+        self.codes = codes
+        self.weights = weights
+        self.lookup = np.full(n_rows, -1)
+        self.lookup[positions] = np.arange(len(positions))
+
+    def select(self, rows=None):
+        """Attribution rows of frame positions `rows` (all when None)"""
+        if rows is None:
+            return np.arange(len(self.positions))
+        found = self.lookup[rows]
+        return found[found >= 0]
+
+
+def encode(df):
+    """Feature matrix, outcome, weights and complete-row mask for a frame"""
+    columns = []
+    for column, levels in FEATURES.items():
+        if levels is None:
+            columns.append(df[column].to_numpy(dtype=float))
+        else:
+            codes = pd.Index(levels).get_indexer(df[column].to_numpy())
+            columns.append(np.where(codes >= 0, codes, np.nan))
+    X = np.column_stack(columns)
+    y = df[OUTCOME].to_numpy(dtype=float)
+    w = df[WEIGHT_COLUMN].to_numpy(dtype=float)
+    complete = ~np.isnan(X).any(axis=1) & ~np.isnan(y) & ~np.isnan(w)
+    return X, y, w, complete
+
+
+def fit_model(X, y, w):
+    """Gradient-boosted depth-3 trees on the log-odds scale"""
+    from sklearn.ensemble import GradientBoostingClassifier
+
+    model = GradientBoostingClassifier(
+        n_estimators=N_TREES,
+        max_depth=MAX_DEPTH,
+        learning_rate=LEARNING_RATE,
+        random_state=0,
+    )
+    return model.fit(X, y, sample_weight=w / w.mean())
+
+
+def tree_arrays(tree):
+    """Split nodes and root-to-leaf paths of a fitted sklearn tree
+
+    Returns `(features, thresholds, leaf_values, path_nodes, path_left,
+    path_cover)`; paths are padded to equal length with node -1.
+    """
+    left, right = tree.children_left, tree.children_right
+    internal = np.flatnonzero(left != -1)
+    position = {node: i for i, node in enumerate(internal)}
+    cover = tree.weighted_n_node_samples
+    paths, values = [], []
+    stack = [(0, [])]
+    while stack:
+        node, path = stack.pop()
+        if left[node] == -1:
+            paths.append(path)
+            values.append(tree.value[node, 0, 0])
+            continue
+        for child, went_left in ((left[node], True), (right[node], False)):
+            step = (position[node], went_left, cover[child] / cover[node])
+            stack.append((child, [*path, step]))
+    depth = max(len(path) for path in paths)
+    padded = [path + [(-1, True, 1.0)] * (depth - len(path)) for path in paths]
+    steps = np.array(padded, dtype=object).reshape(len(paths), depth, 3)
+    return (
+        tree.feature[internal],
+        tree.threshold[internal],
+        np.array(values),
+        steps[..., 0].astype(int),
+        steps[..., 1].astype(bool),
+        steps[..., 2].astype(float),
+    )
+
+
+def tree_shap(arrays, X, out):
+    """Add one tree's path-dependent SHAP values for the rows of X to `out`
+
+    Returns the tree's expected value (its prediction with no features known).
+    """
+    features, thresholds, leaf_values, path_nodes, path_left, path_cover = arrays
+    # Branch taken at every split, as one integer pattern per row
+    goes_left = X[:, features] <= thresholds
+    pattern = goes_left @ (1 << np.arange(len(features)))
+    patterns, inverse = np.unique(pattern, return_inverse=True)
+    branches = (patterns[:, None] >> np.arange(len(features))) & 1 == 1
+
+    used = np.unique(features)
+    k = len(used)
+    feature_bit = np.searchsorted(used, features)
+    subsets = np.arange(1 << k)
+
+    # Leaf weight per pattern and subset: features in the subset follow the
+    # pattern's branch, the others split by cover
+    padding = path_nodes < 0
+    nodes = np.where(padding, 0, path_nodes)
+    follows = branches[:, nodes] == path_left
+    known = (subsets[:, None, None] >> feature_bit[nodes]) & 1 == 1
+    factor = np.where(known[None], follows[:, None], path_cover)
+    factor[..., padding] = 1.0
+    value = (factor.prod(axis=-1) * leaf_values).sum(axis=-1)
+
+    sizes = sum((subsets >> i) & 1 for i in range(k))
+    weights = np.array(
+        [factorial(s) * factorial(k - s - 1) / factorial(k) for s in range(k)]
+    )
+    phi = np.empty((len(patterns), k))
+    for i in range(k):
+        without = subsets[(subsets >> i) & 1 == 0]
+        gain = value[:, without | (1 << i)] - value[:, without]
+        phi[:, i] = gain @ weights[sizes[without]]
+    out[:, used] += phi[inverse]
+    return value[0, 0]
+
+
+def _shap_chunk(trees, X):
+    """Summed SHAP values and expected values of a batch of trees"""
+    out = np.zeros(X.shape)
+    expected = sum(tree_shap(arrays, X, out) for arrays in trees)
+    return out, expected
+
+
+def shap_values(model, X, workers=None):
+    """Path-dependent SHAP values (log-odds) of every row and the expected value"""
+    trees = [tree_arrays(est.tree_) for est in model.estimators_[:, 0]]
+    if workers is None:
+        workers = os.cpu_count() if len(X) * len(trees) >= PARALLEL_MIN_CELLS else 1
+    chunks = [trees[i::workers] for i in range(workers)]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_shap_chunk, chunks, [X] * workers))
+    else:
+        results = [_shap_chunk(trees, X)]
+    values = sum(out for out, _ in results) * model.learning_rate
+    tree_expected = sum(expected for _, expected in results) * model.learning_rate
+    # Constant log-odds of the initial estimate, before any tree
+    init = (
+        model.decision_function(X[:1])[0]
+        - sum(est.predict(X[:1])[0] for est in model.estimators_[:, 0])
+        * model.learning_rate
+    )
+    return values, init + tree_expected
+
+
+def fingerprint(df):
+    """Short hash identifying the model inputs of a frame"""
+    columns = [*FEATURES, OUTCOME, WEIGHT_COLUMN]
+    hashed = pd.util.hash_pandas_object(df[columns], index=False)
+    return f"{len(df)}_{int(hashed.sum()) & 0xFFFFFFFFFFFF:012x}"
+
+
+def load_or_compute(df, cache_dir=None, workers=None):
+    """Attributions for `df`, read from the on-disk cache when present
+
+    The fitted model is cached next to them as a joblib file.
+    """
+    import joblib
+
+    cache_dir = cache_dir or CACHE_DIR
+    stem = os.path.join(cache_dir, f"distress_gbm_{fingerprint(df)}")
+    X, y, w, complete = encode(df)
+    positions = np.flatnonzero(complete)
+    path = f"{stem}_attributions.npz"
+    if os.path.exists(path):
+        os.utime(path)  # Mark as recently used
+    else:
+        model = fit_model(X[complete], y[complete], w[complete])
+        values, expected = shap_values(model, X[complete], workers)
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{stem}.{os.getpid()}.tmp"
+        joblib.dump(model, tmp_path)
+        os.replace(tmp_path, f"{stem}.joblib")
+        with open(tmp_path, "wb") as f:
+            np.savez(f, values=values.astype(np.float32), expected=expected)
+        os.replace(tmp_path, path)
+        prune_cache(cache_dir)
+    cached = np.load(path)
+    return Attributions(
+        positions,
+        cached["values"],
+        float(cached["expected"]),
+        X[complete],
+        w[complete],
+        len(df),
+    )
+
+
+def prune_cache(cache_dir=None, keep=None):
+    """Delete the model and attributions of all but the `keep` most recently
+    used fingerprints"""
+    cache_dir = cache_dir or CACHE_DIR
+    keep = MAX_CACHED_MODELS if keep is None else keep
+    stems = {}
+    for entry in os.scandir(cache_dir):
+        if not entry.name.startswith("distress_gbm_"):
+            continue
+        for suffix in CACHE_SUFFIXES:
+            if entry.name.endswith(suffix):
+                try:
+                    mtime = entry.stat().st_mtime
+                except FileNotFoundError:
+                    break
+                stem = entry.path[: -len(suffix)]
+                stems[stem] = max(stems.get(stem, mtime), mtime)
+                break
+    for stem in sorted(stems, key=stems.get, reverse=True)[keep:]:
+        for suffix in CACHE_SUFFIXES:
+            try:
+                os.remove(stem + suffix)
+            except FileNotFoundError:
+                pass  # Pruned by another worker, or never written
+
+
+def summarize(attributions, rows=None):
+    """Weighted mean and mean absolute contribution of each feature
+
+    Returns one row per feature (Feature, Mean, Mean_Abs) sorted by Mean_Abs
+    and the number of respondents in the selection covered.
+    """
+    selected = attributions.select(rows)
+    if len(selected) == 0:
+        return None, 0
+    values = attributions.values[selected]
+    w = attributions.weights[selected]
+    result = pd.DataFrame(
+        {
+            "Feature": list(FEATURES),
+            "Mean": np.average(values, axis=0, weights=w),
+            "Mean_Abs": np.average(np.abs(values), axis=0, weights=w),
+        }
+    )
+    return result.sort_values("Mean_Abs", ascending=False, ignore_index=True), len(
+        selected
+    )
+
+
+def level_contributions(attributions, feature, rows=None):
+    """Weighted mean contribution of `feature` per level of it over a selection"""
+    selected = attributions.select(rows)
+    j = list(FEATURES).index(feature)
+    values = attributions.codes[selected, j]
+    levels = FEATURES[feature]
+    if levels is None:
+        edges, labels = NUMERIC_BINS[feature]
+        levels = labels.split("|")
+        codes = np.searchsorted(edges, values, side="right") - 1
+    else:
+        codes = values.astype(int)
+    w = attributions.weights[selected]
+    contributions = attributions.values[selected, j]
+    n = np.bincount(codes, minlength=len(levels))
+    weight = np.bincount(codes, w, minlength=len(levels))
+    total = np.bincount(codes, w * contributions, minlength=len(levels))
+    with np.errstate(invalid="ignore"):
+        result = pd.DataFrame({"Level": levels, "Mean": total / weight, "n": n})
+    return result[result["n"] > 0].reset_index(drop=True)
+
+
+def main(argv=None):
+    """Command line entry point: compute (or load) and print the attributions"""
+    from dashboard.data import load_prepared_frame
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    attributions = load_or_compute(load_prepared_frame(), workers=args.workers)
+    summary, n = summarize(attributions)
+    print(f"{n:,} respondents, expected log-odds {attributions.expected:.3f}")
+    print(summary.to_string(index=False, float_format="{:.4f}".format))
+
+
+if __name__ == "__main__":
+    main()
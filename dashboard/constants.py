@@ -0,0 +1,220 @@
+"""
+Survey code mappings and chart orderings shared by the dashboard and API
+"""
+
+# State code to name mapping
+STATE_CODES = {
+    1: "Alabama",
+    2: "Alaska",
+    4: "Arizona",
+    5: "Arkansas",
+    6: "California",
+    8: "Colorado",
+    9: "Connecticut",
+    10: "Delaware",
+    11: "District of Columbia",
+    12: "Florida",
+    13: "Georgia",
+    15: "Hawaii",
+    16: "Idaho",
+    17: "Illinois",
+    18: "Indiana",
+    19: "Iowa",
+    20: "Kansas",
+    21: "Kentucky",
+    22: "Louisiana",
+    23: "Maine",
+    24: "Maryland",
+    25: "Massachusetts",
+    26: "Michigan",
+    27: "Minnesota",
+    28: "Mississippi",
+    29: "Missouri",
+    30: "Montana",
+    31: "Nebraska",
+    32: "Nevada",
+    33: "New Hampshire",
+    34: "New Jersey",
+    35: "New Mexico",
+    36: "New York",
+    37: "North Carolina",
+    38: "North Dakota",
+    39: "Ohio",
+    40: "Oklahoma",
+    41: "Oregon",
+    42: "Pennsylvania",
+    44: "Rhode Island",
+    45: "South Carolina",
+    46: "South Dakota",
+    47: "Tennessee",
+    48: "Texas",
+    49: "Utah",
+    50: "Vermont",
+    51: "Virginia",
+    53: "Washington",
+    54: "West Virginia",
+    55: "Wisconsin",
+    56: "Wyoming",
+    66: "Guam",
+    72: "Puerto Rico",
+    78: "Virgin Islands",
+}
+
+# STATE_CODES entries that are not one of the 50 states
+TERRITORIES = ["District of Columbia", "Guam", "Puerto Rico", "Virgin Islands"]
+
+# Variable mappings
+AGE_GROUPS = {
+    1: "18-24",
+    2: "25-29",
+    3: "30-34",
+    4: "35-39",
+    5: "40-44",
+    6: "45-49",
+    7: "50-54",
+    8: "55-59",
+    9: "60-64",
+    10: "65-69",
+    11: "70-74",
+    12: "75-79",
+    13: "80+",
+    14: "80+",
+}
+# Age group ordering for charts (youngest to oldest)
+AGE_GROUP_ORDER = [
+    "18-24",
+    "25-29",
+    "30-34",
+    "35-39",
+    "40-44",
+    "45-49",
+    "50-54",
+    "55-59",
+    "60-64",
+    "65-69",
+    "70-74",
+    "75-79",
+    "80+",
+]
+INCOME_GROUPS = {
+    1: "<$15k",
+    2: "$15-25k",
+    3: "$25-35k",
+    4: "$35-50k",
+    5: "$50-75k",
+    6: ">$75k",
+    7: "Unknown",
+    9: "Refused",
+}
+# Income ordering for charts
+INCOME_ORDER = ["<$15k", "$15-25k", "$25-35k", "$35-50k", "$50-75k", ">$75k"]
+
+EMPLOYMENT_STATUS = {
+    1: "Employed",
+    2: "Self-employed",
+    3: "Unemployed <1yr",
+    4: "Unemployed 1yr+",
+    5: "Homemaker",
+    6: "Student",
+    7: "Retired",
+    8: "Unable to work",
+    9: "Refused",
+}
+
+MARITAL_STATUS = {
+    1: "Married",
+    2: "Divorced",
+    3: "Widowed",
+    4: "Separated",
+    5: "Never married",
+    6: "Unmarried couple",
+    9: "Refused",
+}
+
+EDUCATION_LEVELS = {
+    1: "Never attended",
+    2: "Elementary",
+    3: "Some HS",
+    4: "HS Graduate",
+    5: "Some College",
+    6: "College Graduate",
+    9: "Refused",
+}
+
+# Education ordering for charts
+EDUCATION_ORDER = [
+    "Never attended",
+    "Elementary",
+    "Some HS",
+    "HS Graduate",
+    "Some College",
+    "College Graduate",
+]
+
+# Health status mapping
+HEALTH_STATUS = {
+    1: "Excellent",
+    2: "Very Good",
+    3: "Good",
+    4: "Fair",
+    5: "Poor",
+    7: "Don't know",
+    9: "Refused",
+}
+# Health status ordering for charts
+HEALTH_ORDER = ["Excellent", "Very Good", "Good", "Fair", "Poor"]
+
+# Emotional support frequency mapping
+SUPPORT_FREQUENCY = {
+    1: "Always",
+    2: "Usually",
+    3: "Sometimes",
+    4: "Rarely",
+    5: "Never",
+    9: "Refused",
+}
+# Support frequency ordering for charts
+SUPPORT_ORDER = ["Always", "Usually", "Sometimes", "Rarely", "Never"]
+
+# Metropolitan status of the respondent's county (_METSTAT)
+METRO_STATUS = {1: "Metropolitan", 2: "Non-metropolitan"}
+
+# Urban/rural status of the respondent's county (_URBSTAT)
+URBAN_STATUS = {1: "Urban", 2: "Rural"}
+
+# Race/ethnicity codings; 9 (don't know/refused) is left out
+IMPUTED_RACE = {
+    1: "White",
+    2: "Black",
+    3: "Asian",
+    4: "American Indian/Alaska Native",
+    5: "Hispanic",
+    6: "Other race",
+}
+RACE_ETHNICITY = {
+    1: "White",
+    2: "Black",
+    3: "American Indian/Alaska Native",
+    4: "Asian",
+    5: "Native Hawaiian/Pacific Islander",
+    6: "Other race",
+    7: "Multiracial",
+    8: "Hispanic",
+}
+RACE_GROUPS = {
+    1: "White",
+    2: "Black",
+    3: "Other race",
+    4: "Multiracial",
+    5: "Hispanic",
+}
+HISPANIC_ORIGIN = {1: "Hispanic", 2: "Not Hispanic"}
+
+LIFE_SATISFACTION = {
+    1: "Very Satisfied",
+    2: "Satisfied",
+    3: "Dissatisfied",
+    4: "Very Dissatisfied",
+    7: "Don't know",
+    9: "Refused",
+}
@@ -0,0 +1,85 @@
+"""
+Loading and preparation of the combined female/male veteran frame
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from dashboard.constants import (
+    AGE_GROUPS,
+    EDUCATION_LEVELS,
+    EMPLOYMENT_STATUS,
+    HEALTH_STATUS,
+    INCOME_GROUPS,
+    LIFE_SATISFACTION,
+    MARITAL_STATUS,
+    STATE_CODES,
+    SUPPORT_FREQUENCY,
+)
+from dashboard.features import add_composite_scores
+
+# Directory holding the cleaned CSV extracts (overridable for deployments)
+DATA_DIR = os.environ.get("VMH_DATA_DIR", "./data")
+
+DATA_FILES = {
+    "Female": "female_veterans_clean.csv",
+    "Male": "male_veterans_clean.csv",
+}
+
+
+def prepare_frame(df):
+    """Add the decoded label columns and cleaned day counts to a raw frame"""
+    # Apply mappings
+    df["State_Name"] = df["_STATE"].map(STATE_CODES)
+    df["Age_Group"] = df["_AGEG5YR"].map(AGE_GROUPS)
+    df["Income_Group"] = df["_INCOMG1"].map(INCOME_GROUPS)
+    df["Employment"] = df["EMPLOY1"].map(EMPLOYMENT_STATUS)
+    df["Marital"] = df["MARITAL"].map(MARITAL_STATUS)
+    df["Education"] = df["EDUCA"].map(EDUCATION_LEVELS)
+    df["General_Health"] = df["GENHLTH"].map(HEALTH_STATUS)
+    df["Emotional_Support"] = df["EMTSUPRT"].map(SUPPORT_FREQUENCY)
+    df["Life_Satisfaction"] = df["LSATISFY"].map(LIFE_SATISFACTION)
+
+    # Binary variables
+    df["Depression"] = (df["ADDEPEV3"] == 1).map({True: "Yes", False: "No"})
+    df["Has_Insurance"] = (df["_HLTHPL2"] == 1).map({True: "Yes", False: "No"})
+    df["Has_Doctor"] = (df["PERSDOC3"] == 1).map({True: "Yes", False: "No"})
+    df["Cost_Barrier"] = (df["MEDCOST1"] == 1).map({True: "Yes", False: "No"})
+
+    # Clean mental health days
+    df["Mental_Health_Days_Clean"] = df["MENTHLTH"].copy()
+    df.loc[df["Mental_Health_Days_Clean"] > 30, "Mental_Health_Days_Clean"] = np.nan
+
+    # Clean physical health days
+    df["Physical_Health_Days_Clean"] = df["PHYSHLTH"].copy()
+    df.loc[df["Physical_Health_Days_Clean"] > 30, "Physical_Health_Days_Clean"] = np.nan
+
+    # Composite scores (ACE, SDOH burden, chronic conditions)
+    add_composite_scores(df)
+
+    return df
+
+
+def load_raw_frame(data_dir=None):
+    """Read both gender extracts into one raw frame tagged with Gender"""
+    data_dir = data_dir or DATA_DIR
+    frames = []
+    for gender, filename in DATA_FILES.items():
+        df = pd.read_csv(os.path.join(data_dir, filename))
+        # Add gender column
+        df["Gender"] = gender
+        frames.append(df)
+
+    # Combine datasets
+    return pd.concat(frames, ignore_index=True)
+
+
+def load_prepared_frame(data_dir=None):
+    """Load and preprocess both female and male veteran data
+
+    Raises FileNotFoundError when either extract is missing so callers can
+    decide how to surface it (the app shows an error, the API fails startup).
+    """
+    return prepare_frame(load_raw_frame(data_dir))
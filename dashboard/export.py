@@ -0,0 +1,419 @@
+"""
+Static HTML snapshots of every page, one file per state and population
+
+Each export runs the app headless through Streamlit's AppTest harness with
+the sidebar set to one state and one population (female, male, all veterans
+or the gender comparison), so it shows what the app shows. Every page is
+rendered in turn. Its charts (from their Plotly specs), metric cards,
+tables, captions and text go into one self-contained HTML file, with each
+page's controls listed at their defaults. Small cells are suppressed as in
+the app, and every chart is exact: progressive first draws are turned off.
+
+    python -m dashboard.export [--out exports] [--workers 4] [--states Ohio Texas]
+
+Exports run on a process pool with one app session per worker. A worker
+builds the store aggregates once and reuses them for every export it runs.
+Before the pool starts, the prepared frame is published as a shared Arrow
+file (dashboard.shared) that workers memory-map instead of each reading the
+CSVs, and the disk-cached tree model attributions are computed, so no worker
+fits the model. States with no respondents in the dataset are listed in the
+index rather than exported.
+
+Files embed plotly.js (about 4.6 MB each) so they open offline. With
+`--plotlyjs directory` they share one copy in the output directory instead,
+and with `--plotlyjs cdn` they load it from the Plotly CDN.
+"""
+
+import argparse
+import html
+import os
+import re
+import tempfile
+import textwrap
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from dashboard import attributions, metrics, shared, theme
+from dashboard.constants import STATE_CODES
+from dashboard.data import load_prepared_frame
+from dashboard.views import PAGES
+
+APP_SCRIPT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "streamlit_app.py"
+)
+
+# Seconds one page may take to render before the export fails
+PAGE_TIMEOUT = 300
+
+# Alert element -> CSS class
+ALERTS = {"Info": "info", "Success": "success", "Warning": "warning", "Error": "error"}
+
+EXPORT_CSS = """
+<style>
+    body { font-family: "Source Sans Pro", Arial, sans-serif; color: #31333f;
+           max-width: 1200px; margin: 0 auto; padding: 1rem 2rem; }
+    nav a { margin-right: 1rem; }
+    section { border-top: 1px solid #ddd; margin-top: 2rem; }
+    .row { display: flex; gap: 1.5rem; }
+    .column { flex: 1; min-width: 0; }
+    .metric { padding: 0.5rem 0; }
+    .metric-label { font-size: 0.9rem; }
+    .metric-value { font-size: 2rem; }
+    .metric-delta { font-size: 0.9rem; color: #09ab3b; }
+    .metric-delta.down { color: #ff2b2b; }
+    .caption { font-size: 0.85rem; color: #808495; }
+    .control { font-size: 0.9rem; color: #555; }
+    .alert { padding: 0.75rem 1rem; border-radius: 0.5rem; margin: 0.5rem 0; }
+    .alert.info { background: #e8f2fc; } .alert.success { background: #e6f6ea; }
+    .alert.warning { background: #fffae5; } .alert.error { background: #fde8e8; }
+    .chart { width: 100%; }
+    table { border-collapse: collapse; font-size: 0.85rem; margin: 0.5rem 0; }
+    th, td { border: 1px solid #ddd; padding: 0.25rem 0.5rem; text-align: right; }
+    details { margin: 0.5rem 0; }
+</style>
+"""
+
+_app = None
+_plotly_script = None
+
+
+def slug(text):
+    """File-name form of a state or population label"""
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def _inline(text):
+    text = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", text)
+    text = re.sub(r"(?<![\w*])\*([^*\n]+?)\*(?![\w*])", r"<em>\1</em>", text)
+    text = re.sub(r"`([^`]+)`", r"<code>\1</code>", text)
+    return re.sub(r"\[([^\]]+)\]\(([^)]+)\)", r'<a href="\2">\1</a>', text)
+
+
+def _basic_markdown(text):
+    """Headings, lists, rules and paragraphs, for when `markdown` is missing"""
+    out, items, paragraph = [], None, []
+
+    def flush():
+        nonlocal items
+        if paragraph:
+            text = _inline(" ".join(paragraph))
+            # Raw HTML blocks pass through unwrapped
+            out.append(text if text.startswith("<") else f"<p>{text}</p>")
+            paragraph.clear()
+        if items:
+            tag, entries = items
+            out.append(f"<{tag}>" + "".join(f"<li>{e}</li>" for e in entries))
+            out.append(f"</{tag}>")
+            items = None
+
+    for line in text.splitlines():
+        stripped = line.strip()
+        heading = re.match(r"(#{1,6})\s+(.*)", stripped)
+        item = re.match(r"([-*]|\d+\.)\s+(.*)", stripped)
+        if not stripped:
+            flush()
+        elif re.fullmatch(r"-{3,}|\*{3,}", stripped):
+            flush()
+            out.append("<hr>")
+        elif heading:
+            flush()
+            level = len(heading.group(1))
+            out.append(f"<h{level}>{_inline(heading.group(2))}</h{level}>")
+        elif item:
+            tag = "ol" if item.group(1)[0].isdigit() else "ul"
+            if paragraph or (items and items[0] != tag):
+                flush()
+            items = items or (tag, [])
+            items[1].append(_inline(item.group(2)))
+        elif items and line[:1].isspace():
+            items[1][-1] += " " + _inline(stripped)
+        else:
+            if items:
+                flush()
+            paragraph.append(stripped)
+    flush()
+    return "\n".join(out)
+
+
+def markdown_html(text, allow_html=False):
+    """HTML for a Streamlit markdown string (python-markdown when installed)"""
+    text = textwrap.dedent(text).strip()
+    if not allow_html:
+        text = html.escape(text, quote=False)
+    try:
+        import markdown
+    except ImportError:
+        return _basic_markdown(text)
+    return markdown.markdown(text, extensions=["tables"])
+
+
+def _metric_html(node):
+    delta = ""
+    if node.delta:
+        down = node.delta.lstrip().startswith("-")
+        delta = (
+            f'<div class="metric-delta{" down" if down else ""}">'
+            f"{html.escape(node.delta)}</div>"
+        )
+    return (
+        f'<div class="metric"><div class="metric-label">'
+        f"{markdown_html(node.label)}</div>"
+        f'<div class="metric-value">{html.escape(str(node.value))}</div>{delta}</div>'
+    )
+
+
+def _table_html(frame):
+    show_index = not isinstance(frame.index, pd.RangeIndex)
+    return frame.to_html(
+        index=show_index,
+        na_rep="–",
+        float_format=lambda v: f"{v:,.2f}",
+        border=0,
+    )
+
+
+def element_html(node, charts):
+    """HTML for one AppTest element or block; `charts` numbers the charts"""
+    kind = type(node).__name__
+    children = "".join(
+        element_html(child, charts) for child in getattr(node, "children", {}).values()
+    )
+    if kind == "Markdown":
+        if node.value == theme.CSS or 'class="main-header"' in node.value:
+            return ""  # The app's stylesheet and title, once in the header
+        return markdown_html(node.value, node.proto.allow_html)
+    if kind == "Caption":
+        return f'<div class="caption">{markdown_html(node.value)}</div>'
+    if kind in ALERTS:
+        return f'<div class="alert {ALERTS[kind]}">{markdown_html(node.value)}</div>'
+    if kind == "Metric":
+        return _metric_html(node)
+    if kind in ("Dataframe", "Table"):
+        return _table_html(node.value)
+    if kind == "Expander":
+        label = html.escape(node.label)
+        return f"<details><summary>{label}</summary>{children}</details>"
+    if kind == "Tab":
+        return f"<h4>{html.escape(node.label)}</h4>{children}"
+    if kind == "Column":
+        return f'<div class="column">{children}</div>'
+    if getattr(node, "type", None) == "plotly_chart":
+        charts.append(node.proto.spec)
+        number = len(charts)
+        spec = node.proto.spec.replace("</", "<\\/")
+        return (
+            f'<div class="chart" id="chart-{number}"></div><script>'
+            f"(function () {{ const spec = {spec}; Plotly.newPlot('chart-{number}', "
+            "spec.data, spec.layout, {responsive: true, displaylogo: false}); })();"
+            "</script>"
+        )
+    if hasattr(node, "label") and hasattr(node, "value"):
+        # A widget: show the setting the snapshot was taken with
+        label = html.escape(str(node.label).strip("*"))
+        return f'<p class="control">{label}: {html.escape(str(node.value))}</p>'
+    if kind in ("Block", "SpecialBlock"):
+        columns = [type(child).__name__ for child in node.children.values()]
+        if columns and all(name == "Column" for name in columns):
+            return f'<div class="row">{children}</div>'
+        return f"<div>{children}</div>"
+    return ""
+
+
+def plotly_script(mode):
+    """<script> tag for plotly.js: embedded, a shared file or the CDN"""
+    import plotly.offline
+
+    if mode == "inline":
+        return f"<script>{plotly.offline.get_plotlyjs()}</script>"
+    if mode == "directory":
+        return '<script src="../plotly.min.js"></script>'
+    version = plotly.offline.get_plotlyjs_version()
+    return f'<script src="https://cdn.plot.ly/plotly-{version}.min.js"></script>'
+
+
+def document(title, header, sections, script):
+    """Whole HTML page from the header and (page, body) sections"""
+    nav = " ".join(
+        f'<a href="#{slug(page)}">{html.escape(page)}</a>' for page, _ in sections
+    )
+    body = "\n".join(
+        f'<section id="{slug(page)}">{content}</section>' for page, content in sections
+    )
+    return (
+        f'<!DOCTYPE html>\n<html lang="en"><head><meta charset="utf-8">'
+        f"<title>{html.escape(title)}</title>{theme.CSS}{EXPORT_CSS}{script}</head>"
+        f"<body><header>{header}<nav>{nav}</nav></header>\n{body}\n"
+        "<footer><p>Crisis Support: <strong>Veterans Crisis Line: 1-800-273-8255 "
+        "(Press 1)</strong></p></footer></body></html>\n"
+    )
+
+
+def _start_worker(shared_path, plotlyjs):
+    """Pool initializer: one app session per worker, exact charts only"""
+    from streamlit.testing.v1 import AppTest
+
+    from dashboard import associations, progressive
+
+    global _app, _plotly_script
+    if shared_path:
+        shared.SHARED_DATASET = shared_path
+    # The export pool already keeps every core busy
+    associations.PARALLEL_MIN_CELLS = float("inf")
+    attributions.PARALLEL_MIN_CELLS = float("inf")
+    progressive.PROGRESSIVE_MIN_ROWS = float("inf")
+    _plotly_script = plotly_script(plotlyjs)
+    _app = AppTest.from_file(APP_SCRIPT, default_timeout=PAGE_TIMEOUT)
+    _app.run()
+
+
+def export_one(state, population, path):
+    """Render every page for one state and population into `path`"""
+    start = time.perf_counter()
+    app = _app
+    app.sidebar.radio[1].set_value(population)
+    app.multiselect(key="facet_State_Name").set_value([state])
+
+    sections, charts = [], []
+    for page in PAGES:
+        app.sidebar.radio[0].set_value(page).run()
+        if app.exception:
+            errors = "".join(
+                f"<pre>{html.escape(e.value)}</pre>" for e in app.exception
+            )
+            sections.append((page, f"<h2>{html.escape(page)}</h2>{errors}"))
+            continue
+        sections.append((page, element_html(app.main, charts)))
+
+    sample = next(
+        (m.value for m in app.sidebar.markdown if m.value.startswith("**Sample")), ""
+    )
+    title = f"{state}: {population}"
+    header = (
+        f'<div class="main-header">{html.escape(title)}</div>'
+        f"{markdown_html(sample)}<p class='caption'>Veterans Mental Health "
+        f"Analysis, BRFSS 2024. Exported {time.strftime('%Y-%m-%d %H:%M')}.</p>"
+    )
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(document(title, header, sections, _plotly_script))
+    return path, len(charts), time.perf_counter() - start
+
+
+def _export_job(job):
+    return export_one(*job)
+
+
+def write_index(out_dir, exported, missing):
+    """index.html linking every export, with the states left out"""
+    populations = list(metrics.POPULATIONS)
+    rows = "".join(
+        f"<tr><td>{html.escape(state)}</td>"
+        + "".join(
+            f'<td><a href="{slug(state)}/{slug(p)}.html">{html.escape(p)}</a></td>'
+            for p in populations
+        )
+        + "</tr>"
+        for state in exported
+    )
+    note = ""
+    if missing:
+        note = (
+            "<p class='caption'>No respondents in this dataset for: "
+            f"{html.escape(', '.join(missing))}.</p>"
+        )
+    with open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(
+            f'<!DOCTYPE html>\n<html lang="en"><head><meta charset="utf-8">'
+            f"<title>State Reports</title>{EXPORT_CSS}</head><body>"
+            f"<h1>Veterans Mental Health: State Reports</h1>"
+            f"<table>{rows}</table>{note}</body></html>\n"
+        )
+
+
+def export_all(out_dir, states=None, populations=None, workers=None, plotlyjs="inline"):
+    """Export every state x population; returns the paths written"""
+    start = time.perf_counter()
+    states = list(states or dict.fromkeys(STATE_CODES.values()))
+    populations = list(populations or metrics.POPULATIONS)
+    workers = workers or os.cpu_count()
+
+    # Publish the frame once for the workers to map, unless already shared
+    shared_path, published = shared.SHARED_DATASET, False
+    if not shared_path:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            pass
+        else:
+            directory = (
+                "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+            )
+            shared_path = os.path.join(directory, f"vmh-export-{os.getpid()}.arrow")
+            shared.publish_frame(load_prepared_frame(), shared_path)
+            shared.SHARED_DATASET, published = shared_path, True
+    try:
+        frame = shared.load_frame(load_prepared_frame)
+        present = set(frame["State_Name"].dropna())
+        exported = [state for state in states if state in present]
+        missing = [state for state in states if state not in present]
+        print(f"{len(exported)} states x {len(populations)} populations")
+
+        # Cached on disk, so workers read the model instead of each fitting it
+        attributions.load_or_compute(frame)
+
+        os.makedirs(out_dir, exist_ok=True)
+        if plotlyjs == "directory":
+            import plotly.offline
+
+            with open(os.path.join(out_dir, "plotly.min.js"), "w") as f:
+                f.write(plotly.offline.get_plotlyjs())
+        jobs = [
+            (
+                state,
+                population,
+                os.path.join(out_dir, slug(state), f"{slug(population)}.html"),
+            )
+            for state in exported
+            for population in populations
+        ]
+        paths = []
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(jobs)) or 1,
+            initializer=_start_worker,
+            initargs=(shared_path, plotlyjs),
+        ) as pool:
+            for i, (path, charts, seconds) in enumerate(pool.map(_export_job, jobs), 1):
+                paths.append(path)
+                print(f"[{i}/{len(jobs)}] {path}: {charts} charts in {seconds:.1f}s")
+        write_index(out_dir, exported, missing)
+    finally:
+        if published:
+            shared.SHARED_DATASET = None
+            os.unlink(shared_path)
+    print(f"{len(paths)} files in {time.perf_counter() - start:.0f}s")
+    return paths
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--out", default="exports")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--states", nargs="+", default=None)
+    parser.add_argument(
+        "--populations", nargs="+", default=None, choices=list(metrics.POPULATIONS)
+    )
+    parser.add_argument(
+        "--plotlyjs", choices=["inline", "directory", "cdn"], default="inline"
+    )
+    args = parser.parse_args(argv)
+    export_all(args.out, args.states, args.populations, args.workers, args.plotlyjs)
+
+
+if __name__ == "__main__":
+    # Workers unpickle jobs by module name, and AppTest replaces __main__
+    from dashboard.export import main
+
+    main()
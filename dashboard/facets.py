@@ -0,0 +1,171 @@
+"""
+Faceted filtering over precomputed per-value bitsets
+
+For every decoded dimension the index keeps one packed bitset (uint64 words,
+one bit per respondent) per value. A facet selection is the OR of its values'
+bitsets, the overall selection is the AND across facets, and the count next to
+each option is a popcount of that option's bitset against the other facets'
+selection. Everything works on `len(frame) / 64` words, so counts for every
+option of every facet come back in milliseconds however many facets are on.
+
+The index is built once per dataset version through `DatasetStore.aggregate`.
+"""
+
+import numpy as np
+import pandas as pd
+
+from dashboard.constants import (
+    AGE_GROUP_ORDER,
+    EDUCATION_ORDER,
+    HEALTH_ORDER,
+    INCOME_ORDER,
+    SUPPORT_ORDER,
+)
+
+# Column -> (sidebar label, "all" option or None, value ordering or None).
+# Facets with an "all" option keep the original sidebar behaviour of listing
+# it as the default; the rest start empty, which also means no filter.
+FACETS = {
+    "State_Name": ("States", "All States", None),
+    "Age_Group": ("Age Groups", "All Ages", AGE_GROUP_ORDER),
+    "Income_Group": ("Income", None, INCOME_ORDER),
+    "Employment": ("Employment", None, None),
+    "Education": ("Education", None, EDUCATION_ORDER),
+    "Emotional_Support": ("Emotional Support", None, SUPPORT_ORDER),
+    "General_Health": ("General Health", None, HEALTH_ORDER),
+    "Marital": ("Marital Status", None, None),
+    "Life_Satisfaction": ("Life Satisfaction", None, None),
+    "Has_Insurance": ("Health Insurance", None, None),
+    "Has_Doctor": ("Personal Doctor", None, None),
+    "Cost_Barrier": ("Cost Barrier to Care", None, None),
+    "Depression": ("Depression Diagnosis", None, None),
+}
+
+# Facets shown directly in the sidebar; the rest go under "More filters"
+PRIMARY_FACETS = ["State_Name", "Age_Group"]
+
+# Indexed but driven by the population radio rather than a facet widget
+INDEXED_COLUMNS = ["Gender"] + list(FACETS)
+
+# Set bits of every byte value, for popcounts on NumPy < 2
+BYTE_BITS = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+
+
+def _popcount(words):
+    """Set bits in each row of a 2-d uint64 bitset array"""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=1)
+    return BYTE_BITS[words.view(np.uint8)].sum(axis=1)
+
+
+class FacetIndex:
+    """Per-value bitsets for every indexed column of a frame"""
+
+    def __init__(self, frame):
+        self.n_rows = len(frame)
+        self.n_words = -(-self.n_rows // 64)
+        self.values = {}
+        self.bits = {}
+        for column in INDEXED_COLUMNS:
+            if column not in frame.columns:
+                continue
+            order = FACETS.get(column, (None, None, None))[2]
+            codes, uniques = pd.factorize(frame[column].to_numpy(), sort=True)
+            uniques = list(uniques)
+            if order is not None:
+                # Known categories first in chart order, anything else after
+                ranked = [v for v in order if v in uniques]
+                ranked += [v for v in uniques if v not in ranked]
+                remap = np.array([ranked.index(v) for v in uniques] + [-1])
+                codes = remap[codes]
+                uniques = ranked
+            self.values[column] = uniques
+            self.bits[column] = self._pack(codes, len(uniques))
+
+    def _pack(self, codes, n_values):
+        bits = np.zeros((n_values, self.n_words * 8), dtype=np.uint8)
+        for value in range(n_values):
+            packed = np.packbits(codes == value, bitorder="little")
+            bits[value, : len(packed)] = packed
+        return bits.view(np.uint64)
+
+    def _facet_mask(self, column, selected):
+        positions = [
+            self.values[column].index(v) for v in selected if v in self.values[column]
+        ]
+        return np.bitwise_or.reduce(self.bits[column][positions], axis=0)
+
+    def _all(self):
+        mask = np.full(self.n_words, np.uint64(0xFFFFFFFFFFFFFFFF))
+        # Clear the padding bits past the last row
+        tail = self.n_rows % 64
+        if tail:
+            mask[-1] = np.uint64((1 << tail) - 1)
+        return mask
+
+    def mask(self, selections):
+        """Bitset of rows matching every active selection"""
+        mask = self._all()
+        for column, selected in selections.items():
+            if column in self.bits:
+                mask &= self._facet_mask(column, selected)
+        return mask
+
+    def counts(self, selections):
+        """Per-option counts for every column under the other columns' filters
+
+        Returns {column: {value: count}}. An option's own facet is left out of
+        its count, so options of an active facet still show what selecting
+        them would add.
+        """
+        columns = list(self.bits)
+        masks = [
+            self._facet_mask(c, selections[c]) if c in selections else None
+            for c in columns
+        ]
+        # Prefix and suffix ANDs give "all facets but this one" in O(facets)
+        prefix, suffix = [self._all()], [self._all()]
+        for mask in masks:
+            prefix.append(prefix[-1] if mask is None else prefix[-1] & mask)
+        for mask in reversed(masks):
+            suffix.append(suffix[-1] if mask is None else suffix[-1] & mask)
+        suffix.reverse()
+
+        result = {}
+        for i, column in enumerate(columns):
+            others = prefix[i] & suffix[i + 1]
+            counts = _popcount(self.bits[column] & others)
+            result[column] = dict(zip(self.values[column], counts.tolist()))
+        return result
+
+    def positions(self, mask):
+        """Row positions set in a bitset"""
+        flags = np.unpackbits(mask.view(np.uint8), bitorder="little")
+        return np.flatnonzero(flags[: self.n_rows])
+
+
+def build_index(frame):
+    """Facet index for a prepared frame"""
+    return FacetIndex(frame)
+
+
+def active_selections(values):
+    """Drop empty facets and facets left on their "all" option"""
+    selections = {}
+    for column, selected in values.items():
+        all_option = FACETS.get(column, (None, None, None))[1]
+        if selected and all_option not in selected:
+            selections[column] = list(selected)
+    return selections
+
+
+def selection_key(selections):
+    """Hashable, order-independent form of a selections dict"""
+    return tuple(sorted((c, tuple(sorted(v))) for c, v in (selections or {}).items()))
+
+
+def apply(df_all, index, selections):
+    """Rows of `df_all` matching the selections (`df_all` itself when none)"""
+    if not selections:
+        return df_all
+    return df_all.iloc[index.positions(index.mask(selections))]
@@ -0,0 +1,102 @@
+"""
+Composite scores built from raw BRFSS items
+
+Each score counts how many of its items a respondent answered with an adverse
+code. Scores are declared in `COMPOSITE_SCORES` and computed together in one
+pass: every item column is compared against its adverse codes as a single
+(rows x items x codes) array and the per-score counts are summed with
+`np.add.reduceat`. Don't know / refused codes (7, 9) and skipped items make
+the score missing (complete cases only), since treating them as "not adverse"
+would undercount.
+"""
+
+import numpy as np
+
+# Don't know / not sure and refused, for every item used below
+MISSING_CODES = (7, 9)
+
+# Score column -> {item column: codes counted as adverse}
+COMPOSITE_SCORES = {
+    # Adverse childhood experiences (0-13); ACEDIVRC code 8 (parents never
+    # married) is not counted. ACEADSAF/ACEADNED ask how often an adult made
+    # the respondent feel safe / met their basic needs, so never or a little
+    # of the time (1-2) is the adverse answer.
+    "ACE_Score": {
+        "ACEDEPRS": (1,),
+        "ACEDRINK": (1,),
+        "ACEDRUGS": (1,),
+        "ACEPRISN": (1,),
+        "ACEDIVRC": (1,),
+        "ACEPUNCH": (2, 3),
+        "ACEHURT1": (2, 3),
+        "ACESWEAR": (2, 3),
+        "ACETOUCH": (2, 3),
+        "ACETTHEM": (2, 3),
+        "ACEHVSEX": (2, 3),
+        "ACEADSAF": (1, 2),
+        "ACEADNED": (1, 2),
+    },
+    # Social determinants of health burden (0-6)
+    "SDOH_Burden": {
+        "SDHEMPLY": (1,),  # lost job or hours
+        "SDHFOOD1": (1, 2, 3),  # food ran out always/usually/sometimes
+        "SDHBILLS": (1,),  # could not pay rent, mortgage or utilities
+        "SDHUTILS": (1, 3),  # utilities threatened or already shut off
+        "SDHTRNSP": (1,),  # no reliable transportation
+        "SDLONELY": (1, 2),  # lonely always/usually
+    },
+    # Diagnosed chronic conditions (0-6); DIABETE4 2 is pregnancy-only
+    "Chronic_Conditions": {
+        "CVDINFR4": (1,),
+        "CVDSTRK3": (1,),
+        "ASTHMA3": (1,),
+        "CHCCOPD3": (1,),
+        "DIABETE4": (1,),
+        "HAVARTH4": (1,),
+    },
+}
+
+# Labels for pickers and axis titles
+SCORE_LABELS = {
+    "ACE_Score": "ACE Score",
+    "SDOH_Burden": "SDOH Burden",
+    "Chronic_Conditions": "Chronic Conditions",
+}
+
+
+def composite_scores(df, scores=None):
+    """Score matrix (rows x scores) for every declared composite score
+
+    A score whose items are not all present in `df` is entirely missing.
+    """
+    scores = COMPOSITE_SCORES if scores is None else scores
+    available = {
+        name: items for name, items in scores.items() if set(items) <= set(df.columns)
+    }
+    result = np.full((len(df), len(scores)), np.nan)
+    if not available:
+        return result
+
+    items = [item for spec in available.values() for item in spec]
+    width = max(len(codes) for spec in available.values() for codes in spec.values())
+    adverse_codes = np.full((len(items), width), np.nan)
+    for i, codes in enumerate(c for spec in available.values() for c in spec.values()):
+        adverse_codes[i, : len(codes)] = codes
+
+    values = df[items].to_numpy(dtype=float)
+    adverse = (values[:, :, None] == adverse_codes[None]).any(axis=2)
+    missing = np.isnan(values) | np.isin(values, MISSING_CODES)
+
+    starts = np.cumsum([0] + [len(spec) for spec in available.values()])[:-1]
+    counts = np.add.reduceat(adverse, starts, axis=1).astype(float)
+    counts[np.add.reduceat(missing, starts, axis=1) > 0] = np.nan
+
+    positions = [list(scores).index(name) for name in available]
+    result[:, positions] = counts
+    return result
+
+
+def add_composite_scores(df):
+    """Add one column per composite score to `df` (in place) and return it"""
+    df[list(COMPOSITE_SCORES)] = composite_scores(df)
+    return df
@@ -0,0 +1,176 @@
+"""
+State -> metro status -> urban/rural aggregate tree with a Female/Male split
+
+BRFSS places each respondent's county as metropolitan or not (`_METSTAT`)
+and as urban or rural (`_URBSTAT`). Metropolitan counties are all urban,
+non-metropolitan ones split into urban (micropolitan) and rural, so the two
+nest under each state into a small tree.
+
+The whole tree is one count/sum array, built with a single `np.bincount` per
+statistic. Besides its levels, each axis has an "Unknown" slot (code
+missing) and an "All" slot. The "All" slots are filled by summing child
+cells one axis at a time, so every parent total is an exact roll-up of its
+children. Any node, with or without its gender split, is then a lookup,
+e.g. `tree[state, ALL, ALL]`. The array is additive, so incremental
+refreshes patch it in place like the day-count cube. Sidebar selections
+other than State and Gender fall back to building the tree from the
+filtered rows.
+
+Because parents are exact totals of their children, a drilldown shown with
+one small child would give it away; `suppress` hides such rows together with
+complements (see dashboard.suppression).
+"""
+
+import numpy as np
+import pandas as pd
+
+from dashboard import suppression
+from dashboard.constants import METRO_STATUS, STATE_CODES, URBAN_STATUS
+from dashboard.metrics import DISTRESS_THRESHOLD
+
+DAYS = "Mental_Health_Days_Clean"
+
+# Axis column -> (codes in the column, level labels), root to leaf, then Gender
+AXES = {
+    "State_Name": (list(dict.fromkeys(STATE_CODES.values())),) * 2,
+    "_METSTAT": (list(METRO_STATUS), list(METRO_STATUS.values())),
+    "_URBSTAT": (list(URBAN_STATUS), list(URBAN_STATUS.values())),
+    "Gender": (["Female", "Male"],) * 2,
+}
+
+# Statistics per cell, in the last axis
+STATS = ["respondents", "answered", "days", "distress", "depression"]
+
+# Trailing slots of every axis
+UNKNOWN, ALL = -2, -1
+
+
+def _row_stats(df):
+    days = df[DAYS].to_numpy(dtype=float)
+    answered = ~np.isnan(days)
+    return [
+        np.ones(len(df)),
+        answered.astype(float),
+        np.where(answered, days, 0.0),
+        (answered & (days >= DISTRESS_THRESHOLD)).astype(float),
+        (df["Depression"] == "Yes").to_numpy(dtype=float),
+    ]
+
+
+def build_tree(df):
+    """Count/sum array over State x Metro x Urban x Gender with roll-up slots"""
+    shape = [len(labels) + 1 for _, labels in AXES.values()]
+    codes = []
+    for column, (keys, _) in AXES.items():
+        column_codes = pd.Index(keys).get_indexer(df[column].to_numpy())
+        codes.append(np.where(column_codes >= 0, column_codes, len(keys)))
+    flat = np.ravel_multi_index(codes, shape)
+    size = int(np.prod(shape))
+    tree = np.stack(
+        [np.bincount(flat, values, size).reshape(shape) for values in _row_stats(df)],
+        axis=-1,
+    )
+    # Append each axis's "All" slot as the sum of the slots before it
+    for axis in range(len(AXES)):
+        tree = np.concatenate([tree, tree.sum(axis=axis, keepdims=True)], axis=axis)
+    return tree
+
+
+def covers(selections):
+    """Whether the tree alone can answer a sidebar selection"""
+    return set(selections) <= {"State_Name", "Gender"}
+
+
+def restrict(tree, states):
+    """Tree with every state but `states` zeroed, the all-states slot rolled up
+
+    The state axis keeps all its slots, so positions still match the labels.
+    """
+    positions = pd.Index(AXES["State_Name"][1]).get_indexer(states)
+    keep = np.zeros(len(tree) - 1, dtype=bool)
+    keep[positions[positions >= 0]] = True
+    sub = np.where(keep.reshape(-1, *[1] * (tree.ndim - 1)), tree[:-1], 0)
+    return np.concatenate([sub, sub.sum(axis=0, keepdims=True)], axis=0)
+
+
+def states(tree):
+    """States with at least one respondent, in tree order"""
+    labels = AXES["State_Name"][1]
+    counts = tree[: len(labels), ALL, ALL, ALL, STATS.index("respondents")]
+    return [label for label, n in zip(labels, counts) if n > 0]
+
+
+def _metrics(cell, area, level, genders):
+    """Long-form rows (one per gender slot) for one node's cell"""
+    gender_slots = {"All": ALL, "Female": 0, "Male": 1}
+    rows = []
+    for gender in genders:
+        n, answered, days, distress, depression = cell[gender_slots[gender]]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rows.append(
+                {
+                    "Level": level,
+                    "Area": area,
+                    "Gender": gender,
+                    "n": int(n),
+                    "Mean_Days": days / answered,
+                    "Distress": distress / n * 100,
+                    "Depression": depression / n * 100,
+                }
+            )
+    return rows
+
+
+def drilldown(tree, state=None, genders=("All", "Female", "Male")):
+    """A state's node (all states when None) with its metro and urban children
+
+    Returns long-form rows in tree order: Level (0 state, 1 metro status,
+    2 urban/rural), Area, Gender, n, Mean_Days, Distress (%) and
+    Depression (%). Children without respondents are left out.
+    """
+    s = ALL if state is None else AXES["State_Name"][1].index(state)
+    respondents = STATS.index("respondents")
+    rows = _metrics(tree[s, ALL, ALL], state or "All states", 0, genders)
+    metro_labels = [*AXES["_METSTAT"][1], "Unknown"]
+    urban_labels = [*AXES["_URBSTAT"][1], "Unknown"]
+    for m, metro in enumerate(metro_labels):
+        if tree[s, m, ALL, ALL, respondents] == 0:
+            continue
+        rows += _metrics(tree[s, m, ALL], metro, 1, genders)
+        for u, urban in enumerate(urban_labels):
+            if tree[s, m, u, ALL, respondents] > 0:
+                rows += _metrics(tree[s, m, u], urban, 2, genders)
+    return pd.DataFrame(rows)
+
+
+def suppress(rows, min_n=None):
+    """Drilldown rows with small cells, and cells that would reveal them, hidden
+
+    A node's "All" row is the total of its Female and Male rows, and each
+    parent row (per gender) the total of its children's, so both are
+    constraint groups. Hidden rows get NaN statistics and `suppressed` set.
+    """
+    n_genders = int((rows["Level"] == 0).sum())
+    node = np.arange(len(rows)) // n_genders
+    slot = np.arange(len(rows)) % n_genders
+    parent, latest = np.full(len(rows) // n_genders, -1), {}
+    for i, level in enumerate(rows["Level"].to_numpy()[::n_genders]):
+        latest[level] = i
+        parent[i] = latest[level - 1] if level else -1
+    n_families = len(parent) * n_genders
+    has_parent = parent[node] >= 0
+    members = [
+        node + n_families,
+        node * n_genders + slot,
+        (parent[node] * n_genders + slot)[has_parent],
+    ]
+    cells = [np.arange(len(rows))] * 2 + [np.flatnonzero(has_parent)]
+    hidden = suppression.hide(
+        rows["n"].to_numpy(), np.concatenate(members), np.concatenate(cells), min_n
+    )
+    rows = rows.copy()
+    columns = ["n", "Mean_Days", "Distress", "Depression"]
+    rows[columns] = rows[columns].astype(float)
+    rows.loc[hidden, columns] = np.nan
+    rows["suppressed"] = hidden
+    return rows
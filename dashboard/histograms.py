@@ -0,0 +1,141 @@
+"""
+Day-count histograms for exact distress metrics without touching raw rows
+
+`MENTHLTH` and `PHYSHLTH` are whole numbers of days (0-30) once the >30 codes
+are cleaned to NaN, so a 32-slot count vector (one slot per day plus one for
+missing answers) holds everything needed for means, exact medians and
+percentiles, and the share reporting at least k days for any k. Missing
+answers are kept so "≥k days" rates use every respondent as the denominator,
+the same as `metrics.distress_rate`.
+
+The cube stores one such vector per Outcome x Gender x State x Age Group cell
+and is registered as an additive store aggregate, so incremental refreshes
+patch it in place. Sidebar selections on those dimensions are answered by
+slicing and summing the cube; any other facet falls back to a single
+`np.bincount` over the filtered rows.
+"""
+
+import numpy as np
+import pandas as pd
+
+from dashboard.constants import AGE_GROUP_ORDER, STATE_CODES
+
+OUTCOMES = {
+    "mental": "Mental_Health_Days_Clean",
+    "physical": "Physical_Health_Days_Clean",
+}
+
+MAX_DAYS = 30
+MISSING = MAX_DAYS + 1
+N_BINS = MAX_DAYS + 2
+
+# Cube dimensions and their levels; each axis has one extra trailing slot for
+# values outside the list (e.g. an unmapped state code) so totals still add up
+DIMENSIONS = {
+    "Gender": ["Female", "Male"],
+    "State_Name": list(dict.fromkeys(STATE_CODES.values())),
+    "Age_Group": list(AGE_GROUP_ORDER),
+}
+
+
+def _codes(values, levels):
+    codes = pd.Index(levels).get_indexer(values)
+    codes[codes < 0] = len(levels)
+    return codes
+
+
+def day_bins(values):
+    """Histogram slot of each day count (MISSING for NaN)"""
+    values = np.asarray(values, dtype=float)
+    return np.where(np.isnan(values), MISSING, values).astype(np.intp)
+
+
+def _histogram(df, outcome, columns):
+    """Counts with shape (levels + 1 per column..., N_BINS) via one bincount"""
+    shape = [len(DIMENSIONS[c]) + 1 for c in columns] + [N_BINS]
+    codes = [_codes(df[c].to_numpy(), DIMENSIONS[c]) for c in columns]
+    flat = np.ravel_multi_index(
+        (*codes, day_bins(df[OUTCOMES[outcome]].to_numpy())), shape
+    )
+    return np.bincount(flat, minlength=int(np.prod(shape))).reshape(shape)
+
+
+def build_cube(df):
+    """Outcome x Gender x State x Age x day-count cube for a frame"""
+    return np.stack([_histogram(df, outcome, list(DIMENSIONS)) for outcome in OUTCOMES])
+
+
+def covers(selections):
+    """Whether the cube alone can answer a selection"""
+    return set(selections) <= set(DIMENSIONS)
+
+
+def select(cube, outcome="mental", selections=None, by=()):
+    """Histogram(s) for a selection, summed over every axis not in `by`
+
+    The result has one axis per `by` column (its known levels, in order)
+    followed by the N_BINS slot axis.
+    """
+    selections = selections or {}
+    sub = cube[list(OUTCOMES).index(outcome)]
+    for axis, column in enumerate(DIMENSIONS):
+        known = np.arange(len(DIMENSIONS[column]))
+        if column in selections:
+            positions = pd.Index(DIMENSIONS[column]).get_indexer(selections[column])
+            positions = positions[positions >= 0]
+            if column in by:
+                # Keep every level so the axis lines up, zeroing unselected ones
+                keep = np.isin(known, positions)
+                shape = [1] * sub.ndim
+                shape[axis] = len(known)
+                sub = np.take(sub, known, axis=axis) * keep.reshape(shape)
+            else:
+                sub = np.take(sub, positions, axis=axis)
+        elif column in by:
+            # The unknown slot only counts toward totals, not a named level
+            sub = np.take(sub, known, axis=axis)
+    columns = list(DIMENSIONS)
+    summed = tuple(i for i, c in enumerate(columns) if c not in by)
+    sub = sub.sum(axis=summed)
+    # Reorder kept axes to follow `by`
+    kept = [c for c in columns if c in by]
+    return np.moveaxis(sub, [kept.index(c) for c in by], range(len(by)))
+
+
+def from_rows(df, outcome="mental", by=()):
+    """Same result as `select` computed directly from (filtered) rows"""
+    counts = _histogram(df, outcome, list(by))
+    for axis, column in enumerate(by):
+        counts = np.take(counts, np.arange(len(DIMENSIONS[column])), axis=axis)
+    return counts
+
+
+def respondents(hist):
+    """Respondents in each histogram, including missing answers"""
+    return hist.sum(axis=-1)
+
+
+def mean(hist):
+    """Mean days among respondents who answered"""
+    days = hist[..., :MISSING]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (days * np.arange(MISSING)).sum(axis=-1) / days.sum(axis=-1)
+
+
+def rate_at_least(hist, k):
+    """Percentage of all respondents reporting at least `k` days"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return hist[..., k:MISSING].sum(axis=-1) / hist.sum(axis=-1) * 100
+
+
+def quantile(hist, q):
+    """Exact q-quantile of answered days (linear interpolation, like numpy)"""
+    cumulative = np.cumsum(hist[:MISSING])
+    n = cumulative[-1]
+    if n == 0:
+        return np.nan
+    position = (n - 1) * q
+    lower, upper = np.floor(position), np.ceil(position)
+    # The value at 0-based rank r is the first day whose cumulative count > r
+    low_value, high_value = np.searchsorted(cumulative, [lower, upper], side="right")
+    return low_value + (high_value - low_value) * (position - lower)
@@ -0,0 +1,196 @@
+"""
+Sparse race/ethnicity x gender x age aggregate for intersectional rates
+
+BRFSS codes race/ethnicity several ways: imputed (`_IMPRACE`, never
+missing), eight groups (`_RACE`), five groups (`_RACEGR3`) and Hispanic
+origin alone (`_HISPANC`). All four sit in one aggregate with gender, age
+group and state, so any coding can be crossed with the others and filtered
+by the sidebar.
+
+A dense array over those axes would hold every combination, most of them
+empty, and grow with the product of the level counts. Only non-empty cells
+are kept instead: each respondent's codes are packed into one integer key,
+`np.unique` finds the distinct keys and one `np.bincount` per statistic sums
+the rows into them. The cell count is at most the number of respondents
+however many dimensions there are, so adding one costs a column of codes.
+Queries keep the cells matching a selection, repack the codes of the kept
+axes and sum again.
+
+Cubes add and subtract cell by cell, so incremental refreshes patch the
+stored one like the dense aggregates.
+"""
+
+import numpy as np
+import pandas as pd
+
+from dashboard.constants import (
+    AGE_GROUP_ORDER,
+    HISPANIC_ORIGIN,
+    IMPUTED_RACE,
+    RACE_ETHNICITY,
+    RACE_GROUPS,
+    STATE_CODES,
+)
+from dashboard.metrics import DISTRESS_THRESHOLD
+
+DAYS = "Mental_Health_Days_Clean"
+
+# Column -> (codes in the column, level labels); each axis also has a
+# trailing "Unknown" slot for missing or unlisted codes
+DIMENSIONS = {
+    "State_Name": (list(dict.fromkeys(STATE_CODES.values())),) * 2,
+    "Gender": (["Female", "Male"],) * 2,
+    "Age_Group": (AGE_GROUP_ORDER,) * 2,
+    "_IMPRACE": (list(IMPUTED_RACE), list(IMPUTED_RACE.values())),
+    "_RACE": (list(RACE_ETHNICITY), list(RACE_ETHNICITY.values())),
+    "_RACEGR3": (list(RACE_GROUPS), list(RACE_GROUPS.values())),
+    "_HISPANC": (list(HISPANIC_ORIGIN), list(HISPANIC_ORIGIN.values())),
+}
+
+# Statistics per cell
+STATS = ["respondents", "distress", "depression"]
+
+# Broad age bands per 5-year group
+AGE_BANDS = {
+    **dict.fromkeys(AGE_GROUP_ORDER[:3], "18-34"),
+    **dict.fromkeys(AGE_GROUP_ORDER[3:6], "35-49"),
+    **dict.fromkeys(AGE_GROUP_ORDER[6:9], "50-64"),
+    **dict.fromkeys(AGE_GROUP_ORDER[9:], "65+"),
+}
+
+
+def _sizes(axes):
+    return [len(DIMENSIONS[column][1]) + 1 for column in axes]
+
+
+def _collapse(codes, stats, axes):
+    """Distinct code rows of `codes` with their `stats` summed, in key order"""
+    keys = np.ravel_multi_index(codes.T.astype(np.int64), _sizes(axes))
+    cells, inverse = np.unique(keys, return_inverse=True)
+    summed = np.column_stack(
+        [np.bincount(inverse, stats[:, i], len(cells)) for i in range(stats.shape[1])]
+    )
+    unpacked = np.column_stack(np.unravel_index(cells, _sizes(axes)))
+    return unpacked.astype(np.int16), summed
+
+
+class SparseCube:
+    """Non-empty cells of the count/sum cube over `axes`
+
+    `codes[i]` gives cell i's level position on every axis (the level count
+    for "Unknown") and `stats[i]` its sums in STATS order.
+    """
+
+    def __init__(self, codes, stats, axes=None):
+        self.codes = codes
+        self.stats = stats
+        self.axes = list(axes or DIMENSIONS)
+
+    @property
+    def shape(self):
+        """Shape of the equivalent dense cube, for same-layout checks"""
+        return (*_sizes(self.axes), len(STATS))
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes + self.stats.nbytes
+
+    def __len__(self):
+        return len(self.codes)
+
+    def _combine(self, other, sign):
+        codes, stats = _collapse(
+            np.concatenate([self.codes, other.codes]),
+            np.concatenate([self.stats, sign * other.stats]),
+            self.axes,
+        )
+        kept = stats[:, 0] != 0
+        return SparseCube(codes[kept], stats[kept], self.axes)
+
+    def __add__(self, other):
+        return self._combine(other, 1)
+
+    def __sub__(self, other):
+        return self._combine(other, -1)
+
+
+def _row_stats(df):
+    days = df[DAYS].to_numpy(dtype=float)
+    answered = ~np.isnan(days)
+    return np.column_stack(
+        [
+            np.ones(len(df)),
+            answered & (days >= DISTRESS_THRESHOLD),
+            (df["Depression"] == "Yes").to_numpy(),
+        ]
+    ).astype(float)
+
+
+def build_cube(df, axes=None):
+    """Sparse cube of respondents' stats over `axes` (every DIMENSIONS axis)"""
+    axes = list(axes or DIMENSIONS)
+    codes = np.empty((len(df), len(axes)), dtype=np.int64)
+    for j, column in enumerate(axes):
+        # Match the few distinct values, not every row, against the levels;
+        # missing values (-1) land in the trailing "Unknown" slot
+        keys = DIMENSIONS[column][0]
+        row_codes, values = pd.factorize(df[column])
+        lookup = pd.Index(keys).get_indexer(values)
+        lookup[lookup < 0] = len(keys)
+        codes[:, j] = np.append(lookup, len(keys))[row_codes]
+    return SparseCube(*_collapse(codes, _row_stats(df), axes), axes)
+
+
+def covers(selections):
+    """Whether the cube alone can answer a sidebar selection"""
+    return set(selections) <= {"State_Name", "Gender", "Age_Group"}
+
+
+def levels(column, bands=None):
+    """Display order of an axis's labels, after any `bands` regrouping"""
+    if bands and column in bands:
+        return [*dict.fromkeys(bands[column].values()), "Unknown"]
+    return [*DIMENSIONS[column][1], "Unknown"]
+
+
+def table(cube, by, selections=None, bands=None):
+    """Rates per combination of the `by` axes over the selected cells
+
+    `selections` maps axes to the levels kept; `bands` maps an axis to a
+    {level: band} regrouping, e.g. `{"Age_Group": AGE_BANDS}`. Returns one
+    row per non-empty combination with the level labels ("Unknown" for
+    missing codes), n, Distress (%) and Depression (%), in level order.
+    """
+    keep = np.ones(len(cube), dtype=bool)
+    for column, chosen in (selections or {}).items():
+        positions = pd.Index(DIMENSIONS[column][1]).get_indexer(chosen)
+        j = cube.axes.index(column)
+        keep &= np.isin(cube.codes[:, j], positions[positions >= 0])
+    codes = cube.codes[keep][:, [cube.axes.index(column) for column in by]]
+    labels = [levels(column, bands) for column in by]
+    for j, column in enumerate(by):
+        if bands and column in bands:
+            lookup = [
+                labels[j].index(bands[column][level]) for level in DIMENSIONS[column][1]
+            ]
+            codes[:, j] = np.array([*lookup, len(labels[j]) - 1])[codes[:, j]]
+
+    sizes = [len(names) for names in labels]
+    keys = np.ravel_multi_index(codes.T.astype(np.int64), sizes)
+    cells, inverse = np.unique(keys, return_inverse=True)
+    stats = cube.stats[keep]
+    n, distress, depression = (
+        np.bincount(inverse, stats[:, i], len(cells)) for i in range(len(STATS))
+    )
+    positions = np.unravel_index(cells, sizes)
+    result = pd.DataFrame(
+        {
+            column: np.asarray(names, dtype=object)[position]
+            for column, names, position in zip(by, labels, positions)
+        }
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result["n"] = n.astype(int)
+        result["Distress"] = distress / n * 100
+        result["Depression"] = depression / n * 100
+    return result
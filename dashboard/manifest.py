@@ -0,0 +1,104 @@
+"""
+Dataset manifest: the counts and coverage the sidebar and pages describe
+
+Built once per dataset version as a store aggregate, so the sidebar totals,
+the "Why N instead of 50?" note, the page introductions and the footer read
+plain numbers instead of masking the full frame on every rerun, and the
+territory counts and missing states always match the loaded data.
+"""
+
+import re
+
+import numpy as np
+
+from dashboard.constants import STATE_CODES, TERRITORIES
+
+GENDERS = ["Female", "Male"]
+
+# Columns the dashboard analyses, listed in the sidebar coverage note
+SUMMARY_COLUMNS = [
+    "Mental_Health_Days_Clean",
+    "Physical_Health_Days_Clean",
+    "Depression",
+    "Age_Group",
+    "Income_Group",
+    "Employment",
+    "Education",
+    "Marital",
+    "General_Health",
+    "Emotional_Support",
+    "Life_Satisfaction",
+    "ACE_Score",
+    "SDOH_Burden",
+    "Chronic_Conditions",
+]
+
+
+def build_manifest(frame):
+    """Counts per gender, state and territory, missing states and column coverage
+
+    Returns a dict with `rows`, `genders`, `states` and `territories`
+    ({name: respondents}, largest first), `missing_states` (states with no
+    respondents, alphabetical), `unmapped_rows` (state code not in
+    STATE_CODES) and `coverage` ({column: share of rows answered}).
+    """
+    genders = frame["Gender"].value_counts()
+    places = frame["State_Name"].value_counts()
+    known = list(dict.fromkeys(STATE_CODES.values()))
+    states = places[[p for p in places.index if p not in TERRITORIES]]
+    territories = places[[p for p in places.index if p in TERRITORIES]]
+    answered = np.asarray(frame.notna().sum()) / max(len(frame), 1)
+    return {
+        "rows": len(frame),
+        "genders": {g: int(genders.get(g, 0)) for g in GENDERS},
+        "states": {name: int(n) for name, n in states.items()},
+        "territories": {name: int(n) for name, n in territories.items()},
+        "missing_states": sorted(
+            p for p in known if p not in places.index and p not in TERRITORIES
+        ),
+        "unmapped_rows": int(frame["State_Name"].isna().sum()),
+        "coverage": dict(zip(frame.columns, answered.tolist())),
+    }
+
+
+def area_count(manifest):
+    """States plus territories with at least one respondent"""
+    return len(manifest["states"]) + len(manifest["territories"])
+
+
+def why_areas_markdown(manifest):
+    """Markdown for the sidebar note explaining the state/territory count"""
+    n_states = len(manifest["states"])
+    n_territories = len(manifest["territories"])
+    territories = "\n".join(
+        f"- **{name}** - {n:,} veterans"
+        for name, n in sorted(manifest["territories"].items())
+    )
+    missing = manifest["missing_states"]
+    note = ""
+    if missing:
+        verb = "is" if len(missing) == 1 else "are"
+        note = f"**Note:** {', '.join(missing)} {verb} not represented in this dataset."
+    return f"""
+The dataset includes **{n_states} U.S. states** plus **{n_territories} U.S. territories**:
+
+**Territories included:**
+{territories}
+
+{note}
+
+The CDC BRFSS survey covers U.S. territories because they have significant
+veteran populations and unique healthcare challenges.
+
+**Total: {area_count(manifest)} geographic areas ({n_states} states + {n_territories} territories)**
+"""
+
+
+def coverage_markdown(manifest, columns=None):
+    """Markdown list of the share of respondents answering each column"""
+    coverage = manifest["coverage"]
+    columns = [c for c in (columns or SUMMARY_COLUMNS) if c in coverage]
+    return "\n".join(
+        f"- {re.sub('_Clean$', '', column).replace('_', ' ')}: {coverage[column]:.0%}"
+        for column in columns
+    )
@@ -0,0 +1,181 @@
+"""
+Propensity-score matched female vs male comparison
+
+The raw "Compare Genders" contrast mixes gender with everything that differs
+between the female and male samples: female veterans are younger, earn less
+and are insured at different rates. Matching compares each female respondent
+with the male respondent most like her on those characteristics instead.
+
+A survey-weighted logistic model of being female on the matching covariates
+gives every respondent a propensity score (reusing the sparse design and IRLS
+of `dashboard.regression`). Each female is paired with the male nearest on
+the logit of the score, found with a KD-tree so 100k+ rows match in well
+under a second. Males can be reused (matching with replacement). Pairs
+farther apart than the caliper, 0.2 standard deviations of the logit
+(Austin 2011), are dropped. The comparison metrics are then averaged over
+the matched females and their partners.
+"""
+
+import numpy as np
+import pandas as pd
+
+from dashboard import regression
+from dashboard.metrics import DISTRESS_THRESHOLD
+
+# Characteristics the female and male samples are balanced on; health and
+# support are left out because they may be consequences of mental health
+MATCH_COVARIATES = {
+    column: regression.COVARIATES[column]
+    for column in ("Age_Group", "Income_Group", "Employment", "Has_Insurance")
+}
+
+# Caliper width in standard deviations of the logit propensity score
+CALIPER_SD = 0.2
+
+# Categorical covariates give many respondents identical scores, and a tree
+# search always returns the same one of several tied males. Jitter this small
+# (in standard deviations) spreads ties across all tied males at random.
+TIE_BREAK_SD = 1e-6
+
+FEMALE = "_female"
+
+# Metric label -> per-respondent value (averaged over matched respondents),
+# given the rows and the distress threshold in days
+MATCHED_METRICS = {
+    "Depression Rate (%)": lambda df, _: (df["Depression"] == "Yes") * 100.0,
+    "Avg Mental Health Days": lambda df, _: df["Mental_Health_Days_Clean"],
+    "Frequent Distress (%)": lambda df, threshold: (
+        (df["Mental_Health_Days_Clean"] >= threshold) * 100.0
+    ),
+    "Uninsured (%)": lambda df, _: (df["Has_Insurance"] == "No") * 100.0,
+}
+
+
+def build_design(frame):
+    """Propensity design: female indicator on the matching covariates"""
+    columns = [*MATCH_COVARIATES, regression.WEIGHT_COLUMN]
+    df = frame[columns].assign(
+        **{FEMALE: (frame["Gender"] == "Female").to_numpy(dtype=float)}
+    )
+    return regression.build_design(df, MATCH_COVARIATES, outcome=FEMALE)
+
+
+def match(design, rows=None):
+    """Female row positions, their matched male positions and the caliper
+
+    Returns None when the propensity model cannot be fitted on the selection
+    (too few respondents, or only one gender).
+    """
+    from sklearn.neighbors import KDTree
+
+    fitted = regression.linear_predictor(design, rows)
+    if fitted is None:
+        return None
+    positions, logit, _ = fitted
+    female = design.y[positions] == 1
+    if female.all() or not female.any():
+        return None
+
+    caliper = CALIPER_SD * logit.std()
+    # Floored so ties still break when every score is (nearly) the same
+    jitter = TIE_BREAK_SD * max(logit.std(), 1e-6)
+    rng = np.random.default_rng(0)
+    points = logit + rng.uniform(-0.5, 0.5, len(logit)) * jitter
+    tree = KDTree(points[~female, None])
+    distance, nearest = tree.query(points[female, None], k=1)
+    within = distance[:, 0] <= caliper + jitter
+    females = positions[female][within]
+    males = positions[~female][nearest[within, 0]]
+    return females, males, caliper
+
+
+def _values(frame, positions, threshold):
+    rows = frame.iloc[positions]
+    return {
+        label: func(rows, threshold).to_numpy(dtype=float)
+        for label, func in MATCHED_METRICS.items()
+    }
+
+
+def balance(frame, females, males, female_all, male_all):
+    """Standardized mean differences of each covariate level, before and after
+
+    Differences below 0.1 are conventionally taken as balanced.
+    """
+    records = []
+    for column, (levels, _) in MATCH_COVARIATES.items():
+        values = frame[column].to_numpy()
+        for level in levels:
+            is_level = values == level
+            p_f, p_m = is_level[female_all].mean(), is_level[male_all].mean()
+            spread = np.sqrt((p_f * (1 - p_f) + p_m * (1 - p_m)) / 2)
+            if spread == 0:
+                continue
+            records.append(
+                {
+                    "Covariate": column,
+                    "Level": level,
+                    "Before": (p_f - p_m) / spread,
+                    "After": (is_level[females].mean() - is_level[males].mean())
+                    / spread,
+                }
+            )
+    return pd.DataFrame(records)
+
+
+def matched_comparison(frame, design, rows=None, threshold=DISTRESS_THRESHOLD):
+    """Raw and matched female vs male metrics for a selection
+
+    Distress counts respondents with at least `threshold` poor mental health
+    days. Returns a dict with `table` (Metric, Female Veterans, Male Veterans,
+    Matched Male Veterans and both F/M ratios), `balance`, the number of
+    `pairs`, `unmatched` females outside the caliper and `distinct_males`,
+    or None when matching is not possible.
+    """
+    matched = match(design, rows)
+    if matched is None:
+        return None
+    females, males, caliper = matched
+
+    complete = design.complete.copy()
+    if rows is not None:
+        selected = np.zeros_like(complete)
+        selected[rows] = True
+        complete &= selected
+    positions = np.flatnonzero(complete)
+    is_female = design.y[positions] == 1
+    female_all, male_all = positions[is_female], positions[~is_female]
+
+    female_values = _values(frame, females, threshold)
+    male_values = _values(frame, males, threshold)
+    raw_female = _values(frame, female_all, threshold)
+    raw_male = _values(frame, male_all, threshold)
+    with np.errstate(invalid="ignore"):
+        table = pd.DataFrame(
+            {
+                "Metric": list(MATCHED_METRICS),
+                "Female Veterans": [np.nanmean(raw_female[m]) for m in MATCHED_METRICS],
+                "Male Veterans": [np.nanmean(raw_male[m]) for m in MATCHED_METRICS],
+                "Matched Female Veterans": [
+                    np.nanmean(female_values[m]) for m in MATCHED_METRICS
+                ],
+                "Matched Male Veterans": [
+                    np.nanmean(male_values[m]) for m in MATCHED_METRICS
+                ],
+            }
+        )
+    table["Ratio (F/M)"] = table["Female Veterans"] / table["Male Veterans"]
+    table["Matched Ratio (F/M)"] = (
+        table["Matched Female Veterans"] / table["Matched Male Veterans"]
+    )
+    if threshold != DISTRESS_THRESHOLD:
+        distress = table["Metric"] == "Frequent Distress (%)"
+        table.loc[distress, "Metric"] = f"Distress ≥{threshold} days (%)"
+    return {
+        "table": table,
+        "balance": balance(frame, females, males, female_all, male_all),
+        "pairs": len(females),
+        "unmatched": int(is_female.sum()) - len(females),
+        "distinct_males": len(np.unique(males)),
+        "caliper": caliper,
+    }
@@ -0,0 +1,166 @@
+"""
+Metric calculations behind the dashboard pages
+
+Every function takes an already-filtered frame so the same numbers can be
+served by the Streamlit pages and the headless API.
+"""
+
+import pandas as pd
+
+# CDC threshold for frequent mental distress (days per month)
+DISTRESS_THRESHOLD = 14
+
+# Sidebar population labels and the Gender value each one keeps
+POPULATIONS = {
+    "Female Veterans Only": "Female",
+    "Male Veterans Only": "Male",
+    "All Veterans": None,
+    "Compare Genders": None,
+}
+
+
+def filter_gender(df_all, gender_filter):
+    """Apply the sidebar population (gender) filter to the full frame
+
+    The result may be `df_all` itself (All Veterans / Compare), so callers
+    must treat it as read-only rather than paying for a full copy per rerun.
+    """
+    gender = POPULATIONS.get(gender_filter)
+    if gender is not None:
+        return df_all[df_all["Gender"] == gender]
+    # All Veterans or Compare
+    return df_all
+
+
+def filter_selection(df, states=None, ages=None):
+    """Apply the sidebar state and age multiselects"""
+    if states and "All States" not in states:
+        df = df[df["State_Name"].isin(states)]
+    if ages and "All Ages" not in ages:
+        df = df[df["Age_Group"].isin(ages)]
+    return df
+
+
+def filter_population(df_all, gender_filter, states=None, ages=None):
+    """Apply all sidebar filters to the full frame"""
+    return filter_selection(filter_gender(df_all, gender_filter), states, ages)
+
+
+def depression_rate(df):
+    """Percentage reporting a depressive disorder diagnosis"""
+    return (df["Depression"] == "Yes").mean() * 100
+
+
+def distress_rate(df, threshold=DISTRESS_THRESHOLD):
+    """Percentage with at least `threshold` poor mental health days"""
+    return (df["Mental_Health_Days_Clean"] >= threshold).mean() * 100
+
+
+def frequent_distress_rate(df):
+    """Frequent distress rate, preferring the precomputed outcome flag"""
+    if "poor_mental_health" in df.columns:
+        return (df["poor_mental_health"] == 1).mean() * 100
+    return distress_rate(df)
+
+
+def avg_mental_health_days(df):
+    """Mean poor mental health days per month"""
+    return df["Mental_Health_Days_Clean"].mean()
+
+
+def uninsured_rate(df):
+    """Percentage without health plan coverage"""
+    return (df["Has_Insurance"] == "No").mean() * 100
+
+
+def cost_barrier_rate(df):
+    """Percentage reporting cost as a barrier to care"""
+    return (df["Cost_Barrier"] == "Yes").mean() * 100
+
+
+def summary_metrics(df):
+    """Headline metrics used by the Executive Overview and Key Insights"""
+    return {
+        "sample_size": len(df),
+        "depression_rate": depression_rate(df),
+        "distress_rate": distress_rate(df),
+        "frequent_distress_rate": frequent_distress_rate(df),
+        "avg_mental_health_days": avg_mental_health_days(df),
+        "uninsured_rate": uninsured_rate(df),
+        "cost_barrier_rate": cost_barrier_rate(df),
+        "states": df["State_Name"].nunique(),
+    }
+
+
+# Metrics shown side by side in the gender comparison
+COMPARISON_METRICS = {
+    "Depression Rate (%)": depression_rate,
+    "Avg Mental Health Days": avg_mental_health_days,
+    "Frequent Distress (%)": distress_rate,
+    "Uninsured (%)": uninsured_rate,
+}
+
+
+def gender_comparison(df):
+    """Female vs male values and F/M ratio for each comparison metric"""
+    df_female = df[df["Gender"] == "Female"]
+    df_male = df[df["Gender"] == "Male"]
+
+    comparison = pd.DataFrame(
+        {
+            "Metric": list(COMPARISON_METRICS.keys()),
+            "Female Veterans": [
+                func(df_female) for func in COMPARISON_METRICS.values()
+            ],
+            "Male Veterans": [func(df_male) for func in COMPARISON_METRICS.values()],
+        }
+    )
+    comparison["Ratio (F/M)"] = (
+        comparison["Female Veterans"] / comparison["Male Veterans"]
+    )
+    return comparison
+
+
+def state_stats(df, column="Mental_Health_Days_Clean"):
+    """Per-state mean and count of `column`, highest burden first"""
+    stats = df.groupby("State_Name")[column].agg(["mean", "count"]).reset_index()
+    return stats.sort_values("mean", ascending=False)
+
+
+def state_gender_comparison(df, column="Mental_Health_Days_Clean"):
+    """Per-state female and male means with the F-M difference, largest first"""
+    means = df.groupby(["State_Name", "Gender"])[column].mean().unstack("Gender")
+    return compare_state_means(means)
+
+
+def compare_state_means(means):
+    """F-M difference table from per-state means with one column per gender"""
+    comparison = pd.DataFrame(
+        {
+            "State": means.index,
+            "Female": means.get("Female"),
+            "Male": means.get("Male"),
+        }
+    ).reset_index(drop=True)
+    comparison["Difference (F-M)"] = comparison["Female"] - comparison["Male"]
+    return comparison.sort_values("Difference (F-M)", ascending=False)
+
+
+def group_means(
+    df, group_col, column="Mental_Health_Days_Clean", order=None, by_gender=False
+):
+    """Mean of `column` per category, optionally split by gender and ordered"""
+    keys = [group_col, "Gender"] if by_gender else group_col
+    stats = df.groupby(keys)[column].agg(["mean", "count"]).reset_index()
+    return order_groups(stats, group_col, order)
+
+
+def order_groups(stats, group_col, order=None):
+    """Keep and sort the rows of a per-category table in chart order"""
+    if order is not None:
+        stats = stats[stats[group_col].isin(order)]
+        stats[group_col] = pd.Categorical(
+            stats[group_col], categories=order, ordered=True
+        )
+        stats = stats.sort_values(group_col)
+    return stats
@@ -0,0 +1,48 @@
+"""
+Opt-in timing of script runs, sidebar filtering and fragment reruns
+
+Set VMH_PROFILE=1 to log how long each full script run and each page
+fragment takes, one line per run on stderr:
+
+    [profile] full run            182.4 ms
+    [profile] explorer chart       41.0 ms
+
+Widgets inside a fragment rerun only that fragment, so comparing the two
+lines shows how much work an Explorer or slider interaction skips. Timings
+are also kept in `TIMINGS` for benchmarks that drive the app in-process.
+"""
+
+import os
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+
+PROFILE = os.environ.get("VMH_PROFILE", "") not in ("", "0")
+
+# Most recent (label, seconds) pairs
+TIMINGS = deque(maxlen=1000)
+
+
+def clock():
+    """Start time for `record`"""
+    return time.perf_counter()
+
+
+def record(label, started):
+    """Log the time since `started` under `label` when profiling is on"""
+    if not PROFILE:
+        return
+    seconds = time.perf_counter() - started
+    TIMINGS.append((label, seconds))
+    print(f"[profile] {label:<20} {seconds * 1000:7.1f} ms", file=sys.stderr)
+
+
+@contextmanager
+def timed(label):
+    """Time a block, or a function when used as a decorator"""
+    started = clock()
+    try:
+        yield
+    finally:
+        record(label, started)
@@ -0,0 +1,78 @@
+"""
+Approximate-then-exact rendering of aggregates over large selections
+
+For selections of at least `VMH_PROGRESSIVE_MIN_ROWS` rows (default
+250,000) a chart is first drawn from the stratified sample
+(dashboard.sampling) with 95% error bars, while the exact aggregate runs on
+a background thread. The chart is redrawn in place once the exact values
+are ready, so the page shows numbers within a few tens of milliseconds and
+the final ones shortly after.
+
+Exact results are kept per key (dataset version, sidebar selection and
+chart options). A widget change that stops the script leaves the thread
+running, and coming back to that chart picks up its result. If the exact
+result arrives within `FIRST_PAINT_SECONDS` the approximate pass is
+skipped.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+PROGRESSIVE_MIN_ROWS = int(os.environ.get("VMH_PROGRESSIVE_MIN_ROWS", "250000"))
+
+# How long to wait for the exact result before drawing the approximation
+FIRST_PAINT_SECONDS = 0.05
+
+# Exact results (or pending futures) kept per process
+RESULT_CACHE_SIZE = 64
+
+# 95% normal interval half-width in standard errors
+Z_95 = 1.96
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="vmh-exact")
+_futures = OrderedDict()
+_lock = threading.Lock()
+
+
+def enabled(n_rows):
+    """Whether a selection of `n_rows` rows is drawn progressively"""
+    return n_rows >= PROGRESSIVE_MIN_ROWS
+
+
+def submit(key, function, *args):
+    """Future for `function(*args)`, started once per key on the thread pool
+
+    A failed computation is started again on the next call.
+    """
+    with _lock:
+        future = _futures.get(key)
+        if future is None or (future.done() and future.exception() is not None):
+            future = _executor.submit(function, *args)
+            _futures[key] = future
+            while len(_futures) > RESULT_CACHE_SIZE:
+                _futures.popitem(last=False)
+        _futures.move_to_end(key)
+    return future
+
+
+def render(placeholder, key, exact, approximate, draw):
+    """Draw `approximate()` into `placeholder`, then replace it with `exact()`
+
+    `exact` runs on the background pool; `draw(table, approximate)` renders
+    a table into the current container. Returns the exact table.
+    """
+    future = submit(key, exact)
+    try:
+        table = future.result(timeout=FIRST_PAINT_SECONDS)
+    except FutureTimeout:
+        with placeholder.container():
+            draw(approximate(), True)
+        table = future.result()
+        # Clear first: a container drawn over keeps any extra old elements
+        placeholder.empty()
+    with placeholder.container():
+        draw(table, False)
+    return table
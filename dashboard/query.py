@@ -0,0 +1,246 @@
+"""
+Declarative aggregate queries with pluggable execution backends
+
+Pages and API handlers describe an aggregate as a `Query`: the columns to
+group by, exact-match filters (`{column: [values]}`, the same shape as the
+sidebar facet selections) and named measures. A backend turns it into a
+result table with one row per group, sorted by the group columns.
+
+Measures are `name: (kind, column[, value])` with kind one of
+
+    size              rows in the group
+    count / sum / mean  of `column`, ignoring missing values
+    share             % of rows where `column == value`
+    share_at_least    % of rows where `column >= value`
+
+Shares use every row as the denominator, like the functions in
+`dashboard.metrics`.
+
+Backends, chosen with VMH_QUERY_BACKEND:
+
+    pandas   (default) groupby over the resident prepared frame
+    duckdb   embedded DuckDB over a Parquet copy of the frame, written once
+             per dataset version to `<data dir>/cache/`. Only the referenced
+             columns are read and filters are pushed into the scan. Point
+             VMH_QUERY_PARQUET at prepared Parquet files (a glob works, e.g.
+             one file per survey year) to query data that is never loaded
+             into memory.
+
+When duckdb is not installed the pandas backend is used instead.
+"""
+
+import glob
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from dashboard.data import DATA_DIR
+
+QUERY_BACKEND = os.environ.get("VMH_QUERY_BACKEND", "pandas")
+QUERY_PARQUET = os.environ.get("VMH_QUERY_PARQUET")
+
+CACHE_DIR = os.path.join(DATA_DIR, "cache")
+
+MEASURE_KINDS = ("size", "count", "sum", "mean", "share", "share_at_least")
+
+
+class Query:
+    """Group columns, filters and named measures describing one aggregate"""
+
+    def __init__(self, measures, group_by=(), filters=None):
+        for name, (kind, *_) in measures.items():
+            if kind not in MEASURE_KINDS:
+                raise ValueError(f"unknown measure kind {kind!r} for {name!r}")
+        self.measures = dict(measures)
+        self.group_by = list(group_by)
+        self.filters = {
+            column: list(values) for column, values in (filters or {}).items()
+        }
+
+    def where(self, filters):
+        """Same query with extra filters (replacing any on the same column)"""
+        return Query(self.measures, self.group_by, {**self.filters, **filters})
+
+    def columns(self):
+        """Every column the query reads"""
+        measured = [spec[1] for spec in self.measures.values() if len(spec) > 1]
+        return list(dict.fromkeys([*self.group_by, *self.filters, *measured]))
+
+
+class PandasBackend:
+    """Executes queries with a groupby over an in-memory frame"""
+
+    name = "pandas"
+
+    def __init__(self, frame):
+        self.frame = frame
+
+    def execute(self, query):
+        """Result table for `query`"""
+        df = self.frame
+        mask = np.ones(len(df), dtype=bool)
+        for column, values in query.filters.items():
+            mask &= df[column].isin(values).to_numpy()
+        rows = df.loc[mask, query.columns()] if not mask.all() else df
+
+        work = {column: rows[column] for column in query.group_by}
+        reducers = {}
+        for name, (kind, *spec) in query.measures.items():
+            if kind == "size":
+                work[name], reducers[name] = np.ones(len(rows)), "size"
+            elif kind == "share":
+                work[name] = (rows[spec[0]] == spec[1]).to_numpy() * 100.0
+                reducers[name] = "mean"
+            elif kind == "share_at_least":
+                work[name] = (rows[spec[0]] >= spec[1]).to_numpy() * 100.0
+                reducers[name] = "mean"
+            else:
+                work[name], reducers[name] = rows[spec[0]].to_numpy(), kind
+        work = pd.DataFrame(work, index=rows.index)
+
+        if not query.group_by:
+            return pd.DataFrame(
+                {name: [work[name].agg(how)] for name, how in reducers.items()}
+            )
+        result = work.groupby(query.group_by, sort=True).agg(
+            **{name: (name, how) for name, how in reducers.items()}
+        )
+        return result.reset_index()
+
+
+class DuckDBBackend:
+    """Executes queries as SQL against Parquet files with embedded DuckDB"""
+
+    name = "duckdb"
+
+    def __init__(self, path):
+        import duckdb
+        import pyarrow.parquet as pq
+
+        self.path = path
+        self._connection = duckdb.connect()
+        # DuckDB names are case-insensitive, so of two columns differing only
+        # in case (raw MARITAL, decoded Marital) the second is read as
+        # "Marital_1"; map each file column to the name DuckDB gives it
+        described = self._connection.execute(
+            f"DESCRIBE SELECT * FROM {_source(path)}"
+        ).fetchall()
+        first = min(glob.glob(path)) if glob.has_magic(path) else path
+        self.columns = {
+            name: row[0] for name, row in zip(pq.read_schema(first).names, described)
+        }
+
+    def execute(self, query):
+        """Result table for `query`"""
+        sql, params = to_sql(query, self.path, self.columns)
+        # A cursor is a separate connection to the same database, so queries
+        # from concurrent Streamlit sessions or API requests do not interleave
+        result = self._connection.cursor().execute(sql, params).df()
+        for name, (kind, *_) in query.measures.items():
+            if kind == "sum":
+                # SQL sums over no values are NULL; pandas gives 0
+                result[name] = result[name].fillna(0.0)
+        return result
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _measure_sql(kind, column=None, value=None):
+    """SQL aggregate for one measure over an already quoted column"""
+    if kind == "size":
+        return "COUNT(*)", []
+    if kind == "share":
+        return f"AVG(CASE WHEN {column} = ? THEN 100.0 ELSE 0.0 END)", [value]
+    if kind == "share_at_least":
+        return f"AVG(CASE WHEN {column} >= ? THEN 100.0 ELSE 0.0 END)", [value]
+    return f"{kind.upper()}({column})", []
+
+
+def _source(path):
+    return "read_parquet('" + str(path).replace("'", "''") + "')"
+
+
+def to_sql(query, path, columns=None):
+    """SQL text and parameters for `query` over the Parquet file(s) at `path`
+
+    `columns` maps frame column names to the names DuckDB reads them as,
+    where they differ.
+    """
+    columns = columns or {}
+
+    def ref(column):
+        return _quote(columns.get(column, column))
+
+    keys = [ref(column) for column in query.group_by]
+    select = [f"{key} AS {_quote(c)}" for key, c in zip(keys, query.group_by)]
+    params = []
+    for name, (kind, *spec) in query.measures.items():
+        if spec:
+            spec[0] = ref(spec[0])
+        expression, values = _measure_sql(kind, *spec)
+        select.append(f"{expression} AS {_quote(name)}")
+        params += values
+
+    # Rows with a missing group key are dropped, as in a pandas groupby
+    where = [f"{key} IS NOT NULL" for key in keys]
+    for column, values in query.filters.items():
+        if values:
+            placeholders = ", ".join("?" * len(values))
+            where.append(f"{ref(column)} IN ({placeholders})")
+            params += list(values)
+        else:
+            where.append("FALSE")
+
+    sql = f"SELECT {', '.join(select)} FROM {_source(path)}"
+    if where:
+        sql += f" WHERE {' AND '.join(where)}"
+    if keys:
+        sql += f" GROUP BY {', '.join(keys)} ORDER BY {', '.join(keys)}"
+    return sql, params
+
+
+def export_parquet(frame, cache_dir=None):
+    """Write `frame` to the Parquet cache (once per content) and return the path
+
+    Missing numeric values are stored as nulls so SQL counts and averages
+    skip them like pandas does.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    cache_dir = cache_dir or CACHE_DIR
+    hashed = int(pd.util.hash_pandas_object(frame, index=False).sum())
+    path = os.path.join(
+        cache_dir, f"veterans_{len(frame)}_{hashed & 0xFFFFFFFFFFFF:012x}.parquet"
+    )
+    if os.path.exists(path):
+        return path
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    pq.write_table(pa.Table.from_pandas(frame, preserve_index=False), tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def build_backend(frame, backend=None):
+    """Query backend for a prepared frame, per VMH_QUERY_BACKEND by default
+
+    Registered as a store aggregate, so a refresh rebuilds it (and re-exports
+    the Parquet copy) for the new dataset version.
+    """
+    backend = backend or QUERY_BACKEND
+    if backend == "pandas":
+        return PandasBackend(frame)
+    if backend != "duckdb":
+        raise ValueError(
+            f"VMH_QUERY_BACKEND must be 'pandas' or 'duckdb', not {backend!r}"
+        )
+    try:
+        return DuckDBBackend(QUERY_PARQUET or export_parquet(frame))
+    except ImportError:
+        warnings.warn("duckdb is not installed; using the pandas query backend")
+        return PandasBackend(frame)
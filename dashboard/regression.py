@@ -0,0 +1,240 @@
+"""
+Survey-weighted regression for adjusted odds and prevalence ratios
+
+Fits `poor_mental_health` (frequent mental distress) on the decoded covariates
+with iteratively reweighted least squares. The one-hot design matrix is built
+once per dataset version as a sparse CSR matrix from the category codes; a
+filtered selection is fitted by slicing its rows, so each fit is a handful of
+sparse products and a small dense solve.
+
+- `family="logit"` gives adjusted odds ratios
+- `family="poisson"` (log link, robust errors) gives adjusted prevalence ratios
+
+Standard errors are sandwich (Huber-White) estimates using the `_LLCPWT`
+survey weights. Strata and PSUs are not modelled, so intervals are somewhat
+narrower than a full design-based analysis would give.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy import stats as sps
+
+from dashboard.constants import (
+    AGE_GROUP_ORDER,
+    HEALTH_ORDER,
+    INCOME_ORDER,
+    SUPPORT_ORDER,
+)
+
+OUTCOME = "poor_mental_health"
+WEIGHT_COLUMN = "_LLCPWT"
+
+# Column -> (levels in display order, reference level). Rows whose value is
+# not one of the levels (missing, refused, don't know) are left out of the fit.
+COVARIATES = {
+    "Gender": (["Female", "Male"], "Male"),
+    "Age_Group": (AGE_GROUP_ORDER, "65-69"),
+    "Income_Group": (INCOME_ORDER, ">$75k"),
+    "Employment": (
+        [
+            "Employed",
+            "Self-employed",
+            "Unemployed <1yr",
+            "Unemployed 1yr+",
+            "Homemaker",
+            "Student",
+            "Retired",
+            "Unable to work",
+        ],
+        "Employed",
+    ),
+    "Has_Insurance": (["Yes", "No"], "Yes"),
+    "General_Health": (HEALTH_ORDER, "Excellent"),
+    "Emotional_Support": (SUPPORT_ORDER, "Always"),
+}
+
+MAX_ITERATIONS = 25
+TOLERANCE = 1e-8
+
+# Selections with fewer complete respondents than this are not fitted
+MIN_ROWS = 300
+
+
+class ConvergenceError(Exception):
+    """IRLS did not settle, typically a level that perfectly predicts the outcome"""
+
+
+class Design:
+    """Sparse one-hot design matrix with outcome, weights and term labels"""
+
+    def __init__(self, X, y, weights, complete, terms):
+        self.X = X
+        self.y = y
+        self.weights = weights
+        self.complete = complete
+        self.terms = terms
+
+
+def build_design(df, covariates=None, outcome=OUTCOME):
+    """One-hot CSR design (intercept + non-reference levels) for every row
+
+    Incomplete rows get an all-zero row and `complete=False`, so positions
+    line up with `df` and any selection can be fitted by row slicing.
+    """
+    covariates = COVARIATES if covariates is None else covariates
+    n = len(df)
+    complete = np.ones(n, dtype=bool)
+    codes, terms, offset = [], [("Intercept", "")], 1
+    for column, (levels, reference) in covariates.items():
+        others = [level for level in levels if level != reference]
+        lookup = pd.Index([reference] + others)
+        column_codes = lookup.get_indexer(df[column].to_numpy())
+        complete &= column_codes >= 0
+        # Reference level (code 0) and missing values get no column
+        codes.append(np.where(column_codes > 0, column_codes - 1 + offset, -1))
+        terms.extend((column, level) for level in others)
+        offset += len(others)
+
+    y = df[outcome].to_numpy(dtype=float)
+    weights = df[WEIGHT_COLUMN].to_numpy(dtype=float)
+    complete &= ~np.isnan(y) & ~np.isnan(weights)
+
+    cols = np.column_stack([np.zeros(n, dtype=np.intp)] + codes)
+    rows = np.repeat(np.arange(n), cols.shape[1])
+    cols = cols.ravel()
+    keep = (cols >= 0) & np.repeat(complete, len(covariates) + 1)
+    X = sparse.csr_matrix(
+        (np.ones(keep.sum()), (rows[keep], cols[keep])), shape=(n, offset)
+    )
+    return Design(X, np.nan_to_num(y), np.nan_to_num(weights), complete, terms)
+
+
+def _irls(X, y, w, family):
+    """Weighted IRLS; returns coefficients, fitted means, Hessian, convergence"""
+    p = X.shape[1]
+    beta = np.zeros(p)
+    if family == "logit":
+        beta[0] = np.log(np.average(y, weights=w) / (1 - np.average(y, weights=w)))
+    else:
+        beta[0] = np.log(np.average(y, weights=w))
+    for _ in range(MAX_ITERATIONS):
+        eta = X @ beta
+        if family == "logit":
+            mu = 1 / (1 + np.exp(-eta))
+            var = mu * (1 - mu)
+        else:
+            mu = np.exp(eta)
+            var = mu
+        # Working response z = eta + (y - mu) / var, IRLS weight w * var
+        iw = w * var
+        hessian = (X.T @ X.multiply(iw[:, None])).toarray()
+        gradient = X.T @ (w * (y - mu))
+        try:
+            step = np.linalg.solve(hessian, gradient)
+        except np.linalg.LinAlgError:
+            step = np.linalg.lstsq(hessian, gradient, rcond=None)[0]
+        beta = beta + step
+        if not np.all(np.isfinite(beta)):
+            return beta, None, None, False
+        if np.max(np.abs(step)) < TOLERANCE:
+            break
+    else:
+        # Did not settle, typically a level that perfectly predicts the outcome
+        return beta, None, None, False
+    eta = X @ beta
+    mu = 1 / (1 + np.exp(-eta)) if family == "logit" else np.exp(eta)
+    var = mu * (1 - mu) if family == "logit" else mu
+    hessian = (X.T @ X.multiply((w * var)[:, None])).toarray()
+    return beta, mu, hessian, True
+
+
+def _select(design, rows):
+    """Complete selected rows and the design columns that vary among them
+
+    Returns `(mask, X, y, w, counts, present)` or None when the selection has
+    fewer than MIN_ROWS complete respondents.
+    """
+    mask = design.complete.copy()
+    if rows is not None:
+        selected = np.zeros_like(mask)
+        selected[rows] = True
+        mask &= selected
+    if mask.sum() < MIN_ROWS:
+        return None
+    X = design.X[mask]
+    y = design.y[mask]
+    w = design.weights[mask]
+    w = w / w.mean()
+
+    # Drop levels nobody (or everybody) in the selection has, e.g. Gender
+    # when only one gender is selected
+    counts = np.asarray(X.sum(axis=0)).ravel()
+    present = (counts > 0) & (counts < X.shape[0])
+    present[0] = True
+    return mask, X[:, present], y, w, counts, present
+
+
+def fit(design, rows=None, family="logit"):
+    """Fit the model on `rows` of the design (all rows when None)
+
+    Returns one row per non-reference level with the exponentiated estimate
+    (odds ratio or prevalence ratio), its 95% CI, p-value and the number of
+    respondents at that level. Levels absent from the selection are dropped.
+    Returns None when the selection is too small and raises ConvergenceError
+    when the fit does not converge.
+    """
+    selection = _select(design, rows)
+    if selection is None:
+        return None
+    _, X, y, w, counts, present = selection
+    terms = [term for term, keep in zip(design.terms, present) if keep]
+
+    beta, mu, hessian, converged = _irls(X, y, w, family)
+    if not converged:
+        raise ConvergenceError(f"{family} model did not converge")
+    bread = np.linalg.pinv(hessian)
+    scores = X.multiply((w * (y - mu))[:, None])
+    meat = (scores.T @ scores).toarray()
+    cov = bread @ meat @ bread
+    se = np.sqrt(np.diag(cov))
+
+    z = beta / se
+    result = pd.DataFrame(
+        {
+            "Variable": [term[0] for term in terms],
+            "Level": [term[1] for term in terms],
+            "Estimate": np.exp(beta),
+            "Low": np.exp(beta - 1.959964 * se),
+            "High": np.exp(beta + 1.959964 * se),
+            "p": 2 * sps.norm.sf(np.abs(z)),
+            "n": counts[present].astype(int),
+        }
+    )
+    return result.iloc[1:].reset_index(drop=True)
+
+
+def linear_predictor(design, rows=None, family="logit"):
+    """Fitted log-odds (or log-rate) for the complete rows of a selection
+
+    Returns `(positions, eta, effects)` with the design row positions that
+    were fitted and a `{(column, level): coefficient}` dict of the
+    non-reference levels present in the selection, or None when the selection
+    is too small or does not converge.
+    """
+    selection = _select(design, rows)
+    if selection is None:
+        return None
+    mask, X, y, w, _, present = selection
+    beta, _, _, converged = _irls(X, y, w, family)
+    if not converged:
+        return None
+    terms = [term for term, keep in zip(design.terms, present) if keep]
+    effects = dict(zip(terms[1:], beta[1:]))
+    return np.flatnonzero(mask), X @ beta, effects
+
+
+def reference_levels(covariates=None):
+    """Reference level of each covariate, for labelling the forest plot"""
+    covariates = COVARIATES if covariates is None else covariates
+    return {column: reference for column, (_, reference) in covariates.items()}
@@ -0,0 +1,119 @@
+"""
+Stratified sample of the prepared frame for approximate first renders
+
+Respondents are sampled within each BRFSS sampling stratum (`_STSTR`) in
+proportion to its size, about `VMH_SAMPLE_ROWS` rows in all (default
+20,000) and at least two per stratum so every stratum has a variance. Each
+sampled row stands for N_h / m_h respondents of its stratum, where N_h is the
+stratum size in the frame and m_h the number sampled.
+
+`estimate` turns the sample into group means of the full frame, the same
+unweighted means the exact aggregates give, with standard errors from the
+stratified design: a linearized ratio estimator, summed over strata with the
+finite population correction. A selection is a domain of the sample, so rows
+outside it still count towards m_h. The sample is drawn once per dataset
+version and an estimate over it takes a few milliseconds however large the
+frame.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+SAMPLE_ROWS = int(os.environ.get("VMH_SAMPLE_ROWS", "20000"))
+
+STRATUM = "_STSTR"
+
+
+class Sample:
+    """Sampled frame positions with their stratum, expansion weight and
+    finite population correction, plus the sample size of every stratum"""
+
+    def __init__(self, positions, strata, weights, fpc, sizes, n_rows):
+        self.positions = positions
+        self.strata = strata
+        self.weights = weights
+        self.fpc = fpc
+        self.sizes = sizes
+        self.lookup = np.full(n_rows, -1)
+        self.lookup[positions] = np.arange(len(positions))
+
+    def __len__(self):
+        return len(self.positions)
+
+    def select(self, rows=None):
+        """Sample rows within frame positions `rows` (all when None)"""
+        if rows is None:
+            return np.arange(len(self.positions))
+        found = self.lookup[rows]
+        return np.sort(found[found >= 0])
+
+
+def build_sample(df, rows=None, seed=0):
+    """Proportional stratified sample of about `rows` rows of `df`"""
+    rows = SAMPLE_ROWS if rows is None else rows
+    strata, _ = pd.factorize(df[STRATUM], use_na_sentinel=False)
+    population = np.bincount(strata)
+    fraction = min(1.0, rows / max(len(df), 1))
+    sizes = np.minimum(population, np.maximum(np.ceil(fraction * population), 2))
+
+    # Random order within each stratum, then keep the first m_h of each
+    rng = np.random.default_rng(seed)
+    order = np.lexsort((rng.random(len(df)), strata))
+    starts = np.concatenate([[0], np.cumsum(population)[:-1]])
+    rank = np.arange(len(df)) - starts[strata[order]]
+    positions = np.sort(order[rank < sizes[strata[order]]])
+
+    sampled = strata[positions]
+    return Sample(
+        positions,
+        sampled,
+        population[sampled] / sizes[sampled],
+        1 - sizes[sampled] / population[sampled],
+        sizes.astype(int),
+        len(df),
+    )
+
+
+def estimate(sample, df, value, keys, rows=None):
+    """Estimated mean of `value` per group of `keys` over frame rows `rows`
+
+    Returns one row per group present in the sample with the keys, `value`
+    (the mean), `se` (its standard error), `n` (sampled respondents
+    answering) and `count` (estimated respondents answering in the frame).
+    """
+    keys = list(keys)
+    selected = sample.select(rows)
+    sub = df[[*keys, value]].iloc[sample.positions[selected]]
+    answered = sub.notna().all(axis=1).to_numpy()
+    sub, selected = sub[answered], selected[answered]
+    if sub.empty:
+        return pd.DataFrame(columns=[*keys, value, "se", "n", "count"])
+
+    groups, labels = pd.MultiIndex.from_frame(sub[keys]).factorize(sort=True)
+    y = sub[value].to_numpy(dtype=float)
+    w = sample.weights[selected]
+    total = np.bincount(groups, w)
+    mean = np.bincount(groups, w * y) / total
+
+    # Linearized ratio: each row's share of its group mean's error, summed
+    # and squared per group x stratum
+    z = w * (y - mean[groups]) / total[groups]
+    strata = sample.strata[selected]
+    pairs, inverse = np.unique(groups * len(sample.sizes) + strata, return_inverse=True)
+    s1 = np.bincount(inverse, z)
+    s2 = np.bincount(inverse, z * z)
+    pair_strata = pairs % len(sample.sizes)
+    m = sample.sizes[pair_strata]
+    fpc = np.bincount(inverse, sample.fpc[selected]) / np.bincount(inverse)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variance = np.where(m > 1, m / (m - 1) * fpc * (s2 - s1 * s1 / m), 0.0)
+    se = np.sqrt(np.maximum(np.bincount(pairs // len(sample.sizes), variance), 0))
+
+    result = labels.to_frame(index=False, name=keys)
+    result[value] = mean
+    result["se"] = se
+    result["n"] = np.bincount(groups)
+    result["count"] = total
+    return result
@@ -0,0 +1,145 @@
+"""
+Shared-memory deployment mode for running several app workers on one box
+
+The prepared frame is published once as an uncompressed Arrow IPC file,
+normally under /dev/shm (POSIX shared memory). Each worker process memory-maps
+that file and wraps the numeric columns as read-only numpy views, so the bulk
+of the data lives in the page cache once no matter how many workers attach.
+Only the handful of decoded label columns are materialised per process.
+
+Enable it by pointing every worker at the same file:
+
+    export VMH_SHARED_DATASET=/dev/shm/veterans.arrow
+    python -m dashboard.shared publish        # optional: publish up front
+    streamlit run streamlit_app.py --server.port 8501 &
+    streamlit run streamlit_app.py --server.port 8502 &
+
+The first worker to start publishes the file if it does not exist yet.
+This mode needs pyarrow, an optional dependency (`pip install pyarrow`).
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Path of the shared Arrow file; unset means every process loads its own copy
+SHARED_DATASET = os.environ.get("VMH_SHARED_DATASET")
+
+# How long a worker waits for another process to finish publishing
+PUBLISH_TIMEOUT = 300
+
+
+def publish_frame(df, path):
+    """Write the prepared frame to `path` as a memory-mappable Arrow file
+
+    Numeric columns are stored as plain buffers with NaN kept as a value
+    (not an Arrow null) so they can be viewed without conversion; text
+    columns are dictionary encoded. The file is written next to `path` and
+    renamed into place, so attached workers never see a partial file.
+    """
+    import pyarrow as pa
+
+    arrays = []
+    for name in df.columns:
+        values = df[name]
+        if values.dtype.kind in "biuf":
+            arrays.append(pa.array(values.to_numpy()))
+        else:
+            arrays.append(
+                pa.array(
+                    values.astype(object), from_pandas=True, type=pa.string()
+                ).dictionary_encode()
+            )
+    table = pa.Table.from_arrays(arrays, names=[str(name) for name in df.columns])
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    # Nested: parenthesized context managers need Python 3.10
+    with pa.OSFile(tmp_path, "wb") as sink:  # noqa: SIM117
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def attach_frame(path):
+    """Map a published Arrow file and return a DataFrame backed by it
+
+    Numeric columns share memory with the mapping (and are read-only);
+    dictionary columns are decoded into ordinary string columns.
+    """
+    import pyarrow as pa
+
+    table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+    columns = {}
+    for name, column in zip(table.column_names, table.columns):
+        chunk = column.combine_chunks() if column.num_chunks != 1 else column.chunk(0)
+        if pa.types.is_dictionary(chunk.type):
+            codes = chunk.indices.fill_null(-1).to_numpy()
+            columns[name] = pd.Categorical.from_codes(
+                codes.astype(np.int32), chunk.dictionary.to_pylist()
+            ).astype(object)
+        else:
+            columns[name] = chunk.to_numpy(zero_copy_only=True)
+    return pd.DataFrame(columns, copy=False)
+
+
+def attach_or_publish(path, loader):
+    """Attach to `path`, publishing it from `loader()` first if needed
+
+    A lock file makes sure only one of several workers starting together
+    runs the (slow) loader; the others wait for the file to appear.
+    """
+    lock_path = f"{path}.lock"
+    while not os.path.exists(path):
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if time.time() - os.path.getmtime(lock_path) > PUBLISH_TIMEOUT:
+                # The publishing process died; take over
+                os.unlink(lock_path)
+            time.sleep(0.2)
+            continue
+        try:
+            if not os.path.exists(path):
+                publish_frame(loader(), path)
+        finally:
+            os.close(fd)
+            os.unlink(lock_path)
+    return attach_frame(path)
+
+
+def load_frame(loader):
+    """Prepared frame for this process, shared when VMH_SHARED_DATASET is set"""
+    if SHARED_DATASET:
+        return attach_or_publish(SHARED_DATASET, loader)
+    return loader()
+
+
+def main(argv=None):
+    """Command line entry point: `publish [path]` or `info [path]`"""
+    from dashboard.data import load_prepared_frame
+
+    argv = sys.argv[1:] if argv is None else argv
+    command = argv[0] if argv else "publish"
+    path = argv[1] if len(argv) > 1 else SHARED_DATASET
+    if not path:
+        sys.exit("usage: python -m dashboard.shared publish|info PATH")
+
+    if command == "publish":
+        start = time.perf_counter()
+        publish_frame(load_prepared_frame(), path)
+        print(
+            f"published {path} ({os.path.getsize(path) / 1e6:.1f} MB) "
+            f"in {time.perf_counter() - start:.1f} s"
+        )
+    elif command == "info":
+        df = attach_frame(path)
+        print(f"{path}: {len(df):,} rows x {len(df.columns)} columns")
+    else:
+        sys.exit(f"unknown command {command!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+What-if simulation of interventions on the frequent distress model
+
+Fits the survey-weighted logistic model of frequent mental distress
+(`dashboard.regression`) on a selection once, then evaluates intervention
+scenarios on every respondent in one vectorized pass:
+
+- **Insurance:** a share of uninsured veterans become insured
+- **Emotional support:** a share of veterans move up one support level
+  (Never -> Rarely -> Sometimes -> Usually -> Always)
+
+Each intervention shifts a respondent's log-odds by the difference between
+the coefficients of the new and old levels. A level with no coefficient in
+the fit (nobody, or everybody, in the selection has it) has no known effect,
+so moves from or to it are skipped and counted as unshifted. A respondent reached with
+probability s has expected risk `(1 - s) * p_old + s * p_new`, so scenarios
+are exact expectations rather than random draws, and interventions combine
+by averaging over the four reached/not-reached combinations. Prevalence is
+the survey-weighted mean predicted risk, reported for every state and
+gender. A scenario is a few array operations on precomputed shifts, about
+20 ms at 100k rows.
+
+These are model projections: they assume the adjusted associations are
+causal and that everything else about a respondent stays the same.
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from dashboard import regression
+from dashboard.constants import SUPPORT_ORDER
+
+# Intervention -> (covariate, level moves {old level: new level})
+INTERVENTIONS = {
+    "insurance": ("Has_Insurance", {"No": "Yes"}),
+    "support": ("Emotional_Support", dict(zip(SUPPORT_ORDER[1:], SUPPORT_ORDER[:-1]))),
+}
+
+
+class DistressModel:
+    """Fitted log-odds and baseline risk, survey weights, state x gender
+    groups, per-intervention log-odds shifts of every respondent and the
+    number of eligible respondents each intervention leaves unshifted"""
+
+    def __init__(self, eta, weights, codes, groups, shifts, unshifted):
+        self.eta = eta
+        self.baseline = 1 / (1 + np.exp(-eta))
+        self.weights = weights
+        self.codes = codes
+        self.groups = groups
+        self.shifts = shifts
+        self.unshifted = unshifted
+
+
+def _shift(values, effects, column, moves):
+    """Change in log-odds of each respondent under a level move (0 if none)
+
+    Returns the shifts and the number of respondents whose move was skipped
+    because its old or new level has no fitted coefficient.
+    """
+    reference = regression.reference_levels()[column]
+    shift = np.zeros(len(values))
+    unshifted = 0
+    for old, new in moves.items():
+        old_effect = 0.0 if old == reference else effects.get((column, old))
+        new_effect = 0.0 if new == reference else effects.get((column, new))
+        movers = values == old
+        if old_effect is None or new_effect is None:
+            unshifted += int(movers.sum())
+            continue
+        shift[movers] = new_effect - old_effect
+    return shift, unshifted
+
+
+def fit_model(frame, design, rows=None):
+    """Fit the distress model on `rows` of the design and precompute shifts
+
+    Returns None when the selection is too small or the fit does not converge.
+    """
+    fitted = regression.linear_predictor(design, rows)
+    if fitted is None:
+        return None
+    positions, eta, effects = fitted
+    shifts, unshifted = {}, {}
+    for name, (column, moves) in INTERVENTIONS.items():
+        values = frame[column].to_numpy()[positions]
+        shifts[name], unshifted[name] = _shift(values, effects, column, moves)
+    selected = frame[["State_Name", "Gender"]].iloc[positions]
+    codes, groups = pd.MultiIndex.from_frame(selected).factorize(sort=True)
+    return DistressModel(
+        eta,
+        design.weights[positions],
+        codes,
+        groups.to_frame(index=False, name=["State_Name", "Gender"]),
+        shifts,
+        unshifted,
+    )
+
+
+def predicted_risk(model, shares=None):
+    """Expected distress probability of each respondent under a scenario
+
+    `shares` maps intervention name to the share (0-1) of eligible
+    respondents it reaches; missing interventions reach nobody.
+    """
+    shares = shares or {}
+    active = [
+        (shares[name], model.shifts[name])
+        for name in INTERVENTIONS
+        if shares.get(name, 0) > 0
+    ]
+    if not active:
+        return model.baseline
+    risk = np.zeros_like(model.eta)
+    for reached in itertools.product((False, True), repeat=len(active)):
+        probability, eta = 1.0, model.eta
+        for hit, (share, shift) in zip(reached, active):
+            probability *= share if hit else 1 - share
+            if hit:
+                eta = eta + shift
+        risk += probability / (1 + np.exp(-eta))
+    return risk
+
+
+def _with_change(table):
+    """Prevalence (%) columns from weighted sums, with absolute/relative change"""
+    table = table.assign(
+        Baseline=table.pop("baseline") / table["weight"] * 100,
+        Scenario=table.pop("scenario") / table["weight"] * 100,
+    ).drop(columns="weight")
+    table["Change"] = table["Scenario"] - table["Baseline"]
+    table["Relative"] = table["Change"] / table["Baseline"] * 100
+    return table
+
+
+def simulate(model, shares, by_gender=True):
+    """Baseline and scenario prevalence of frequent distress (%)
+
+    Returns `(by_state, overall)`: one row per state (and gender when
+    `by_gender`) with n, Baseline, Scenario, Change in percentage points and
+    Relative in % of baseline, and the same columns totalled per gender plus
+    an "All" row.
+    """
+    scenario = predicted_risk(model, shares)
+    size = len(model.groups)
+    sums = model.groups.assign(
+        n=np.bincount(model.codes, minlength=size),
+        weight=np.bincount(model.codes, model.weights, size),
+        baseline=np.bincount(model.codes, model.weights * model.baseline, size),
+        scenario=np.bincount(model.codes, model.weights * scenario, size),
+    )
+    totals = sums.drop(columns="State_Name").groupby("Gender").sum()
+    totals.loc["All"] = totals.sum()
+    overall = totals.iloc[[-1, *range(len(totals) - 1)]].astype({"n": int})
+    if not by_gender:
+        sums = sums.drop(columns="Gender").groupby("State_Name").sum().reset_index()
+    return _with_change(sums), _with_change(overall.reset_index())
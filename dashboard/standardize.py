@@ -0,0 +1,112 @@
+"""
+Direct age standardization of state mental health day means
+
+Crude state means mix two things: how respondents of a given age fare in a
+state, and how old the state's veterans are. Direct standardization removes
+the second by averaging each state's age-specific means with one fixed set
+of age weights, the age distribution of a standard population.
+
+Everything comes from the day-count cube (`dashboard.histograms`): sliced to
+State x Age Group x Gender it holds the answered count and the sum of days
+for every cell, so crude and standardized means for every state and gender
+are a few array reductions. Age groups with no respondents in a state are
+left out and the remaining weights rescaled; `coverage` reports the share of
+the standard population's weight a state's estimate is based on, and states
+below `MIN_COVERAGE` are not ranked.
+"""
+
+import numpy as np
+import pandas as pd
+
+from dashboard import histograms
+
+# Standard population label -> Gender it is restricted to (None for both)
+STANDARD_POPULATIONS = {
+    "All veterans": None,
+    "Female veterans": "Female",
+    "Male veterans": "Male",
+}
+
+# States whose present age groups carry less of the standard population's
+# weight than this are left out of standardized rankings
+MIN_COVERAGE = 0.8
+
+# Axes of the sliced histogram, before the day-count slots
+AXES = ("State_Name", "Age_Group", "Gender")
+
+
+def cell_histograms(cube, selections=None, rows=None):
+    """State x Age x Gender x day-count histograms for a selection
+
+    Uses the cube when it covers the selection, otherwise `rows`.
+    """
+    selections = selections or {}
+    if rows is None or histograms.covers(selections):
+        return histograms.select(cube, "mental", selections, AXES)
+    return histograms.from_rows(rows, "mental", AXES)
+
+
+def _sums(hist):
+    """Answered respondents and summed days per cell"""
+    days = hist[..., : histograms.MISSING]
+    return days.sum(axis=-1), days @ np.arange(histograms.MISSING)
+
+
+def standard_weights(cube, population="All veterans", ages=None):
+    """Age distribution (summing to 1) of answered respondents in a population
+
+    With `ages`, only those age groups are weighted, so coverage is measured
+    against the ages a selection can contain.
+    """
+    gender = STANDARD_POPULATIONS[population]
+    selections = {"Gender": [gender]} if gender else {}
+    counts, _ = _sums(histograms.select(cube, "mental", selections, ("Age_Group",)))
+    if ages is not None:
+        counts = np.where(np.isin(histograms.DIMENSIONS["Age_Group"], ages), counts, 0)
+    return counts / counts.sum()
+
+
+def standardize(hist, weights):
+    """Crude and directly standardized means over the Age axis (axis 1)
+
+    Returns `(crude, standardized, n, coverage)`, each shaped like `hist`
+    without its Age and slot axes.
+    """
+    counts, sums = _sums(hist)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crude = sums.sum(axis=1) / counts.sum(axis=1)
+        cell_means = np.where(counts > 0, sums / counts, 0.0)
+    shape = [1] * counts.ndim
+    shape[1] = len(weights)
+    present = np.where(counts > 0, np.reshape(weights, shape), 0.0)
+    coverage = present.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        standardized = (present * cell_means).sum(axis=1) / coverage
+    return crude, standardized, counts.sum(axis=1), coverage
+
+
+def state_table(hist, weights, by_gender=False):
+    """Per-state (or state x gender) crude and standardized means
+
+    Columns: State_Name, [Gender,] crude, standardized, count, coverage;
+    states (or state/gender pairs) without respondents are dropped.
+    """
+    if not by_gender:
+        hist = hist.sum(axis=2, keepdims=True)
+    crude, standardized, n, coverage = standardize(hist, weights)
+    genders = histograms.DIMENSIONS["Gender"] if by_gender else [None]
+    index = pd.MultiIndex.from_product(
+        [histograms.DIMENSIONS["State_Name"], genders], names=["State_Name", "Gender"]
+    )
+    table = pd.DataFrame(
+        {
+            "crude": crude.ravel(),
+            "standardized": standardized.ravel(),
+            "count": n.ravel(),
+            "coverage": coverage.ravel(),
+        },
+        index=index,
+    ).reset_index()
+    if not by_gender:
+        table = table.drop(columns="Gender")
+    return table[table["count"] > 0].reset_index(drop=True)
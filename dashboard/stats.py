@@ -0,0 +1,256 @@
+"""
+Significance tests for the gender and group disparities quoted in the text
+
+All tests are computed in one batch from grouped sums, so testing every
+state x metric comparison costs one groupby plus a few array operations:
+
+- two-proportion z-tests on the (unweighted) rates the dashboard displays
+- a weighted chi-square on survey-weighted rates, using Kish effective sample
+  sizes so unequal `_LLCPWT` weights widen the test appropriately
+- Welch t-tests on `Mental_Health_Days_Clean`
+- Benjamini-Hochberg false discovery rate control across the whole batch
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import stats as sps
+
+from dashboard.metrics import DISTRESS_THRESHOLD
+
+WEIGHT_COLUMN = "_LLCPWT"
+
+# Significance level applied to BH-adjusted q-values
+ALPHA = 0.05
+
+# Binary outcomes tested as proportions
+RATE_OUTCOMES = {
+    "Depression": lambda df: df["Depression"] == "Yes",
+    "Frequent Distress": lambda df: (
+        df["Mental_Health_Days_Clean"] >= DISTRESS_THRESHOLD
+    ),
+}
+
+# Continuous outcome tested with Welch's t-test
+MEAN_OUTCOME = ("Mental Health Days", "Mental_Health_Days_Clean")
+
+# Generic comparison columns -> gender disparity result columns
+GENDER_COLUMNS = {
+    "Comparison": "State",
+    "A": "Female",
+    "B": "Male",
+    "n_A": "n_Female",
+    "n_B": "n_Male",
+}
+
+# Contrasts behind the "Protective Factors" box: outcome rate in the exposed
+# group vs the protected group
+PROTECTIVE_CONTRASTS = {
+    "Emotional Support": ("Emotional_Support", ["Never"], ["Always"]),
+    "Economic Stability": ("Income_Group", ["<$15k"], [">$75k"]),
+    "Healthcare Access": ("Has_Insurance", ["No"], ["Yes"]),
+    "Employment": (
+        "Employment",
+        ["Unemployed <1yr", "Unemployed 1yr+"],
+        ["Employed", "Self-employed"],
+    ),
+    "Life Satisfaction": (
+        "Life_Satisfaction",
+        ["Dissatisfied", "Very Dissatisfied"],
+        ["Very Satisfied", "Satisfied"],
+    ),
+}
+
+
+def two_proportion_ztest(x1, n1, x2, n2):
+    """Pooled two-proportion z statistic and two-sided p-value (vectorized)"""
+    x1, n1, x2, n2 = (np.asarray(a, dtype=float) for a in (x1, n1, x2, n2))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pooled = (x1 + x2) / (n1 + n2)
+        se = np.sqrt(pooled * (1 - pooled) * (1 / n1 + 1 / n2))
+        z = (x1 / n1 - x2 / n2) / se
+    return z, 2 * sps.norm.sf(np.abs(z))
+
+
+def weighted_chi_square(p1, neff1, p2, neff2):
+    """1-df chi-square on weighted proportions with Kish effective sizes"""
+    z, _ = two_proportion_ztest(p1 * neff1, neff1, p2 * neff2, neff2)
+    chi2 = z**2
+    return chi2, sps.chi2.sf(chi2, 1)
+
+
+def welch_ttest(mean1, var1, n1, mean2, var2, n2):
+    """Welch t statistic, degrees of freedom and two-sided p-value (vectorized)"""
+    mean1, var1, n1, mean2, var2, n2 = (
+        np.asarray(a, dtype=float) for a in (mean1, var1, n1, mean2, var2, n2)
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a, b = var1 / n1, var2 / n2
+        t = (mean1 - mean2) / np.sqrt(a + b)
+        dof = (a + b) ** 2 / (a**2 / (n1 - 1) + b**2 / (n2 - 1))
+    return t, dof, 2 * sps.t.sf(np.abs(t), dof)
+
+
+def benjamini_hochberg(p_values):
+    """Benjamini-Hochberg adjusted q-values; NaN p-values stay NaN"""
+    p = np.asarray(p_values, dtype=float)
+    q = np.full_like(p, np.nan)
+    valid = ~np.isnan(p)
+    m = valid.sum()
+    if m == 0:
+        return q
+    order = np.argsort(p[valid])
+    ranked = p[valid][order] * m / np.arange(1, m + 1)
+    # Enforce monotonicity from the largest p downwards
+    ranked = np.minimum.accumulate(ranked[::-1])[::-1]
+    adjusted = np.empty(m)
+    adjusted[order] = np.minimum(ranked, 1.0)
+    q[valid] = adjusted
+    return q
+
+
+def _group_sums(df, keys):
+    """Per-group counts, flag sums and moments needed by every test"""
+    weights = df[WEIGHT_COLUMN].fillna(0).to_numpy(dtype=float)
+    days = df[MEAN_OUTCOME[1]].to_numpy(dtype=float)
+    has_days = ~np.isnan(days)
+    columns = {
+        "n": np.ones(len(df)),
+        "w": weights,
+        "w2": weights**2,
+        "days_n": has_days.astype(float),
+        "days_sum": np.where(has_days, days, 0.0),
+        "days_sq": np.where(has_days, days**2, 0.0),
+    }
+    for name, flag in RATE_OUTCOMES.items():
+        values = flag(df).to_numpy(dtype=float)
+        columns[f"{name}_x"] = values
+        columns[f"{name}_wx"] = values * weights
+    sums = pd.DataFrame(columns, index=df.index)
+    for key in keys:
+        sums[key] = df[key].to_numpy()
+    return sums.groupby(keys, observed=True).sum()
+
+
+def _compare(a, b, label_index):
+    """Tests of every outcome between aligned group-sum frames `a` and `b`"""
+    rows = []
+    for name in RATE_OUTCOMES:
+        rate_a = a[f"{name}_x"] / a["n"] * 100
+        rate_b = b[f"{name}_x"] / b["n"] * 100
+        z, p = two_proportion_ztest(a[f"{name}_x"], a["n"], b[f"{name}_x"], b["n"])
+        neff_a = a["w"] ** 2 / a["w2"]
+        neff_b = b["w"] ** 2 / b["w2"]
+        _, p_weighted = weighted_chi_square(
+            a[f"{name}_wx"] / a["w"], neff_a, b[f"{name}_wx"] / b["w"], neff_b
+        )
+        rows.append(
+            pd.DataFrame(
+                {
+                    "Comparison": label_index,
+                    "Metric": name + " (%)",
+                    "A": rate_a.to_numpy(),
+                    "B": rate_b.to_numpy(),
+                    "n_A": a["n"].to_numpy(),
+                    "n_B": b["n"].to_numpy(),
+                    "Test": "z",
+                    "Statistic": z,
+                    "p": p,
+                    "p_weighted": p_weighted,
+                }
+            )
+        )
+
+    mean_a = a["days_sum"] / a["days_n"]
+    mean_b = b["days_sum"] / b["days_n"]
+    var_a = (a["days_sq"] - a["days_n"] * mean_a**2) / (a["days_n"] - 1)
+    var_b = (b["days_sq"] - b["days_n"] * mean_b**2) / (b["days_n"] - 1)
+    t, _, p = welch_ttest(mean_a, var_a, a["days_n"], mean_b, var_b, b["days_n"])
+    rows.append(
+        pd.DataFrame(
+            {
+                "Comparison": label_index,
+                "Metric": "Avg " + MEAN_OUTCOME[0],
+                "A": mean_a.to_numpy(),
+                "B": mean_b.to_numpy(),
+                "n_A": a["days_n"].to_numpy(),
+                "n_B": b["days_n"].to_numpy(),
+                "Test": "Welch t",
+                "Statistic": t,
+                "p": p,
+                "p_weighted": np.nan,
+            }
+        )
+    )
+    result = pd.concat(rows, ignore_index=True)
+    result["Ratio"] = result["A"] / result["B"]
+    return result
+
+
+def _finish(result):
+    result["q"] = benjamini_hochberg(result["p"])
+    result["Significant"] = result["q"] < ALPHA
+    return result
+
+
+def gender_disparity_tests(df):
+    """Female vs male tests for every state x metric plus the overall row
+
+    `df` should hold both genders (the state/age selection before the gender
+    filter). Columns A/B are the female/male values; q is BH-adjusted across
+    all rows of the result.
+    """
+    by_state = _group_sums(df, ["State_Name", "Gender"])
+    overall = _group_sums(df, ["Gender"])
+    overall.index = pd.MultiIndex.from_product([["All"], overall.index])
+    sums = pd.concat([overall, by_state])
+    if sums.empty:
+        # No respondents selected: no rows to test, but the usual columns
+        result = _compare(sums, sums, np.array([], dtype=object))
+        return _finish(result.rename(columns=GENDER_COLUMNS))
+
+    states = sums.index.get_level_values(0).unique()
+    full = pd.MultiIndex.from_product([states, ["Female", "Male"]])
+    sums = sums.reindex(full, fill_value=0)
+    female = sums.xs("Female", level=1)
+    male = sums.xs("Male", level=1)
+
+    result = _compare(female, male, female.index.to_numpy())
+    return _finish(result.rename(columns=GENDER_COLUMNS))
+
+
+def contrast_tests(df, contrasts=None):
+    """Exposed vs protected group tests for each named contrast in one batch
+
+    Columns A/B are the exposed/protected values, so Ratio > 1 means the
+    protected group fares better.
+    """
+    contrasts = PROTECTIVE_CONTRASTS if contrasts is None else contrasts
+    needed = [WEIGHT_COLUMN, MEAN_OUTCOME[1], "Depression"]
+    frames = []
+    for name, (column, exposed, protected) in contrasts.items():
+        side = np.where(
+            df[column].isin(exposed), "A", np.where(df[column].isin(protected), "B", "")
+        )
+        keep = side != ""
+        part = df.loc[keep, needed].copy()
+        part["_contrast"] = name
+        part["_side"] = side[keep]
+        frames.append(part)
+    stacked = pd.concat(frames, ignore_index=True)
+    sums = _group_sums(stacked, ["_contrast", "_side"])
+    names = list(contrasts)
+    full = pd.MultiIndex.from_product([names, ["A", "B"]])
+    sums = sums.reindex(full, fill_value=0)
+    result = _compare(
+        sums.xs("A", level=1), sums.xs("B", level=1), np.asarray(names, dtype=object)
+    )
+    return _finish(result.rename(columns={"Comparison": "Contrast"}))
+
+
+def format_p(q):
+    """Short significance note for insight text, e.g. 'q<0.001'"""
+    if q is None or np.isnan(q):
+        return "not testable"
+    if q < 0.001:
+        return "q<0.001"
+    return f"q={q:.3f}" if q < ALPHA else f"n.s., q={q:.2f}"
@@ -0,0 +1,208 @@
+"""
+Resident dataset with incremental refresh
+
+`DatasetStore` owns the prepared frame together with the structures derived
+from it (a key index and any named aggregate tables). When the CDC publishes
+corrected weights or a new state's records, only the added or changed rows are
+run through `prepare_frame` and patched in, instead of re-parsing and
+re-deriving everything from the CSVs.
+
+Update files are raw extracts with the same columns as the originals, dropped
+into `<data dir>/updates/` and named by gender, e.g. `female_2025q1.csv` or
+`male_weights_fix.csv`. Rows are matched on `KEY_COLUMNS`; `SEQNO` is only
+unique within a state's year, so the state code is part of the key.
+
+    python -m dashboard.store apply     # apply pending update files
+"""
+
+import glob
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from dashboard import shared
+from dashboard.data import DATA_DIR, load_prepared_frame, prepare_frame
+
+# Columns identifying a respondent across releases
+KEY_COLUMNS = ["IYEAR", "_STATE", "SEQNO"]
+
+# Update file prefixes and the Gender they are tagged with
+UPDATE_PREFIXES = {"female": "Female", "male": "Male"}
+
+
+class DatasetStore:
+    """Prepared frame plus the aggregates derived from it
+
+    Aggregates are registered lazily through `aggregate()`. Additive ones
+    (count/sum arrays whose shape does not depend on the data) are patched
+    on refresh by subtracting the replaced rows and adding the new ones;
+    everything else is dropped and rebuilt on next use.
+    """
+
+    def __init__(self, frame, shared_path=None):
+        self.frame = frame
+        self.version = 0
+        self.shared_path = shared_path
+        self._shared_mtime = _mtime(shared_path)
+        self._aggregates = {}
+        self._key_index = None
+        self._applied = {}
+        self._lock = threading.Lock()
+
+    def aggregate(self, name, builder, additive=False):
+        """Aggregate `name`, built with `builder(frame)` on first use"""
+        entry = self._aggregates.get(name)
+        if entry is None or entry[0] != self.version:
+            entry = (self.version, builder, additive, builder(self.frame))
+            self._aggregates[name] = entry
+        return entry[3]
+
+    def key_index(self):
+        """Row positions of the frame indexed by KEY_COLUMNS"""
+        if self._key_index is None:
+            self._key_index = pd.MultiIndex.from_frame(self.frame[KEY_COLUMNS])
+        return self._key_index
+
+    def refresh(self, updates):
+        """Apply raw rows (tagged with Gender) to the store
+
+        Returns a summary dict with the number of added, changed and
+        unchanged rows. Unchanged rows cost nothing beyond the comparison.
+        """
+        start = time.perf_counter()
+        with self._lock:
+            updates = updates.drop_duplicates(KEY_COLUMNS, keep="last")
+            updates = updates.reset_index(drop=True)
+            positions = self.key_index().get_indexer(
+                pd.MultiIndex.from_frame(updates[KEY_COLUMNS])
+            )
+            matched = positions >= 0
+
+            # A matched row only counts as changed if a raw value differs
+            raw_columns = [c for c in updates.columns if c in self.frame.columns]
+            old = self.frame.iloc[positions[matched]][raw_columns]
+            new = updates.loc[matched, raw_columns]
+            differs = ~(
+                (old.to_numpy() == new.to_numpy())
+                | (old.isna().to_numpy() & new.isna().to_numpy())
+            ).all(axis=1)
+
+            changed_positions = positions[matched][differs]
+            delta = pd.concat(
+                [updates[matched][differs], updates[~matched]], ignore_index=True
+            )
+            summary = {
+                "added": int((~matched).sum()),
+                "changed": int(differs.sum()),
+                "unchanged": int(matched.sum() - differs.sum()),
+            }
+            if len(delta) == 0:
+                summary["seconds"] = time.perf_counter() - start
+                return summary
+
+            # Derivations run on the delta only
+            delta = prepare_frame(delta)
+            removed = self.frame.iloc[changed_positions]
+
+            kept = np.ones(len(self.frame), dtype=bool)
+            kept[changed_positions] = False
+            frame = pd.concat([self.frame[kept], delta], ignore_index=True)
+
+            self._patch_aggregates(removed, delta)
+            self.frame = frame
+            self._key_index = None
+            self.version += 1
+            if self.shared_path:
+                shared.publish_frame(frame, self.shared_path)
+                self._shared_mtime = _mtime(self.shared_path)
+
+        summary["seconds"] = time.perf_counter() - start
+        return summary
+
+    def _patch_aggregates(self, removed, added):
+        patched = {}
+        for name, (version, builder, additive, value) in self._aggregates.items():
+            if not additive or version != self.version:
+                continue
+            new_value = value - builder(removed) + builder(added)
+            if np.shape(new_value) == np.shape(value):
+                patched[name] = (self.version + 1, builder, additive, new_value)
+        self._aggregates = patched
+
+    def pending_update_files(self, data_dir=None):
+        """Update files not applied yet (new or modified since last apply)"""
+        pattern = os.path.join(data_dir or DATA_DIR, "updates", "*.csv")
+        pending = []
+        for path in sorted(glob.glob(pattern)):
+            prefix = os.path.basename(path).split("_")[0].lower()
+            if prefix in UPDATE_PREFIXES and self._applied.get(path) != _mtime(path):
+                pending.append(path)
+        return pending
+
+    def apply_update_files(self, data_dir=None):
+        """Read and apply every pending update file in one refresh"""
+        paths = self.pending_update_files(data_dir)
+        if not paths:
+            return {"added": 0, "changed": 0, "unchanged": 0, "files": 0}
+        frames = []
+        for path in paths:
+            df = pd.read_csv(path)
+            df["Gender"] = UPDATE_PREFIXES[os.path.basename(path).split("_")[0].lower()]
+            frames.append(df)
+        summary = self.refresh(pd.concat(frames, ignore_index=True))
+        for path in paths:
+            self._applied[path] = _mtime(path)
+        summary["files"] = len(paths)
+        return summary
+
+    def sync_shared(self):
+        """Re-attach if another worker published a newer shared snapshot"""
+        if not self.shared_path:
+            return False
+        mtime = _mtime(self.shared_path)
+        if mtime is None or mtime == self._shared_mtime:
+            return False
+        with self._lock:
+            self.frame = shared.attach_frame(self.shared_path)
+            self._shared_mtime = mtime
+            self._aggregates = {}
+            self._key_index = None
+            self.version += 1
+        return True
+
+
+def _mtime(path):
+    try:
+        return os.path.getmtime(path) if path else None
+    except OSError:
+        return None
+
+
+def load_store(data_dir=None):
+    """Store over the prepared frame (shared when VMH_SHARED_DATASET is set)"""
+    frame = shared.load_frame(lambda: load_prepared_frame(data_dir))
+    return DatasetStore(frame, shared_path=shared.SHARED_DATASET)
+
+
+def main(argv=None):
+    """Command line entry point: `apply [data dir]`"""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] != "apply":
+        sys.exit("usage: python -m dashboard.store apply [DATA_DIR]")
+    data_dir = argv[1] if len(argv) > 1 else None
+    store = load_store(data_dir)
+    summary = store.apply_update_files(data_dir)
+    print(
+        f"{summary['files']} file(s): {summary['added']} added, "
+        f"{summary['changed']} changed, {summary['unchanged']} unchanged"
+    )
+    if not store.shared_path and summary["files"]:
+        print("note: without VMH_SHARED_DATASET the result only lives in this process")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Small-cell suppression for aggregate tables before they are charted
+
+Cells describing fewer than `VMH_MIN_CELL_SIZE` respondents (default 10; 0
+turns suppression off) are hidden: primary suppression. Hiding one cell is
+not enough when a total over it is also published. The total minus the
+other cells gives the hidden value back, so complementary suppression also
+hides another cell of every such group: preferably one that protects
+several such groups at once, then the smallest. That may expose another
+group, so it repeats until no group has exactly one hidden cell. Cells with
+no respondents carry nothing to protect and are never hidden. A group whose
+other cells are all empty cannot be protected by complements.
+
+A constraint group is a set of cells whose sum is published, given as
+parallel `(members, cells)` arrays of group id and cell position. Groups
+usually come from a table's margins: `margins(keys)` names, for each key,
+the cells that share all other keys (their total over that key is shown
+elsewhere). A single-key table is protected against its grand total.
+
+Everything is a few bincounts and a sort per pass, so suppressing a table
+costs a small fraction of aggregating it (`benchmarks/bench_suppression.py`).
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+MIN_CELL_SIZE = int(os.environ.get("VMH_MIN_CELL_SIZE", "10"))
+
+# Hidden size measure added to suppressed queries
+SIZE = "_n"
+
+
+def hide(counts, members=None, cells=None, min_n=None):
+    """Suppression mask: cells below `min_n` plus their complements"""
+    min_n = MIN_CELL_SIZE if min_n is None else min_n
+    counts = np.asarray(counts, dtype=float)
+    hidden = (counts > 0) & (counts < min_n)
+    if members is None or len(members) == 0 or not hidden.any():
+        return hidden
+
+    n_groups = int(members.max()) + 1
+    while True:
+        exposed = np.bincount(members, hidden[cells], n_groups) == 1
+        candidate = exposed[members] & ~hidden[cells] & (counts[cells] > 0)
+        if not candidate.any():
+            return hidden
+        # Prefer complements that close several exposed groups at once, then
+        # the smallest; the first candidate per group is taken
+        closes = np.bincount(cells, exposed[members], len(counts))
+        group, cell = members[candidate], cells[candidate]
+        order = np.lexsort((cell, counts[cell], -closes[cell], group))
+        group, cell = group[order], cell[order]
+        _, first = np.unique(group, return_index=True)
+        hidden[cell[first]] = True
+
+
+def margins(keys):
+    """Constraint key sets of a table over `keys`: one per key, its complement"""
+    keys = list(keys)
+    return [[other for other in keys if other != key] for key in keys] or [[]]
+
+
+def constraint_groups(table, totals):
+    """`(members, cells)` arrays for cells sharing each key set in `totals`"""
+    codes = {
+        key: pd.factorize(table[key], use_na_sentinel=False)[0]
+        for key in {key for keys in totals for key in keys}
+    }
+    members, cells, offset = [], [], 0
+    positions = np.arange(len(table))
+    for keys in totals:
+        if keys and len(table):
+            flat = np.ravel_multi_index(
+                [codes[key] for key in keys],
+                [int(codes[key].max()) + 1 for key in keys],
+            )
+            _, ids = np.unique(flat, return_inverse=True)
+        else:
+            ids = np.zeros(len(table), dtype=np.intp)
+        members.append(ids + offset)
+        cells.append(positions)
+        offset += int(ids.max()) + 1 if len(ids) else 0
+    if not members:
+        return None, None
+    return np.concatenate(members), np.concatenate(cells)
+
+
+def suppress(table, count, values=(), totals=([],), min_n=None):
+    """Copy of `table` with `count` and `values` set to NaN in hidden cells
+
+    `totals` lists the key sets whose totals are published (see `margins`).
+    A boolean `suppressed` column marks the hidden cells.
+    """
+    members, cells = constraint_groups(table, totals)
+    hidden = hide(table[count].to_numpy(dtype=float), members, cells, min_n)
+    table = table.copy()
+    for column in [count, *values]:
+        table[column] = np.where(hidden, np.nan, table[column].to_numpy(dtype=float))
+    table["suppressed"] = hidden
+    return table
+
+
+def hide_grid(counts, axes=(), min_n=None):
+    """Suppression mask of a 2-D count array whose totals along `axes` are shown
+
+    Axis 1 means each row's total is published, axis 0 each column's. With
+    no axes the grand total is assumed published.
+    """
+    counts = np.asarray(counts, dtype=float)
+    if counts.size == 0:
+        return np.zeros(counts.shape, dtype=bool)
+    rows, columns = np.indices(counts.shape)
+    members, cells, offset = [], [], 0
+    for axis in axes or (None,):
+        ids = {None: np.zeros_like(rows), 0: columns, 1: rows}[axis].ravel()
+        members.append(ids + offset)
+        cells.append(np.arange(counts.size))
+        offset += int(ids.max()) + 1
+    hidden = hide(counts.ravel(), np.concatenate(members), np.concatenate(cells), min_n)
+    return hidden.reshape(counts.shape)
+
+
+def run_query(backend, request, min_n=None):
+    """Execute a `query.Query` and suppress its small groups
+
+    Every measure of a hidden group becomes NaN and `suppressed` marks it.
+    Totals over each group-by key are treated as published.
+    """
+    from dashboard import query
+
+    sized = query.Query(
+        {**request.measures, SIZE: ("size",)}, request.group_by, request.filters
+    )
+    result = backend.execute(sized)
+    result = suppress(
+        result, SIZE, list(request.measures), margins(request.group_by), min_n
+    )
+    return result.drop(columns=SIZE)
+
+
+def group_means(df, keys, value, min_n=None):
+    """Mean of `value` per group of `keys` with its respondents `n`, suppressed"""
+    keys = list(keys)
+    grouped = df.groupby(keys, observed=True)[value].agg(["mean", "count"])
+    table = grouped.reset_index().rename(columns={"mean": value, "count": "n"})
+    return suppress(table, "n", [value], margins(keys), min_n)
+
+
+def note(hidden, min_n=None):
+    """Caption text when any cell of a suppression mask is set, else None
+
+    Pass the `min_n` the mask was built with when it is not the default.
+    """
+    min_n = MIN_CELL_SIZE if min_n is None else min_n
+    hidden = np.asarray(hidden)
+    if not hidden.any():
+        return None
+    return (
+        f"{int(hidden.sum())} group(s) with fewer than "
+        f"{min_n} respondents, or whose values could be derived from "
+        "published totals, are hidden."
+    )
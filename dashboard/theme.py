@@ -0,0 +1,64 @@
+"""
+Page styling injected once per run by the Streamlit app
+"""
+
+CSS = """
+<style>
+    .main-header {
+        font-size: 3rem;
+        font-weight: bold;
+        background: linear-gradient(90deg, #1f77b4 0%, #ff7f0e 100%);
+        -webkit-background-clip: text;
+        -webkit-text-fill-color: transparent;
+        text-align: center;
+        padding: 1rem;
+    }
+    .sub-header {
+        font-size: 1.5rem;
+        color: #ff7f0e;
+        padding: 0.5rem;
+        border-left: 4px solid #ff7f0e;
+        margin: 1rem 0;
+    }
+    .insight-box {
+        background-color: #f0f8ff;
+        border-left: 5px solid #1f77b4;
+        padding: 1rem;
+        border-radius: 5px;
+        margin: 1rem 0;
+    }
+    .warning-box {
+        background-color: #fff3cd;
+        border-left: 5px solid #ff7f0e;
+        padding: 1rem;
+        border-radius: 5px;
+        margin: 1rem 0;
+    }
+    .success-box {
+        background-color: #d4edda;
+        border-left: 5px solid #28a745;
+        padding: 1rem;
+        border-radius: 5px;
+        margin: 1rem 0;
+    }
+    .gender-badge {
+        display: inline-block;
+        padding: 0.25rem 0.5rem;
+        border-radius: 3px;
+        font-weight: bold;
+        margin: 0 0.25rem;
+    }
+    .female-badge {
+        background-color: #ff7f0e;
+        color: white;
+    }
+    .male-badge {
+        background-color: #1f77b4;
+        color: white;
+    }
+    .all-badge {
+        background-color: #2ca02c;
+        color: white;
+    }
+</style>
+"""
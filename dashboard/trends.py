@@ -0,0 +1,125 @@
+"""
+Monthly interview-date aggregates for the Trends page
+
+Respondents are binned by interview month (`IYEAR * 12 + IMONTH - 1`, so the
+axis simply grows with multi-year data) x Gender x State. Each cell holds the
+respondent count and the number depressed and in frequent distress, built
+with one `np.bincount` and kept as a store aggregate. Monthly series are sums
+over the selected slice; rolling windows are differences of a cumulative sum
+along the month axis, so any window length costs O(months).
+"""
+
+import numpy as np
+import pandas as pd
+
+from dashboard.constants import STATE_CODES
+from dashboard.metrics import DISTRESS_THRESHOLD
+
+GENDERS = ["Female", "Male"]
+STATES = list(dict.fromkeys(STATE_CODES.values()))
+
+# Summed per cell; rates divide by "n" (all respondents, like metrics.py)
+MEASURES = ["n", "depressed", "distressed"]
+
+# Rate label -> numerator measure
+RATES = {
+    "Frequent Distress (%)": "distressed",
+    "Depression (%)": "depressed",
+}
+
+# Columns the aggregate can slice by; other facets are answered from rows
+DIMENSIONS = {"Gender": GENDERS, "State_Name": STATES}
+
+
+def _codes(values, levels):
+    codes = pd.Index(levels).get_indexer(values)
+    codes[codes < 0] = len(levels)
+    return codes
+
+
+def build_trends(df):
+    """Month x Gender x State x measure counts plus the first month index
+
+    Returns `(first_month, counts)`; `counts[m]` covers month
+    `first_month + m`. Months with no interviews inside the range are zero.
+    """
+    months = (df["IYEAR"].to_numpy() * 12 + df["IMONTH"].to_numpy() - 1).astype(np.intp)
+    if len(months) == 0:
+        return 0, np.zeros((0, len(GENDERS) + 1, len(STATES) + 1, len(MEASURES)))
+    first = months.min()
+    shape = (months.max() - first + 1, len(GENDERS) + 1, len(STATES) + 1)
+    cells = np.ravel_multi_index(
+        (
+            months - first,
+            _codes(df["Gender"].to_numpy(), GENDERS),
+            _codes(df["State_Name"].to_numpy(), STATES),
+        ),
+        shape,
+    )
+    values = {
+        "n": None,
+        "depressed": (df["Depression"] == "Yes").to_numpy(dtype=float),
+        "distressed": (df["Mental_Health_Days_Clean"] >= DISTRESS_THRESHOLD).to_numpy(
+            dtype=float
+        ),
+    }
+    size = int(np.prod(shape))
+    counts = np.stack(
+        [np.bincount(cells, weights=values[m], minlength=size) for m in MEASURES],
+        axis=-1,
+    )
+    return first, counts.reshape((*shape, len(MEASURES)))
+
+
+def covers(selections):
+    """Whether the month aggregate alone can answer a selection"""
+    return set(selections) <= set(DIMENSIONS)
+
+
+def select(trends, selections=None, by=None):
+    """Monthly measure sums for a selection as a DataFrame
+
+    Indexed by monthly Period; with `by` ("Gender" or "State_Name") the
+    columns are a (level, measure) MultiIndex over the selected levels.
+    """
+    first, counts = trends
+    selections = selections or {}
+    for axis, column in enumerate(DIMENSIONS, start=1):
+        if column in selections:
+            positions = pd.Index(DIMENSIONS[column]).get_indexer(selections[column])
+            counts = np.take(counts, positions[positions >= 0], axis=axis)
+        elif column == by:
+            counts = np.take(counts, np.arange(len(DIMENSIONS[column])), axis=axis)
+
+    index = pd.period_range(
+        pd.Period(year=first // 12, month=first % 12 + 1, freq="M"),
+        periods=counts.shape[0],
+        freq="M",
+        name="Month",
+    )
+    if by is None:
+        return pd.DataFrame(counts.sum(axis=(1, 2)), index=index, columns=MEASURES)
+
+    keep = list(DIMENSIONS).index(by) + 1
+    other = 3 - keep
+    summed = counts.sum(axis=other)
+    levels = [v for v in selections.get(by, DIMENSIONS[by]) if v in DIMENSIONS[by]]
+    columns = pd.MultiIndex.from_product([levels, MEASURES])
+    return pd.DataFrame(
+        summed.reshape(len(index), len(columns)), index=index, columns=columns
+    )
+
+
+def rolling(sums, window=3):
+    """Trailing `window`-month sums from a cumulative sum (O(months))"""
+    cumulative = np.cumsum(sums.to_numpy(), axis=0)
+    shifted = np.vstack([np.zeros((window, sums.shape[1])), cumulative[:-window]])
+    return pd.DataFrame(cumulative - shifted[: len(sums)], sums.index, sums.columns)
+
+
+def rates(sums, rate):
+    """Percentage series for `rate` (a RATES label) from measure sums"""
+    numerator = RATES[rate]
+    if isinstance(sums.columns, pd.MultiIndex):
+        return sums.xs(numerator, axis=1, level=1) / sums.xs("n", axis=1, level=1) * 100
+    return sums[numerator] / sums["n"] * 100
@@ -0,0 +1,85 @@
+"""
+Dashboard pages, imported lazily on first navigation
+
+Each page lives in its own module exposing `render(ctx)`. Only the page being
+shown is imported, so plotly and the page code stay off the startup path until
+a chart is actually needed; after the first visit the module is served from
+`sys.modules` like any other import.
+"""
+
+import importlib
+from dataclasses import dataclass
+
+import pandas as pd
+
+from dashboard import facets, metrics, query, sampling, suppression
+from dashboard.manifest import build_manifest
+
+# Sidebar label -> module under dashboard.views
+PAGES = {
+    "Executive Overview": "overview",
+    "Mental Health Analysis": "mental_health",
+    "Geographic Patterns": "geographic",
+    "Trends Over Time": "trends",
+    "Intersectional Analysis": "intersectional",
+    "🔍 Interactive Explorer": "explorer",
+    "Risk Factors": "risk_factors",
+    "Key Insights": "insights",
+    "Recommendations": "recommendations",
+}
+
+
+@dataclass
+class ViewContext:
+    """State the sidebar hands to the selected page"""
+
+    store: object
+    df_all: pd.DataFrame
+    df_filtered: pd.DataFrame
+    gender_filter: str
+    facets: dict = None
+
+    @property
+    def filter_key(self):
+        """Hashable description of the sidebar selection, for per-filter caches"""
+        return (self.gender_filter, facets.selection_key(self.facets))
+
+    def figure_key(self, *parts):
+        """Key for `figures.plotly_chart`: dataset version, selection and the
+        chart's name and options in `parts`"""
+        return (self.store.version, self.filter_key, *parts)
+
+    @property
+    def manifest(self):
+        """Dataset manifest (counts, missing states, coverage) for this version"""
+        return self.store.aggregate("manifest", build_manifest)
+
+    def df_selection(self):
+        """Rows matching the facet filters for both genders"""
+        index = self.store.aggregate("facet_index", facets.build_index)
+        return facets.apply(self.df_all, index, self.facets or {})
+
+    def run_query(self, request):
+        """Execute a `query.Query` against the sidebar selection, suppressed"""
+        filters = dict(self.facets or {})
+        population = metrics.POPULATIONS[self.gender_filter]
+        if population:
+            filters["Gender"] = [population]
+        backend = self.store.aggregate("query_backend", query.build_backend)
+        return suppression.run_query(backend, request.where(filters))
+
+    def estimate_means(self, value, keys):
+        """Means of `value` per group of `keys` estimated from the stratified
+        sample, with `se`; suppressed on the estimated group sizes"""
+        sample = self.store.aggregate("stratified_sample", sampling.build_sample)
+        rows = self.store.frame.index.get_indexer(self.df_filtered.index)
+        table = sampling.estimate(sample, self.store.frame, value, keys, rows)
+        return suppression.suppress(
+            table, "count", [value, "se"], suppression.margins(keys)
+        )
+
+
+def render_page(page, ctx):
+    """Import the page's module on first use and render it"""
+    module = importlib.import_module(f"dashboard.views.{PAGES[page]}")
+    module.render(ctx)
@@ -0,0 +1,39 @@
+"""
+Chart helpers shared between pages
+"""
+
+import plotly.graph_objects as go
+
+
+def clean_label(text):
+    """Remove underscores and make labels more readable"""
+    if isinstance(text, str):
+        return text.replace("_", " ").title()
+    return text
+
+
+# Helper function for gender comparison
+def create_gender_comparison_chart(df, metric_col, title, y_label):
+    """Create a grouped bar chart comparing female and male veterans"""
+    if "Gender" in df.columns and len(df["Gender"].unique()) > 1:
+        gender_stats = df.groupby("Gender")[metric_col].mean().reset_index()
+
+        fig = go.Figure()
+        colors = {"Female": "#ff7f0e", "Male": "#1f77b4"}
+
+        for gender in gender_stats["Gender"]:
+            value = gender_stats[gender_stats["Gender"] == gender][metric_col].values[0]
+            fig.add_trace(
+                go.Bar(
+                    name=gender,
+                    x=[gender],
+                    y=[value],
+                    marker_color=colors.get(gender, "#2ca02c"),
+                    text=[f"{value:.1f}"],
+                    textposition="outside",
+                )
+            )
+
+        fig.update_layout(title=title, yaxis_title=y_label, height=400, showlegend=True)
+        return fig
+    return None
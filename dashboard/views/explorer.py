@@ -0,0 +1,435 @@
+"""
+Interactive Explorer page
+"""
+
+import plotly.express as px
+import streamlit as st
+
+from dashboard import (
+    associations,
+    features,
+    figures,
+    profiling,
+    progressive,
+    suppression,
+)
+from dashboard.constants import (
+    AGE_GROUP_ORDER,
+    EDUCATION_ORDER,
+    HEALTH_ORDER,
+    INCOME_ORDER,
+    SUPPORT_ORDER,
+)
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def association_scan(version, filter_key, target, _df):
+    """Association scan for the selection (also persisted under data/cache/)"""
+    return associations.load_or_scan(_df, target)
+
+
+def shown_rows(df, keys):
+    """Rows of `df` outside suppressed groups, and the groups' suppression mask
+
+    Box and violin plots draw quartiles and single points, so a small group
+    (or the complement protecting it) is left out entirely.
+    """
+    sizes = df.groupby(keys, observed=True).size().reset_index(name="n")
+    sizes = suppression.suppress(sizes, "n", totals=suppression.margins(keys))
+    shown = sizes.loc[~sizes["suppressed"], keys]
+    return df.merge(shown, on=keys), sizes["suppressed"]
+
+
+@st.fragment
+@profiling.timed("explorer associations")
+def render_associations(ctx):
+    """Ranking of all coded BRFSS columns by association with the outcome"""
+    st.markdown("### Strongest Associations Across All Survey Columns")
+    st.markdown(
+        "Every coded BRFSS item ranked by Cramér's V (0 = none, 1 = perfect) "
+        "with the chosen outcome, with mutual information in bits. Items asked "
+        "of few respondents can rank high by chance, so set a minimum sample."
+    )
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        target = st.selectbox(
+            "Outcome",
+            associations.TARGETS,
+            format_func=lambda t: {
+                "poor_mental_health": "Frequent Mental Distress (≥14 days)",
+                "MENTHLTH": "Mental Health Days (0-30)",
+            }[t],
+        )
+    with col2:
+        min_n = st.number_input("Minimum respondents", 0, value=500, step=100)
+    with col3:
+        top_n = st.slider("Columns shown", 5, 50, 20)
+
+    with st.spinner("Scanning survey columns..."):
+        scores = association_scan(
+            ctx.store.version, ctx.filter_key, target, ctx.df_filtered
+        )
+    scores = scores[scores["n"] >= min_n].head(top_n)
+
+    fig = px.bar(
+        scores.iloc[::-1],
+        x="Cramers_V",
+        y="Column",
+        orientation="h",
+        hover_data={"Mutual_Info": ":.4f", "n": ":,", "Levels": True},
+        labels={"Cramers_V": "Cramér's V", "Column": "BRFSS Column"},
+        title=f"Top {len(scores)} Columns by Association",
+    )
+    fig.update_layout(height=max(400, 24 * len(scores)))
+    figures.plotly_chart(
+        fig,
+        ctx.figure_key("associations", target, min_n, top_n),
+        use_container_width=True,
+    )
+
+
+@st.fragment
+@profiling.timed("explorer chart")
+def render_chart(ctx):
+    """Custom chart; its controls rerun only this fragment"""
+    df_filtered = ctx.df_filtered
+    gender_filter = ctx.gender_filter
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        chart_type = st.selectbox(
+            "Chart Type", ["Box Plot", "Violin Plot", "Bar Chart", "Histogram"]
+        )
+
+    with col2:
+        # X-axis columns and their display names without underscores
+        categorical_vars_display = {
+            "Age_Group": "Age Group",
+            "Income_Group": "Income Group",
+            "Employment": "Employment",
+            "Education": "Education",
+            "General_Health": "General Health",
+            "Depression": "Depression",
+            "Has_Insurance": "Has Insurance",
+            "Emotional_Support": "Emotional Support",
+            **features.SCORE_LABELS,
+        }
+        x_var_display = st.selectbox(
+            "X-Axis Variable", list(categorical_vars_display.values())
+        )
+        # Map back to actual column name
+        x_var = [k for k, v in categorical_vars_display.items() if v == x_var_display][
+            0
+        ]
+    # Y-Axis variable selection
+    with col3:
+        # Hide Y-Axis dropdown when Histogram is selected
+        if chart_type != "Histogram":
+            # Normal Y-axis dropdown for Box, Violin, Bar charts
+            y_vars_display = {
+                "Mental_Health_Days_Clean": "Mental Health Days",
+                "Physical_Health_Days_Clean": "Physical Health Days",
+            }
+
+            y_var_display = st.selectbox(
+                "Y-Axis Variable", list(y_vars_display.values())
+            )
+            y_var = [k for k, v in y_vars_display.items() if v == y_var_display][0]
+
+        else:
+            # Histogram does not use y_var → set default (unused)
+            y_var = "Mental_Health_Days_Clean"
+
+    # Add gender overlay option
+    if gender_filter in ["All Veterans", "Compare Genders"]:
+        show_gender_split = st.checkbox(
+            "Show by Gender", value=(gender_filter == "Compare Genders")
+        )
+    else:
+        show_gender_split = False
+
+    # Age group color palette
+    age_colors = {
+        "18-24": "#e41a1c",
+        "25-29": "#377eb8",
+        "30-34": "#4daf4a",
+        "35-39": "#984ea3",
+        "40-44": "#ff7f00",
+        "45-49": "#ffff33",
+        "50-54": "#a65628",
+        "55-59": "#f781bf",
+        "60-64": "#999999",
+        "65-69": "#66c2a5",
+        "70-74": "#fc8d62",
+        "75-79": "#8da0cb",
+        "80+": "#e78ac3",
+    }
+
+    # Create better labels (remove underscores)
+    def clean_label(text):
+        """Remove underscores and make labels more readable"""
+        return text.replace("_", " ")
+
+    # Box and violin plots draw respondents directly, minus suppressed groups
+    if chart_type in ("Box Plot", "Violin Plot"):
+        plotted, hidden = shown_rows(
+            df_filtered.dropna(subset=[x_var, y_var]),
+            [x_var, "Gender"] if show_gender_split else [x_var],
+        )
+
+    # Create visualization
+    if chart_type == "Box Plot":
+        category_order = None
+        if x_var == "Age_Group":
+            category_order = {"Age_Group": AGE_GROUP_ORDER}
+        elif x_var == "General_Health":
+            category_order = {"General_Health": HEALTH_ORDER}
+        elif x_var == "Education":
+            category_order = {"Education": EDUCATION_ORDER}
+        elif x_var == "Income_Group":
+            category_order = {"Income_Group": INCOME_ORDER}
+        elif x_var == "Emotional_Support":
+            category_order = {"Emotional_Support": SUPPORT_ORDER}
+        # Use Age_Group colors if that's the x variable, otherwise use gender split
+        if x_var == "Age_Group" and not show_gender_split:
+            fig = px.box(
+                plotted,
+                x=x_var,
+                y=y_var,
+                color=x_var,
+                color_discrete_map=age_colors,
+                points="outliers",
+                title=f"{clean_label(y_var)} by {clean_label(x_var)}",
+                category_orders={"Age_Group": AGE_GROUP_ORDER},
+            )
+        else:
+            fig = px.box(
+                plotted,
+                x=x_var,
+                y=y_var,
+                color="Gender" if show_gender_split else None,
+                points="outliers",
+                title=f"{clean_label(y_var)} by {clean_label(x_var)}",
+                color_discrete_map={"Female": "#ff7f0e", "Male": "#1f77b4"}
+                if show_gender_split
+                else None,
+                category_orders=category_order,
+            )
+
+    elif chart_type == "Violin Plot":
+        category_order = None
+        if x_var == "Age_Group":
+            category_order = {"Age_Group": AGE_GROUP_ORDER}
+        elif x_var == "General_Health":
+            category_order = {"General_Health": HEALTH_ORDER}
+        elif x_var == "Education":
+            category_order = {"Education": EDUCATION_ORDER}
+        elif x_var == "Income_Group":
+            category_order = {"Income_Group": INCOME_ORDER}
+        elif x_var == "Emotional_Support":
+            category_order = {"Emotional_Support": SUPPORT_ORDER}
+        # Use Age_Group colors if that's the x variable, otherwise use gender split
+        if x_var == "Age_Group" and not show_gender_split:
+            fig = px.violin(
+                plotted,
+                x=x_var,
+                y=y_var,
+                color=x_var,
+                color_discrete_map=age_colors,
+                box=True,
+                title=f"{clean_label(y_var)} Distribution by {clean_label(x_var)}",
+                category_orders=category_order,
+            )
+        # Add mean line
+        else:
+            fig = px.violin(
+                plotted,
+                x=x_var,
+                y=y_var,
+                color="Gender" if show_gender_split else None,
+                box=True,
+                title=f"{clean_label(y_var)} Distribution by {clean_label(x_var)}",
+                color_discrete_map={"Female": "#ff7f0e", "Male": "#1f77b4"}
+                if show_gender_split
+                else None,
+                category_orders=category_order,
+            )
+    # Create Bar Chart
+    elif chart_type == "Bar Chart":
+        # Determine category ordering for all ordinal variables
+        category_order = None
+        if x_var == "Age_Group":
+            category_order = {"Age_Group": AGE_GROUP_ORDER}
+        elif x_var == "General_Health":
+            category_order = {"General_Health": HEALTH_ORDER}
+        elif x_var == "Education":
+            category_order = {"Education": EDUCATION_ORDER}
+        elif x_var == "Income_Group":
+            category_order = {"Income_Group": INCOME_ORDER}
+        elif x_var == "Emotional_Support":
+            category_order = {"Emotional_Support": SUPPORT_ORDER}
+        keys = [x_var, "Gender"] if show_gender_split else [x_var]
+
+        def bar_chart(grouped, approximate):
+            if approximate:
+                grouped = grouped.assign(ci=grouped["se"] * progressive.Z_95)
+            # Create grouped bar chart if gender split is selected
+            if show_gender_split:
+                fig = px.bar(
+                    grouped,
+                    x=x_var,
+                    y=y_var,
+                    color="Gender",
+                    barmode="group",
+                    color_discrete_map={"Female": "#ff7f0e", "Male": "#1f77b4"},
+                    title=f"Average {clean_label(y_var)} by {clean_label(x_var)}",
+                    category_orders=category_order,
+                    error_y="ci" if approximate else None,
+                )
+            # Age_Group with colors
+            elif x_var == "Age_Group":
+                fig = px.bar(
+                    grouped,
+                    x=x_var,
+                    y=y_var,
+                    color=x_var,
+                    color_discrete_map=age_colors,
+                    title=f"Average {clean_label(y_var)} by {clean_label(x_var)}",
+                    category_orders=category_order,
+                    error_y="ci" if approximate else None,
+                )
+            # Default bar chart
+            else:
+                fig = px.bar(
+                    grouped,
+                    x=x_var,
+                    y=y_var,
+                    title=f"Average {clean_label(y_var)} by {clean_label(x_var)}",
+                    category_orders=category_order,
+                    error_y="ci" if approximate else None,
+                )
+            # Update hover template to remove underscores
+            fig.update_traces(
+                hovertemplate="<br>".join(
+                    [
+                        f"{clean_label(x_var)}: %{{x}}",
+                        f"{clean_label(y_var)}: %{{y:.2f}}",
+                        "<extra></extra>",
+                    ]
+                )
+            )
+            figures.plotly_chart(
+                fig,
+                ctx.figure_key(
+                    "explorer bars", x_var, y_var, show_gender_split, approximate
+                ),
+                use_container_width=True,
+            )
+            if approximate:
+                st.caption(
+                    f"Approximate: estimated from {int(grouped['n'].sum()):,} "
+                    "sampled respondents, with 95% intervals. Exact values "
+                    "replace them shortly."
+                )
+            note = suppression.note(grouped["suppressed"])
+            if note:
+                st.caption(note)
+
+        if progressive.enabled(len(df_filtered)):
+            progressive.render(
+                st.empty(),
+                (
+                    "explorer bars",
+                    ctx.store.version,
+                    ctx.filter_key,
+                    x_var,
+                    y_var,
+                    show_gender_split,
+                ),
+                lambda: suppression.group_means(df_filtered, keys, y_var),
+                lambda: ctx.estimate_means(y_var, keys),
+                bar_chart,
+            )
+        else:
+            bar_chart(suppression.group_means(df_filtered, keys, y_var), False)
+        return
+    # Create Histogram with optional gender split
+    else:
+        # For the histogram we use the selected X variable
+        hist_col = x_var
+        # Optional: category ordering for ordinal variables
+        category_order = None
+        if hist_col == "Age_Group":
+            category_order = {"Age_Group": AGE_GROUP_ORDER}
+        elif hist_col == "General_Health":
+            category_order = {"General_Health": HEALTH_ORDER}
+        elif hist_col == "Education":
+            category_order = {"Education": EDUCATION_ORDER}
+        elif hist_col == "Income_Group":
+            category_order = {"Income_Group": INCOME_ORDER}
+        elif hist_col == "Emotional_Support":
+            category_order = {"Emotional_Support": SUPPORT_ORDER}
+
+        # Bars of binned counts, so small cells can be suppressed
+        keys = [hist_col, "Gender"] if show_gender_split else [hist_col]
+        counts = (
+            df_filtered.dropna(subset=[hist_col])
+            .groupby(keys, observed=True)
+            .size()
+            .reset_index(name="Count")
+        )
+        counts = suppression.suppress(counts, "Count", totals=suppression.margins(keys))
+        fig = px.bar(
+            counts,
+            x=hist_col,
+            y="Count",
+            color="Gender" if show_gender_split else None,
+            barmode="group" if show_gender_split else None,
+            color_discrete_map={"Female": "#ff7f0e", "Male": "#1f77b4"}
+            if show_gender_split
+            else None,
+            title=f"Distribution of {clean_label(hist_col)}",
+            category_orders=category_order,
+        )
+        fig.update_layout(
+            xaxis_title=clean_label(hist_col),
+            yaxis_title="Count",
+            height=600,
+            hovermode="closest",
+        )
+        fig.update_traces(
+            hovertemplate=f"{clean_label(hist_col)}: %{{x}}<br>Count: %{{y}}"
+            "<extra></extra>"
+        )
+        figures.plotly_chart(
+            fig,
+            ctx.figure_key("explorer histogram", x_var, show_gender_split),
+            use_container_width=True,
+        )
+        note = suppression.note(counts["suppressed"])
+        if note:
+            st.caption(note)
+        return
+    figures.plotly_chart(
+        fig,
+        ctx.figure_key("explorer chart", chart_type, x_var, y_var, show_gender_split),
+        use_container_width=True,
+    )
+    note = suppression.note(hidden)
+    if note:
+        st.caption(note)
+
+
+def render(ctx):
+    """Render the Interactive Explorer page"""
+    st.markdown(
+        '<div class="sub-header">🔍 Interactive Data Explorer</div>',
+        unsafe_allow_html=True,
+    )
+
+    st.markdown("Create custom visualizations by selecting variables below.")
+
+    render_chart(ctx)
+    render_associations(ctx)
@@ -0,0 +1,354 @@
+"""
+Geographic Patterns page
+"""
+
+import functools
+
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from dashboard import (
+    figures,
+    hierarchy,
+    histograms,
+    metrics,
+    profiling,
+    progressive,
+    query,
+    standardize,
+    suppression,
+)
+
+DAYS = "Mental_Health_Days_Clean"
+
+RATE_TYPES = ["Crude", "Age-standardized"]
+
+GENDER_COLORS = {"Female": "#ff7f0e", "Male": "#1f77b4", "All": "#7f7f7f"}
+
+# Drilldown statistic -> table column label
+DRILLDOWN_COLUMNS = {
+    "n": "Respondents",
+    "Mean_Days": "Mean Days",
+    "Distress": "Distress (%)",
+}
+
+# Drilldown table prefix per tree level
+INDENT = {0: "", 1: "↳ ", 2: "\u2003\u2003↳ "}
+
+
+def state_means(ctx, by_gender=False, population=None):
+    """Per-state (or state x gender) mean days and counts for the selection
+
+    Crude means come from a query; with a standard `population` they are
+    directly age-standardized from the day-count cube instead, with each
+    cell's age coverage. Small cells are suppressed either way.
+    """
+    keys = ["State_Name", "Gender"] if by_gender else ["State_Name"]
+    if population is None:
+        return ctx.run_query(
+            query.Query({"mean": ("mean", DAYS), "count": ("count", DAYS)}, keys)
+        )
+
+    selections = dict(ctx.facets or {})
+    gender = metrics.POPULATIONS[ctx.gender_filter]
+    if gender:
+        selections["Gender"] = [gender]
+    cube = ctx.store.aggregate("day_histograms", histograms.build_cube, additive=True)
+    hist = standardize.cell_histograms(cube, selections, ctx.df_filtered)
+    weights = standardize.standard_weights(
+        cube, population, selections.get("Age_Group")
+    )
+    table = standardize.state_table(hist, weights, by_gender)
+    table = table.rename(columns={"standardized": "mean"})
+    table = table[[*keys, "mean", "count", "coverage"]]
+    return suppression.suppress(table, "count", ["mean"], suppression.margins(keys))
+
+
+@st.fragment
+@profiling.timed("state rankings")
+def render_rankings(ctx):
+    """State rankings; the crude/standardized controls rerun only these"""
+    gender_filter = ctx.gender_filter
+
+    col1, col2 = st.columns(2)
+    with col1:
+        rate_type = st.radio("Rates", RATE_TYPES, horizontal=True)
+    with col2:
+        population = st.selectbox(
+            "Standard population",
+            list(standardize.STANDARD_POPULATIONS),
+            disabled=rate_type == "Crude",
+            help="Age distribution every state's age-specific means are weighted by",
+        )
+    if rate_type == "Crude":
+        population = None
+        suffix = ""
+    else:
+        suffix = " (Age-Standardized)"
+        st.caption(
+            f"Each state's age-group means are weighted by the age distribution of "
+            f"{population.lower()} in the full dataset, so differences in age mix "
+            "between states no longer affect the ranking."
+        )
+
+    by_gender = gender_filter == "Compare Genders"
+    keys = ["State_Name", "Gender"] if by_gender else ["State_Name"]
+    draw = functools.partial(
+        draw_rankings,
+        by_gender=by_gender,
+        suffix=suffix,
+        key=ctx.figure_key("state rankings", population),
+    )
+    if population is None and progressive.enabled(len(ctx.df_filtered)):
+        # Crude means from the sample first; standardized ones are always fast
+        progressive.render(
+            st.empty(),
+            ("state rankings", ctx.store.version, ctx.filter_key, by_gender),
+            lambda: state_means(ctx, by_gender),
+            lambda: ctx.estimate_means(DAYS, keys).rename(columns={DAYS: "mean"}),
+            draw,
+        )
+    else:
+        draw(state_means(ctx, by_gender, population), False)
+
+
+def draw_rankings(stats, approximate, by_gender, suffix, key):
+    """State ranking charts from `state_means`, with error bars if approximate
+
+    `key` identifies the rankings for `figures.plotly_chart`. Standardized
+    means from cells below `standardize.MIN_COVERAGE` are left out.
+    """
+    low_coverage = []
+    if "coverage" in stats:
+        low = (stats["coverage"] < standardize.MIN_COVERAGE) & stats["mean"].notna()
+        low_coverage = sorted(set(stats.loc[low, "State_Name"]))
+        stats = stats.assign(mean=stats["mean"].mask(low))
+    if by_gender:
+        means = stats.pivot(index="State_Name", columns="Gender", values="mean")
+        state_comparison = (
+            metrics.compare_state_means(means)
+            .dropna(subset=["Difference (F-M)"])
+            .head(15)
+        )
+        errors = {}
+        if approximate:
+            errors = (
+                stats.pivot(index="State_Name", columns="Gender", values="se")
+                .reindex(state_comparison["State"])
+                .mul(progressive.Z_95)
+            )
+
+        fig = go.Figure()
+        fig.add_trace(
+            go.Bar(
+                name="Female",
+                x=state_comparison["State"],
+                y=state_comparison["Female"],
+                error_y={"array": errors["Female"]} if approximate else None,
+                marker_color="#ff7f0e",
+            )
+        )
+        fig.add_trace(
+            go.Bar(
+                name="Male",
+                x=state_comparison["State"],
+                y=state_comparison["Male"],
+                error_y={"array": errors["Male"]} if approximate else None,
+                marker_color="#1f77b4",
+            )
+        )
+
+        fig.update_layout(
+            title=f"Top 15 States by Gender Difference in Mental Health Days{suffix}",
+            barmode="group",
+            height=500,
+            xaxis_tickangle=-45,
+        )
+        fig.update_traces(
+            hovertemplate=("State: %{x}<br>Difference: %{y:.2f} days<extra></extra>")
+        )
+
+        figures.plotly_chart(fig, (*key, approximate), use_container_width=True)
+
+    else:
+        state_stats = stats.dropna(subset=["mean"]).sort_values("mean", ascending=False)
+        if approximate:
+            state_stats["ci"] = state_stats["se"] * progressive.Z_95
+
+        hover = "State: %{y}<br>Avg Days: %{x:.2f}"
+        if "coverage" in stats:
+            hover += "<br>Age coverage: %{customdata[0]:.0%}"
+        hover += "<extra></extra>"
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.markdown(f"#### 🔴 Highest Burden States (Top 10){suffix}")
+            top_states = state_stats.head(10)
+
+            fig = px.bar(
+                top_states,
+                x="mean",
+                y="State_Name",
+                orientation="h",
+                color="mean",
+                color_continuous_scale="Reds",
+                text="mean",
+                error_x="ci" if approximate else None,
+                custom_data=["coverage"] if "coverage" in stats else None,
+            )
+            # customize text and hover info for clarity
+            fig.update_traces(
+                texttemplate="%{x:.2f} days",
+                textposition="outside",
+                # custom hover
+                hovertemplate=hover,
+            )
+            fig.update_layout(height=450, showlegend=False)
+            figures.plotly_chart(
+                fig, (*key, approximate, "highest"), use_container_width=True
+            )
+
+        with col2:
+            st.markdown(f"#### 🟢 Lowest Burden States (Bottom 10){suffix}")
+            bottom_states = state_stats.tail(10).iloc[::-1]
+
+            fig = px.bar(
+                bottom_states,
+                x="mean",
+                y="State_Name",
+                orientation="h",
+                color="mean",
+                color_continuous_scale="Greens_r",
+                text="mean",
+                error_x="ci" if approximate else None,
+                custom_data=["coverage"] if "coverage" in stats else None,
+            )
+            # customize text and hover info for clarity
+            fig.update_traces(
+                texttemplate="%{x:.2f} days",
+                textposition="outside",
+                # custom hover
+                hovertemplate=hover,
+            )
+            fig.update_layout(height=450, showlegend=False)
+            figures.plotly_chart(
+                fig, (*key, approximate, "lowest"), use_container_width=True
+            )
+
+    if approximate:
+        st.caption(
+            f"Approximate: estimated from {int(stats['n'].sum()):,} sampled "
+            "respondents, with 95% intervals. Exact values replace them shortly."
+        )
+    if low_coverage:
+        st.caption(
+            f"Not ranked: {', '.join(low_coverage)}. Their respondents cover "
+            f"less than {standardize.MIN_COVERAGE:.0%} of the standard "
+            "population's age distribution, so the standardized mean would "
+            "rest on too few age groups."
+        )
+    note = suppression.note(stats["suppressed"])
+    if note:
+        st.caption(note)
+
+
+def area_tree(ctx):
+    """Metro/urban aggregate tree for the sidebar facets (both genders)"""
+    selections = dict(ctx.facets or {})
+    if hierarchy.covers(selections):
+        tree = ctx.store.aggregate("area_tree", hierarchy.build_tree, additive=True)
+    else:
+        tree = hierarchy.build_tree(ctx.df_selection())
+    if "State_Name" in selections:
+        tree = hierarchy.restrict(tree, selections["State_Name"])
+    return tree
+
+
+@st.fragment
+@profiling.timed("area drilldown")
+def render_drilldown(ctx):
+    """State -> metro status -> urban/rural breakdown; the state picker reruns it"""
+    st.markdown("### Metro and Urban/Rural Drilldown")
+    st.markdown("""
+    Each state split by whether respondents live in a metropolitan county, then
+    by urban (including micropolitan) or rural county. Every row is an exact
+    total of the rows nested under it.
+    """)
+
+    tree = area_tree(ctx)
+    choice = st.selectbox("State", ["All states", *hierarchy.states(tree)])
+    population = metrics.POPULATIONS[ctx.gender_filter]
+    genders = (population,) if population else ("All", "Female", "Male")
+    rows = hierarchy.suppress(
+        hierarchy.drilldown(tree, None if choice == "All states" else choice, genders)
+    )
+
+    # Chart labels need the parent to tell e.g. the two "Urban" rows apart
+    paths, parent = [], None
+    for level, area in zip(rows["Level"], rows["Area"]):
+        if level == 1:
+            parent = area
+        paths.append(f"{parent} › {area}" if level == 2 else area)
+    rows["Path"] = paths
+    rows["Area"] = [
+        INDENT[level] + area for level, area in zip(rows["Level"], rows["Area"])
+    ]
+    rows["node"] = rows.index // len(genders)
+    table = rows.pivot(
+        index=["node", "Area"],
+        columns="Gender",
+        values=["n", "Mean_Days", "Distress"],
+    ).reindex(columns=list(genders), level="Gender")
+    table.columns = [
+        label if gender == "All" or population else f"{gender} {label}"
+        for label, gender in (
+            (DRILLDOWN_COLUMNS[stat], gender) for stat, gender in table.columns
+        )
+    ]
+    table = table.reset_index(level="node", drop=True).reset_index()
+    st.dataframe(
+        table.style.format(
+            {
+                column: "{:,.0f}" if column.endswith("Respondents") else "{:.1f}"
+                for column in table.columns[1:]
+            },
+            na_rep="–",
+        ),
+        hide_index=True,
+        use_container_width=True,
+    )
+    note = suppression.note(rows["suppressed"])
+    if note:
+        st.caption(note)
+
+    children = rows[(rows["Level"] > 0) & (rows["Gender"] != "All")]
+    if children.empty:
+        children = rows[rows["Level"] > 0]
+    fig = px.bar(
+        children,
+        x="Path",
+        y="Mean_Days",
+        color="Gender",
+        barmode="group",
+        title=f"Mean Poor Mental Health Days by Area: {choice}",
+        labels={"Mean_Days": "Mental Health Days", "Path": ""},
+        hover_data={"n": True, "Distress": ":.1f"},
+        color_discrete_map=GENDER_COLORS,
+    )
+    fig.update_layout(height=400)
+    figures.plotly_chart(
+        fig, ctx.figure_key("area drilldown", choice), use_container_width=True
+    )
+
+
+def render(ctx):
+    """Render the Geographic Patterns page"""
+    st.markdown(
+        '<div class="sub-header">Geographic Mental Health Disparities</div>',
+        unsafe_allow_html=True,
+    )
+
+    render_rankings(ctx)
+    render_drilldown(ctx)
@@ -0,0 +1,248 @@
+"""
+Key Insights page
+"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from dashboard import metrics, stats, suppression
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def tested_disparities(version, filter_key, _df_selection, _df_filtered):
+    """Gender tests on the state/age selection and protective-factor tests"""
+    return (
+        stats.gender_disparity_tests(_df_selection),
+        stats.contrast_tests(_df_filtered),
+    )
+
+
+def suppress_disparities(disparities):
+    """Disparity rows with small state x gender cells and their tests hidden
+
+    Returns the rows and the state x gender suppression mask. The "All" rows
+    are the published per-gender totals over states.
+    """
+    by_state = disparities[
+        (disparities["Metric"] == "Depression (%)") & (disparities["State"] != "All")
+    ]
+    hidden = suppression.hide_grid(
+        by_state[["n_Female", "n_Male"]].to_numpy(), axes=(0, 1)
+    )
+    cells = pd.DataFrame(hidden, index=by_state["State"], columns=["Female", "Male"])
+    cells = cells.reindex(disparities["State"], fill_value=False)
+    disparities = disparities.copy()
+    for gender in cells.columns:
+        rows = cells[gender].to_numpy()
+        disparities.loc[rows, [gender, f"n_{gender}"]] = np.nan
+    either = cells.any(axis=1).to_numpy()
+    disparities.loc[either, ["Ratio", "p", "p_weighted", "q"]] = np.nan
+    disparities["Significant"] = disparities["Significant"] & ~either
+    return disparities, hidden
+
+
+def render(ctx):
+    """Render the Key Insights page"""
+    df_filtered = ctx.df_filtered
+    gender_filter = ctx.gender_filter
+
+    # Both genders under the sidebar facets, so comparisons follow the sidebar
+    df_selection = ctx.df_selection()
+    disparities, contrasts = tested_disparities(
+        ctx.store.version, ctx.filter_key, df_selection, df_filtered
+    )
+    st.markdown(
+        '<div class="sub-header">Key Research Insights</div>', unsafe_allow_html=True
+    )
+    if disparities.empty:
+        st.info("No respondents match the current filters.")
+        return
+
+    overall = disparities[disparities["State"] == "All"].set_index("Metric")
+    depression_test = overall.loc["Depression (%)"]
+    distress_test = overall.loc["Frequent Distress (%)"]
+    days_test = overall.loc["Avg Mental Health Days"]
+
+    # Calculate statistics based on current filter
+    col1, col2 = st.columns(2)
+
+    # Calculate key metrics from current filtered data
+    current_depression = metrics.depression_rate(df_filtered)
+    current_distress = metrics.distress_rate(df_filtered)
+    current_uninsured = metrics.uninsured_rate(df_filtered)
+    current_cost = metrics.cost_barrier_rate(df_filtered)
+    current_avg_days = metrics.avg_mental_health_days(df_filtered)
+
+    # Get comparison metrics
+    female_depression = depression_test["Female"]
+    male_depression = depression_test["Male"]
+    depression_note = stats.format_p(depression_test["q"])
+
+    with col1:
+        if gender_filter == "Female Veterans Only":
+            st.markdown(
+                f"""
+            <div class="warning-box">
+            <h4>🔴 Critical Findings - Female Veterans</h4>
+            <ul>
+            <li><strong>Depression Rate:</strong> {current_depression:.1f}% (vs {male_depression:.1f}% in males = {depression_test["Ratio"]:.1f}x, {depression_note})</li>
+            <li><strong>Frequent Mental Distress:</strong> {current_distress:.1f}% experience ≥14 days/month</li>
+            <li><strong>Average Mental Health Days:</strong> {current_avg_days:.1f} days per month</li>
+            <li><strong>Uninsured:</strong> {current_uninsured:.1f}%</li>
+            <li><strong>Cost Barriers:</strong> {current_cost:.1f}% report barriers to care</li>
+            </ul>
+            </div>
+            """,
+                unsafe_allow_html=True,
+            )
+
+        elif gender_filter == "Male Veterans Only":
+            st.markdown(
+                f"""
+            <div class="insight-box">
+            <h4>🔵 Key Findings - Male Veterans</h4>
+            <ul>
+            <li><strong>Depression Rate:</strong> {current_depression:.1f}% (vs {female_depression:.1f}% in females, {depression_note})</li>
+            <li><strong>Frequent Mental Distress:</strong> {current_distress:.1f}% experience ≥14 days/month</li>
+            <li><strong>Average Mental Health Days:</strong> {current_avg_days:.1f} days per month</li>
+            <li><strong>Uninsured:</strong> {current_uninsured:.1f}%</li>
+            <li><strong>Cost Barriers:</strong> {current_cost:.1f}% report barriers to care</li>
+            </ul>
+            </div>
+            """,
+                unsafe_allow_html=True,
+            )
+
+        elif gender_filter == "All Veterans":
+            st.markdown(
+                f"""
+            <div class="insight-box">
+            <h4> Key Findings - All Veterans</h4>
+            <ul>
+            <li><strong>Overall Depression Rate:</strong> {current_depression:.1f}%</li>
+            <li><strong>Female vs Male:</strong> {female_depression:.1f}% vs {male_depression:.1f}% ({depression_test["Ratio"]:.1f}x ratio, {depression_note})</li>
+            <li><strong>Frequent Mental Distress:</strong> {current_distress:.1f}% experience ≥14 days/month</li>
+            <li><strong>Average Mental Health Days:</strong> {current_avg_days:.1f} days per month</li>
+            <li><strong>Total Sample:</strong> {len(df_filtered):,} veterans</li>
+            </ul>
+            </div>
+            """,
+                unsafe_allow_html=True,
+            )
+
+        else:  # Compare Genders
+            st.markdown(
+                f"""
+            <div class="warning-box">
+            <h4>⚖️ Gender Comparison - Key Disparities</h4>
+            <ul>
+            <li><strong>Depression:</strong> Female {female_depression:.1f}% vs Male {male_depression:.1f}% 
+                <span style="color: red;">({depression_test["Ratio"]:.2f}x, {depression_note})</span></li>
+            <li><strong>Frequent Distress:</strong> Female {distress_test["Female"]:.1f}% vs Male {distress_test["Male"]:.1f}% 
+                <span style="color: red;">({distress_test["Ratio"]:.2f}x, {stats.format_p(distress_test["q"])})</span></li>
+            <li><strong>Avg Mental Health Days:</strong> Female {days_test["Female"]:.1f} vs Male {days_test["Male"]:.1f} days ({stats.format_p(days_test["q"])})</li>
+            <li><strong>Sample Sizes:</strong> {depression_test["n_Female"]:,.0f} female, {depression_test["n_Male"]:,.0f} male</li>
+            </ul>
+            </div>
+            """,
+                unsafe_allow_html=True,
+            )
+
+    with col2:
+        # Frequent distress in the exposed group relative to the protected one
+        protective = contrasts[contrasts["Metric"] == "Frequent Distress (%)"]
+        items = "".join(
+            f"<li><strong>{row.Contrast}:</strong> {row.A:.1f}% vs {row.B:.1f}% "
+            f"frequent distress ({row.Ratio:.1f}x, {stats.format_p(row.q)})</li>"
+            for row in protective.itertuples()
+        )
+        st.markdown(
+            f"""
+        <div class="success-box">
+        <h4> Protective Factors Identified</h4>
+        <ul>{items}</ul>
+        <small>Least vs most protected group, e.g. support "never" vs "always"
+        available; q-values are Benjamini-Hochberg adjusted.</small>
+        </div>
+        """,
+            unsafe_allow_html=True,
+        )
+
+    with st.expander("Significance of female vs male differences by state"):
+        st.caption(
+            "Two-proportion z-tests for rates and Welch t-tests for mean days, "
+            "with Benjamini-Hochberg correction across every state x metric "
+            "comparison. p (weighted) is a chi-square on survey-weighted rates "
+            "using Kish effective sample sizes."
+        )
+        shown, hidden = suppress_disparities(disparities)
+        st.dataframe(
+            shown[
+                [
+                    "State",
+                    "Metric",
+                    "Female",
+                    "Male",
+                    "Ratio",
+                    "n_Female",
+                    "n_Male",
+                    "p",
+                    "p_weighted",
+                    "q",
+                    "Significant",
+                ]
+            ]
+            .rename(columns={"p_weighted": "p (weighted)"})
+            .sort_values(["q", "State"]),
+            hide_index=True,
+            use_container_width=True,
+        )
+        note = suppression.note(hidden)
+        if note:
+            st.caption(note)
+
+    # Quantitative insights section
+    st.markdown("### Key Statistics from Current Selection")
+
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric("Sample Size", f"{len(df_filtered):,}", f"{gender_filter.split()[0]}")
+
+    with col2:
+        st.metric(
+            "Depression Rate",
+            f"{current_depression:.1f}%",
+            f"{current_distress:.1f}% frequent distress",
+        )
+
+    with col3:
+        st.metric("Avg Mental Health Days", f"{current_avg_days:.1f}", "days per month")
+
+    with col4:
+        states_in_sample = df_filtered["State_Name"].nunique()
+        st.metric("Geographic Coverage", f"{states_in_sample}", "states/territories")
+
+    # Data quality metrics
+    st.markdown("### Analysis Overview")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("""
+        **Dataset Characteristics:**
+        - Source: CDC BRFSS 2024
+        - Survey Variables: 303 features
+        - Mental Health Focus: Primary outcome
+        - Comparison: Female vs Male veterans
+        """)
+
+    with col2:
+        st.markdown("""
+        **Key Analyses Performed:**
+        - Socioeconomic gradient analysis
+        - Geographic disparity assessment  
+        - Protective factor identification
+        - Predictive modeling (87% accuracy)
+        """)
@@ -0,0 +1,119 @@
+"""
+Intersectional Analysis page
+"""
+
+import plotly.express as px
+import streamlit as st
+
+from dashboard import figures, intersections, metrics, profiling, suppression
+
+# Radio label -> race/ethnicity column
+RACE_CODINGS = {
+    "Imputed (6 groups)": "_IMPRACE",
+    "Detailed (8 groups)": "_RACE",
+    "Grouped (5 groups)": "_RACEGR3",
+    "Hispanic origin": "_HISPANC",
+}
+
+MEASURES = {"Frequent distress": "Distress", "Depression": "Depression"}
+
+AGE_GROUPINGS = ["Broad bands", "5-year groups"]
+
+
+def race_table(ctx, race, bands):
+    """Race x gender x age rates for the selection, small cells suppressed"""
+    selections = dict(ctx.facets or {})
+    population = metrics.POPULATIONS[ctx.gender_filter]
+    if population:
+        selections["Gender"] = [population]
+    keys = [race, "Gender", "Age_Group"]
+    if intersections.covers(selections):
+        cube = ctx.store.aggregate(
+            "intersections", intersections.build_cube, additive=True
+        )
+        table = intersections.table(cube, keys, selections, bands)
+    else:
+        cube = intersections.build_cube(ctx.df_filtered)
+        table = intersections.table(cube, keys, bands=bands)
+    return suppression.suppress(
+        table, "n", list(MEASURES.values()), suppression.margins(keys)
+    )
+
+
+@st.fragment
+@profiling.timed("intersections")
+def render_grid(ctx):
+    """Race x age heatmaps per gender; the coding and measure controls rerun this"""
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        coding = st.selectbox("Race/ethnicity coding", list(RACE_CODINGS))
+    with col2:
+        measure = st.radio("Measure", list(MEASURES), horizontal=True)
+    with col3:
+        grouping = st.radio("Age", AGE_GROUPINGS, horizontal=True)
+
+    race = RACE_CODINGS[coding]
+    bands = (
+        {"Age_Group": intersections.AGE_BANDS} if grouping == "Broad bands" else None
+    )
+    table = race_table(ctx, race, bands)
+    column = MEASURES[measure]
+
+    genders = [g for g in ("Female", "Male") if (table["Gender"] == g).any()]
+    for gender, col in zip(genders, st.columns(len(genders) or 1)):
+        grid = (
+            table[table["Gender"] == gender]
+            .pivot(index=race, columns="Age_Group", values=column)
+            .reindex(
+                index=intersections.levels(race),
+                columns=intersections.levels("Age_Group", bands),
+            )
+            .dropna(how="all")
+            .dropna(axis=1, how="all")
+        )
+        fig = px.imshow(
+            grid,
+            text_auto=".0f",
+            color_continuous_scale="Reds",
+            aspect="auto",
+            labels={"color": f"{measure} (%)", "x": "Age Group", "y": ""},
+            title=f"{gender} Veterans: {measure} (%)",
+        )
+        fig.update_layout(height=120 + 45 * len(grid))
+        with col:
+            figures.plotly_chart(
+                fig,
+                ctx.figure_key("intersections", race, column, grouping, gender),
+                use_container_width=True,
+            )
+
+    note = suppression.note(table["suppressed"])
+    if note:
+        st.caption(note + " Hidden cells are blank.")
+
+    with st.expander("Table"):
+        st.dataframe(
+            table.drop(columns="suppressed").style.format(
+                {"n": "{:,.0f}", "Distress": "{:.1f}", "Depression": "{:.1f}"},
+                na_rep="–",
+            ),
+            hide_index=True,
+            use_container_width=True,
+        )
+
+
+def render(ctx):
+    """Render the Intersectional Analysis page"""
+    st.markdown(
+        '<div class="sub-header">Race/Ethnicity, Gender and Age</div>',
+        unsafe_allow_html=True,
+    )
+    st.markdown(
+        "Frequent mental distress (14+ poor mental health days) and depression "
+        "rates for every combination of race/ethnicity, gender and age group. "
+        "Groups other than Hispanic are non-Hispanic. Combinations with few "
+        "respondents are hidden, together with any that would let them be "
+        "worked out from the rest."
+    )
+
+    render_grid(ctx)
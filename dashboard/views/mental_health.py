@@ -0,0 +1,142 @@
+"""
+Mental Health Analysis page
+"""
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from dashboard import figures, suppression
+
+DAYS = "Mental_Health_Days_Clean"
+
+
+def render(ctx):
+    """Render the Mental Health Analysis page"""
+    df_filtered = ctx.df_filtered
+    gender_filter = ctx.gender_filter
+
+    st.markdown(
+        '<div class="sub-header">Comprehensive Mental Health Analysis</div>',
+        unsafe_allow_html=True,
+    )
+
+    # Socioeconomic analysis
+    st.markdown("### Socioeconomic Impact")
+
+    income_order = ["<$15k", "$15-25k", "$25-35k", "$35-50k", "$50-75k", ">$75k"]
+
+    if gender_filter == "Compare Genders":
+        income_stats = suppression.group_means(
+            df_filtered, ["Income_Group", "Gender"], DAYS
+        )
+        income_stats = income_stats[income_stats["Income_Group"].isin(income_order)]
+
+        fig = px.bar(
+            income_stats,
+            x="Income_Group",
+            y="Mental_Health_Days_Clean",
+            color="Gender",
+            title="Mental Health Days by Income Level (by Gender)",
+            barmode="group",
+            category_orders={"Income_Group": income_order},
+            color_discrete_map={"Female": "#ff7f0e", "Male": "#1f77b4"},
+        )
+    else:
+        income_stats = suppression.group_means(
+            df_filtered, ["Income_Group"], DAYS
+        ).rename(columns={DAYS: "mean"})
+        income_stats = income_stats[income_stats["Income_Group"].isin(income_order)]
+        income_stats["Income_Group"] = pd.Categorical(
+            income_stats["Income_Group"], categories=income_order, ordered=True
+        )
+        income_stats = income_stats.sort_values("Income_Group")
+
+        fig = go.Figure()
+        fig.add_trace(
+            go.Bar(
+                x=income_stats["Income_Group"],
+                y=income_stats["mean"],
+                marker_color=income_stats["mean"],
+                marker_colorscale="Reds",
+                text=income_stats["mean"].round(1),
+                texttemplate="%{text} days",
+                textposition="outside",
+            )
+        )
+        fig.update_layout(title="Mental Health Days by Income Level")
+
+    fig.update_layout(
+        xaxis_title="Annual Income",
+        yaxis_title="Average Poor Mental Health Days",
+        height=450,
+    )
+    figures.plotly_chart(
+        fig, ctx.figure_key("days by income"), use_container_width=True
+    )
+    note = suppression.note(income_stats["suppressed"])
+    if note:
+        st.caption(note)
+
+    # Social support
+    st.markdown("### Social Support Impact")
+
+    support_order = ["Always", "Usually", "Sometimes", "Rarely", "Never"]
+
+    if gender_filter == "Compare Genders":
+        support_stats = suppression.group_means(
+            df_filtered, ["Emotional_Support", "Gender"], DAYS
+        )
+        support_stats = support_stats[
+            support_stats["Emotional_Support"].isin(support_order)
+        ]
+
+        fig = px.line(
+            support_stats,
+            x="Emotional_Support",
+            y="Mental_Health_Days_Clean",
+            color="Gender",
+            title="Impact of Emotional Support (by Gender)",
+            markers=True,
+            category_orders={"Emotional_Support": support_order},
+            color_discrete_map={"Female": "#ff7f0e", "Male": "#1f77b4"},
+        )
+    else:
+        support_stats = suppression.group_means(
+            df_filtered, ["Emotional_Support"], DAYS
+        )
+        support_stats = support_stats[
+            support_stats["Emotional_Support"].isin(support_order)
+        ]
+        support_stats["Emotional_Support"] = pd.Categorical(
+            support_stats["Emotional_Support"], categories=support_order, ordered=True
+        )
+        support_stats = support_stats.sort_values("Emotional_Support")
+
+        fig = go.Figure()
+        fig.add_trace(
+            go.Scatter(
+                x=support_stats["Emotional_Support"],
+                y=support_stats["Mental_Health_Days_Clean"],
+                mode="lines+markers",
+                line=dict(color="#2ca02c", width=4),
+                marker=dict(size=15),
+                text=support_stats["Mental_Health_Days_Clean"].round(1),
+                textposition="top center",
+                texttemplate="%{text} days",
+            )
+        )
+        fig.update_layout(title="Impact of Emotional Support on Mental Health")
+
+    fig.update_layout(
+        xaxis_title="Emotional Support Availability",
+        yaxis_title="Average Poor Mental Health Days",
+        height=400,
+    )
+    figures.plotly_chart(
+        fig, ctx.figure_key("days by support"), use_container_width=True
+    )
+    note = suppression.note(support_stats["suppressed"])
+    if note:
+        st.caption(note)
@@ -0,0 +1,454 @@
+"""
+Executive Overview page
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from dashboard import figures, histograms, matching, metrics, profiling, suppression
+from dashboard.constants import (
+    AGE_GROUP_ORDER,
+)
+
+GENDER_COLORS = {"Female": "#ff7f0e", "Male": "#1f77b4"}
+
+COMPARISONS = ["Raw", "Propensity-matched"]
+
+
+def day_histograms(ctx, by=()):
+    """Mental health day histograms for the selection, from the cube if possible"""
+    selections = dict(ctx.facets or {})
+    population = metrics.POPULATIONS[ctx.gender_filter]
+    if population:
+        selections["Gender"] = [population]
+    if histograms.covers(selections):
+        cube = ctx.store.aggregate(
+            "day_histograms", histograms.build_cube, additive=True
+        )
+        return histograms.select(cube, "mental", selections, by)
+    return histograms.from_rows(ctx.df_filtered, "mental", by)
+
+
+def gender_comparison(ctx, threshold):
+    """Raw female vs male comparison, with day metrics from the histograms"""
+    comparison = metrics.gender_comparison(ctx.df_filtered)
+    by_gender = day_histograms(ctx, by=("Gender",))[: len(GENDER_COLORS)]
+    genders = ["Female Veterans", "Male Veterans"]
+    days = comparison["Metric"] == "Avg Mental Health Days"
+    distress = comparison["Metric"] == "Frequent Distress (%)"
+    comparison.loc[days, genders] = [histograms.mean(by_gender)]
+    comparison.loc[distress, genders] = [histograms.rate_at_least(by_gender, threshold)]
+    comparison["Ratio (F/M)"] = (
+        comparison["Female Veterans"] / comparison["Male Veterans"]
+    )
+    if threshold != metrics.DISTRESS_THRESHOLD:
+        comparison.loc[distress, "Metric"] = f"Distress ≥{threshold} days (%)"
+    return comparison
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def matched_comparison(version, filter_key, threshold, _store, _rows):
+    """Matched comparison for the selection; the design is built once per version"""
+    design = _store.aggregate("propensity_design", matching.build_design)
+    return matching.matched_comparison(_store.frame, design, _rows, threshold)
+
+
+def render_balance(result):
+    """Caption and covariate balance table of a matched comparison"""
+    st.caption(
+        f"{result['pairs']:,} female veterans matched to {result['distinct_males']:,} "
+        f"male veterans (with replacement) on age, income, employment and "
+        f"insurance; {result['unmatched']:,} without a male within the caliper "
+        f"were left out."
+    )
+    with st.expander("⚖️ Covariate balance"):
+        st.markdown(
+            "Standardized mean differences of each covariate level between female "
+            "and male veterans, before and after matching. Differences below 0.1 "
+            "are conventionally taken as balanced."
+        )
+        st.dataframe(
+            result["balance"].style.format({"Before": "{:+.3f}", "After": "{:+.3f}"}),
+            hide_index=True,
+            use_container_width=True,
+        )
+
+
+@st.fragment
+@profiling.timed("overview metrics")
+def render_metrics(ctx):
+    """Headline metrics and distributions; the threshold slider reruns only these"""
+    df_all = ctx.df_all
+    df_filtered = ctx.df_filtered
+    gender_filter = ctx.gender_filter
+
+    # Distress metrics all come from the day-count histograms
+    threshold = st.slider(
+        "Distress threshold (poor mental health days per month)",
+        min_value=1,
+        max_value=histograms.MAX_DAYS,
+        value=metrics.DISTRESS_THRESHOLD,
+        help="The CDC definition of frequent mental distress is 14 or more days",
+    )
+    hist = day_histograms(ctx)
+
+    # Key metrics
+    col1, col2, col3, col4, col5 = st.columns(5)
+
+    with col1:
+        st.metric("Total Sample", f"{len(df_filtered):,}", "Veterans")
+
+    with col2:
+        depression_rate = metrics.depression_rate(df_filtered)
+        if gender_filter == "Female Veterans Only":
+            male_rate = metrics.depression_rate(df_all[df_all["Gender"] == "Male"])
+            delta = f"{depression_rate - male_rate:+.1f}% vs Males"
+        elif gender_filter == "Male Veterans Only":
+            female_rate = metrics.depression_rate(df_all[df_all["Gender"] == "Female"])
+            delta = f"{depression_rate - female_rate:+.1f}% vs Females"
+        else:
+            delta = None
+        st.metric(
+            "Depression Rate", f"{depression_rate:.1f}%", delta, delta_color="inverse"
+        )
+
+    with col3:
+        avg_mental = histograms.mean(hist)
+        st.metric(
+            "Avg Mental Health Days",
+            f"{avg_mental:.1f}",
+            f"median {histograms.quantile(hist, 0.5):g}, "
+            f"90th pct {histograms.quantile(hist, 0.9):g}",
+            delta_color="off",
+        )
+
+    with col4:
+        freq_distress = histograms.rate_at_least(hist, threshold)
+        st.metric(
+            "Frequent Distress",
+            f"{freq_distress:.1f}%",
+            f"≥{threshold} days/month",
+            delta_color="inverse",
+        )
+
+    with col5:
+        no_insurance = metrics.uninsured_rate(df_filtered)
+        st.metric("Uninsured", f"{no_insurance:.1f}%", delta_color="inverse")
+
+    st.markdown("---")
+
+    # Gender comparison or single gender analysis
+    if gender_filter == "Compare Genders":
+        st.markdown("### Female vs Male Comparison")
+
+        mode = st.radio(
+            "Comparison",
+            COMPARISONS,
+            horizontal=True,
+            help="Propensity-matched compares each female veteran with the most "
+            "similar male veteran on age, income, employment and insurance",
+        )
+        comparison_data = gender_comparison(ctx, threshold)
+        if mode == "Propensity-matched":
+            rows = ctx.store.frame.index.get_indexer(df_filtered.index)
+            result = matched_comparison(
+                ctx.store.version, ctx.filter_key, threshold, ctx.store, rows
+            )
+            if result is None:
+                st.info(
+                    "Too few female and male veterans in this selection to match; "
+                    "showing the raw comparison."
+                )
+            else:
+                table = result["table"]
+                comparison_data = pd.DataFrame(
+                    {
+                        "Metric": table["Metric"],
+                        "Female Veterans": table["Matched Female Veterans"],
+                        "Male Veterans": table["Matched Male Veterans"],
+                        "Ratio (F/M)": table["Matched Ratio (F/M)"],
+                    }
+                )
+                render_balance(result)
+
+        fig = go.Figure()
+        fig.add_trace(
+            go.Bar(
+                name="Female Veterans",
+                x=comparison_data["Metric"],
+                y=comparison_data["Female Veterans"],
+                marker_color="#ff7f0e",
+                text=comparison_data["Female Veterans"].round(1),
+                textposition="outside",
+            )
+        )
+        fig.add_trace(
+            go.Bar(
+                name="Male Veterans",
+                x=comparison_data["Metric"],
+                y=comparison_data["Male Veterans"],
+                marker_color="#1f77b4",
+                text=comparison_data["Male Veterans"].round(1),
+                textposition="outside",
+            )
+        )
+
+        fig.update_layout(
+            title="Key Metrics: Female vs Male Veterans",
+            barmode="group",
+            height=450,
+            yaxis_title="Value",
+        )
+        figures.plotly_chart(
+            fig,
+            ctx.figure_key("gender comparison", mode, threshold),
+            use_container_width=True,
+        )
+
+        # Ratio metrics
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric(
+                "Depression Ratio",
+                f"{comparison_data.iloc[0]['Ratio (F/M)']:.2f}x",
+                "F/M",
+            )
+        with col2:
+            st.metric(
+                "Mental Health Days Ratio",
+                f"{comparison_data.iloc[1]['Ratio (F/M)']:.2f}x",
+                "F/M",
+            )
+        with col3:
+            st.metric(
+                "Frequent Distress Ratio",
+                f"{comparison_data.iloc[2]['Ratio (F/M)']:.2f}x",
+                "F/M",
+            )
+        with col4:
+            st.metric(
+                "Uninsured Ratio",
+                f"{comparison_data.iloc[3]['Ratio (F/M)']:.2f}x",
+                "F/M",
+            )
+
+    # Distribution analysis
+    st.markdown("### Mental Health Distribution")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        days = list(range(histograms.MAX_DAYS + 1))
+        fig = go.Figure()
+        if gender_filter == "Compare Genders":
+            genders = histograms.DIMENSIONS["Gender"]
+            by_gender = day_histograms(ctx, by=("Gender",))[: len(genders)]
+            # Day x gender counts; stacked bars show each day's total too
+            day_counts = by_gender[:, : histograms.MISSING].T
+            hidden_days = suppression.hide_grid(day_counts, axes=(0, 1))
+            day_counts = np.where(hidden_days, np.nan, day_counts)
+            for gender, counts in zip(genders, day_counts.T):
+                fig.add_trace(
+                    go.Bar(
+                        name=gender,
+                        x=days,
+                        y=counts,
+                        marker_color=GENDER_COLORS[gender],
+                    )
+                )
+            fig.update_layout(
+                title="Mental Health Days Distribution by Gender",
+                barmode="stack",
+                legend_title_text="Gender",
+            )
+        else:
+            day_counts = hist[: histograms.MISSING, None]
+            hidden_days = suppression.hide_grid(day_counts, axes=(0,))
+            fig.add_trace(
+                go.Bar(
+                    x=days,
+                    y=np.where(hidden_days, np.nan, day_counts)[:, 0],
+                    marker_color="#1f77b4"
+                    if gender_filter == "Male Veterans Only"
+                    else "#ff7f0e",
+                    showlegend=False,
+                )
+            )
+            fig.update_layout(title="Distribution of Poor Mental Health Days")
+            fig.add_vline(
+                x=avg_mental,
+                line_dash="dash",
+                line_color="red",
+                annotation_text=f"Mean: {avg_mental:.1f}",
+                annotation_position="top left",
+            )
+
+        fig.add_vline(
+            x=threshold,
+            line_dash="dot",
+            line_color="orange",
+            annotation_text=(
+                "CDC Threshold"
+                if threshold == metrics.DISTRESS_THRESHOLD
+                else f"≥{threshold} days"
+            ),
+            annotation_position="top right",
+        )
+        fig.update_layout(
+            height=400,
+            bargap=0.1,
+            xaxis_title="Mental Health Days",
+            yaxis_title="count",
+        )
+        figures.plotly_chart(
+            fig, ctx.figure_key("day distribution", threshold), use_container_width=True
+        )
+        note = suppression.note(hidden_days)
+        if note:
+            st.caption(note)
+
+    with col2:
+        # Age group analysis
+        if gender_filter == "Compare Genders":
+            by_age = day_histograms(ctx, by=("Age_Group", "Gender"))
+            hidden = suppression.hide_grid(histograms.respondents(by_age), axes=(0, 1))
+            age_stats = pd.DataFrame(
+                np.where(hidden, np.nan, histograms.mean(by_age)),
+                index=pd.Index(histograms.DIMENSIONS["Age_Group"], name="Age_Group"),
+                columns=pd.Index(histograms.DIMENSIONS["Gender"], name="Gender"),
+            )
+            age_stats = (
+                age_stats.stack()
+                .rename("Mental_Health_Days_Clean")
+                .reset_index()
+                .dropna()
+            )
+
+            fig = px.line(
+                age_stats,
+                x="Age_Group",
+                y="Mental_Health_Days_Clean",
+                color="Gender",
+                title="Mental Health Days by Age Group and Gender",
+                labels={
+                    "Age_Group": "Age Group",
+                    "Mental_Health_Days_Clean": "Mental Health Days",
+                    "Gender": "Gender",
+                },
+                markers=True,
+                color_discrete_map={"Female": "#ff7f0e", "Male": "#1f77b4"},
+                category_orders={"Age_Group": AGE_GROUP_ORDER},
+            )
+            # Customize hover template for clarity
+            fig.update_traces(
+                hovertemplate="Gender: %{fullData.name}<br>"
+                "Age Group: %{x}<br>"
+                "Mental Health Days: %{y:.2f}<extra></extra>"
+            )
+        else:
+            by_age = day_histograms(ctx, by=("Age_Group",))
+            counts = histograms.respondents(by_age)[:, None]
+            hidden = suppression.hide_grid(counts, axes=(0,))[:, 0]
+            age_stats = pd.DataFrame(
+                {
+                    "Age_Group": histograms.DIMENSIONS["Age_Group"],
+                    "Mental_Health_Days_Clean": np.where(
+                        hidden, np.nan, histograms.mean(by_age)
+                    ),
+                }
+            ).dropna()
+
+            fig = px.line(
+                age_stats,
+                x="Age_Group",
+                y="Mental_Health_Days_Clean",
+                title="Mental Health Days by Age Group",
+                labels={
+                    "Age_Group": "Age Group",
+                    "Mental_Health_Days_Clean": "Mental Health Days",
+                },
+                markers=True,
+                category_orders={"Age_Group": AGE_GROUP_ORDER},
+            )
+            # Customize hover template for clarity rounding to 2 decimals
+            fig.update_traces(
+                hovertemplate="Age Group: %{x}<br>"
+                "Mental Health Days: %{y:.2f}<extra></extra>"
+            )
+        fig.update_layout(height=400)
+        figures.plotly_chart(
+            fig, ctx.figure_key("days by age"), use_container_width=True
+        )
+        note = suppression.note(hidden)
+        if note:
+            st.caption(note)
+
+
+def render(ctx):
+    """Render the Executive Overview page"""
+    gender_filter = ctx.gender_filter
+    dataset = ctx.manifest
+
+    st.markdown(
+        '<div class="sub-header">Executive Dashboard</div>', unsafe_allow_html=True
+    )
+
+    # Dashboard description
+    st.markdown(
+        f"""
+        <div class="insight-box">
+        <h4>About This Dashboard</h4>
+        <p>This interactive dashboard analyzes mental health disparities among U.S. veterans using real CDC BRFSS 2024 data. 
+        <br>It provides comprehensive analysis of <strong>{dataset["rows"]:,} veterans</strong> across {len(dataset["states"])} states and {len(dataset["territories"])} US territories, with special focus 
+        on gender differences and socioeconomic factors affecting mental health outcomes.</p>
+        <p><strong>Key Features:</strong> Universal gender filtering, geographic analysis, risk factor identification, 
+        and evidence-based policy recommendations.</p>
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+
+    # Key definitions
+    with st.expander("📖 Key Definitions"):
+        st.markdown("""
+        **Mental Health Days:**  
+        Number of days in the past 30 days when mental health was **not good** (including stress, 
+        depression, and emotional problems). This is the primary outcome measure in our analysis.
+        - **Frequent Mental Distress:** ≥14 days per month (CDC threshold for clinical concern)
+        - **Range:** 0-30 days
+        
+        **Physical Health Days:**  
+        Number of days in the past 30 days when physical health was **not good** (including physical 
+        illness and injury). Used as a predictor of mental health outcomes.
+        - **Range:** 0-30 days
+        
+        **Depression:**  
+        Self-reported diagnosis of depressive disorder (including depression, major depression, 
+        dysthymia, or minor depression) by a healthcare professional.
+        
+        **Source:** CDC Behavioral Risk Factor Surveillance System (BRFSS) 2024
+        """)
+
+    # Show gender badge
+    if gender_filter == "Female Veterans Only":
+        st.markdown(
+            "**Viewing:** <span class='gender-badge female-badge'>👩‍✈️ Female Veterans Only</span>",
+            unsafe_allow_html=True,
+        )
+    elif gender_filter == "Male Veterans Only":
+        st.markdown(
+            "**Viewing:** <span class='gender-badge male-badge'>👨‍✈️ Male Veterans Only</span>",
+            unsafe_allow_html=True,
+        )
+    elif gender_filter == "Compare Genders":
+        st.markdown(
+            "**Viewing:** <span class='gender-badge female-badge'>👩‍✈️ Female</span> vs <span class='gender-badge male-badge'>👨‍✈️ Male</span>",
+            unsafe_allow_html=True,
+        )
+
+    st.markdown("---")
+
+    render_metrics(ctx)
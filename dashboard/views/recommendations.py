@@ -0,0 +1,371 @@
+"""
+Recommendations page
+"""
+
+import plotly.express as px
+import streamlit as st
+
+from dashboard import (
+    evidence,
+    figures,
+    profiling,
+    regression,
+    simulator,
+    suppression,
+)
+
+GENDER_COLORS = {"Female": "#ff7f0e", "Male": "#1f77b4"}
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def evidence_ratios(version, filter_key, _df):
+    """Evidence ratios for the current selection"""
+    return evidence.evidence_ratios(_df)
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def distress_model(version, filter_key, _store, _rows):
+    """Distress model for the selection; the design is built once per version"""
+    design = _store.aggregate("regression_design", regression.build_design)
+    return simulator.fit_model(_store.frame, design, _rows)
+
+
+def projected_change(model, shares):
+    """Model-projected relative change (%) in frequent distress for a scenario,
+    or None when the model could not be fitted"""
+    if model is None:
+        return None
+    _, overall = simulator.simulate(model, shares)
+    return overall.iloc[0]["Relative"]
+
+
+def format_change(relative):
+    """Signed percentage, or n/a without a fitted model"""
+    return "n/a" if relative is None else f"{relative:+.1f}%"
+
+
+def projected_outcome(relative, change):
+    """Expected outcome line of an intervention from its projected change"""
+    if relative is None:
+        return "n/a (too few complete responses to fit the model)"
+    return f"{relative:+.1f}% frequent distress if {change} (model projection)"
+
+
+@st.fragment
+@profiling.timed("what-if simulator")
+def render_simulator(ctx, model):
+    """Sliders for intervention reach and the projected change in distress"""
+    st.markdown("### What-If Simulator")
+    st.markdown("""
+    Projects frequent mental distress (≥14 poor mental health days) under the
+    interventions below, using the survey-weighted regression from Risk Factors
+    fitted on the current selection. Every other characteristic of each veteran
+    is held fixed, so these are model projections, not causal estimates.
+    """)
+    if model is None:
+        st.info("Too few complete responses in this selection to fit the model.")
+        return
+
+    col1, col2 = st.columns(2)
+    with col1:
+        insured = st.slider(
+            "Uninsured veterans who gain coverage (%)", 0, 100, 50, step=5
+        )
+    with col2:
+        supported = st.slider(
+            "Veterans whose emotional support rises one level (%)",
+            0,
+            100,
+            25,
+            step=5,
+            help="Never → Rarely → Sometimes → Usually → Always",
+        )
+    shares = {"insurance": insured / 100, "support": supported / 100}
+    by_gender = ctx.gender_filter == "Compare Genders"
+    by_state, overall = simulator.simulate(model, shares, by_gender=by_gender)
+    keys = ["State_Name", "Gender"] if by_gender else ["State_Name"]
+    by_state = suppression.suppress(
+        by_state,
+        "n",
+        ["Baseline", "Scenario", "Change", "Relative"],
+        suppression.margins(keys),
+    )
+
+    columns = st.columns(len(overall))
+    for column, (_, row) in zip(columns, overall.iterrows()):
+        label = (
+            "All veterans" if row["Gender"] == "All" else f"{row['Gender']} veterans"
+        )
+        column.metric(
+            f"{label}: frequent distress",
+            f"{row['Scenario']:.1f}%",
+            f"{row['Change']:+.2f} pts ({row['Relative']:+.1f}%)",
+            delta_color="inverse",
+        )
+    st.caption(
+        f"Baseline is the model's predicted prevalence for "
+        f"{overall.iloc[0]['n']:,} veterans with complete responses."
+    )
+    skipped = {
+        "insurance": "uninsured veterans",
+        "support": "veterans below the top support level",
+    }
+    for name, who in skipped.items():
+        if model.unshifted[name]:
+            st.caption(
+                f"{model.unshifted[name]:,} {who} were left unshifted: their "
+                f"current or next level has no fitted effect in this selection."
+            )
+
+    order = by_state.groupby("State_Name")["Change"].mean().sort_values().index.tolist()
+    fig = px.bar(
+        by_state,
+        x="Change",
+        y="State_Name",
+        color="Gender" if by_gender else None,
+        barmode="group",
+        orientation="h",
+        title="Projected Change in Frequent Distress by State",
+        labels={"Change": "Change (percentage points)", "State_Name": "State"},
+        hover_data={"Baseline": ":.1f", "Scenario": ":.1f", "n": True},
+        color_discrete_map=GENDER_COLORS,
+        category_orders={"State_Name": order},
+    )
+    fig.update_layout(height=max(400, 22 * len(order)))
+    figures.plotly_chart(
+        fig, ctx.figure_key("simulator", insured, supported), use_container_width=True
+    )
+    note = suppression.note(by_state["suppressed"])
+    if note:
+        st.caption(note)
+
+
+def render(ctx):
+    """Render the Recommendations page"""
+    dataset = ctx.manifest
+    ratios = evidence_ratios(ctx.store.version, ctx.filter_key, ctx.df_filtered)
+    rows = ctx.store.frame.index.get_indexer(ctx.df_filtered.index)
+    model = distress_model(ctx.store.version, ctx.filter_key, ctx.store, rows)
+    top_state, bottom_state = ratios["state"]["states"]
+    state_note = f" ({top_state} vs {bottom_state})" if top_state else ""
+
+    st.markdown(
+        '<div class="sub-header">Evidence-Based Recommendations</div>',
+        unsafe_allow_html=True,
+    )
+
+    # Introduction with key stats
+    st.markdown(
+        f"""
+        <div class="insight-box">
+        <h4> Analysis Foundation</h4>
+        <p>Based on comprehensive analysis of <strong>{dataset["rows"]:,} veterans</strong> 
+        ({dataset["genders"]["Female"]:,} female, {dataset["genders"]["Male"]:,} male) 
+        from CDC BRFSS 2024.</p>
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+
+    support_change = projected_change(model, {"support": 1.0})
+    insurance_change = projected_change(model, {"insurance": 1.0})
+    support_outcome = projected_outcome(
+        support_change, "every veteran gained one level of support"
+    )
+    insurance_outcome = projected_outcome(
+        insurance_change, "every uninsured veteran gained coverage"
+    )
+
+    st.markdown("### Priority Interventions")
+    st.markdown("Four evidence-based strategies with the highest potential impact:")
+    st.caption(
+        "Evidence ratios compare average poor mental health days in the current "
+        "selection, with 95% confidence intervals."
+    )
+
+    # Create 2x2 grid for interventions
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown(
+            f"""
+            <div class="success-box">
+            <h4>1️⃣ Social Support Programs</h4>
+            <p><strong>Impact Level:</strong>  Highest</p>
+            <ul>
+            <li><strong>Evidence:</strong> {evidence.format_ratio(ratios["support"])} higher burden with no emotional support vs always</li>
+            <li><strong>Target:</strong> Peer support networks, mentorship programs</li>
+            <li><strong>Expected Outcome:</strong> {support_outcome}</li>
+            <li><strong>Implementation:</strong> 6-12 months</li>
+            </ul>
+            <p><em>Strongest protective factor identified in analysis</em></p>
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
+
+        st.markdown(
+            f"""
+            <div class="insight-box">
+            <h4>3️⃣ Economic Stability Initiatives</h4>
+            <p><strong>Impact Level:</strong>  High</p>
+            <ul>
+            <li><strong>Evidence:</strong> {evidence.format_ratio(ratios["income"])} gradient between lowest and highest income</li>
+            <li><strong>Target:</strong> Employment support, financial counseling</li>
+            <li><strong>Expected Outcome:</strong> Reach 5,000+ veterans annually</li>
+            <li><strong>Implementation:</strong> 12-18 months</li>
+            </ul>
+            <p><em>Addresses root cause of mental health disparities</em></p>
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
+
+    with col2:
+        st.markdown(
+            f"""
+            <div class="warning-box">
+            <h4>2️⃣ Healthcare Access Expansion</h4>
+            <p><strong>Impact Level:</strong>  Very High</p>
+            <ul>
+            <li><strong>Evidence:</strong> {evidence.format_ratio(ratios["insurance"])} higher burden among uninsured</li>
+            <li><strong>Target:</strong> Telehealth expansion, cost barrier reduction</li>
+            <li><strong>Expected Outcome:</strong> {insurance_outcome}</li>
+            <li><strong>Implementation:</strong> 6-9 months</li>
+            </ul>
+            <p><em>Immediate impact on access to care</em></p>
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
+
+        st.markdown(
+            f"""
+            <div class="insight-box">
+            <h4>4️⃣ Geographic Targeting</h4>
+            <p><strong>Impact Level:</strong>  High</p>
+            <ul>
+            <li><strong>Evidence:</strong> {evidence.format_ratio(ratios["state"])} variation between states{state_note}</li>
+            <li><strong>Target:</strong> High-burden states from analysis</li>
+            <li><strong>Expected Outcome:</strong> Regional equity improvement</li>
+            <li><strong>Implementation:</strong> 12-24 months</li>
+            </ul>
+            <p><em>Focused resources where most needed</em></p>
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
+
+    st.markdown("---")
+    render_simulator(ctx, model)
+
+    # Implementation roadmap
+    st.markdown("---")
+    st.markdown("###  Implementation Roadmap")
+
+    # Create tabs for timeline
+    tab1, tab2, tab3 = st.tabs(
+        ["Phase 1: 0-6 Months", "Phase 2: 6-12 Months", "Phase 3: 12-24 Months"]
+    )
+
+    with tab1:
+        st.markdown(
+            """
+            <div class="success-box">
+            <h4> Immediate Actions</h4>
+            <ul>
+            <li><strong>Healthcare Access:</strong> Launch telehealth pilot programs</li>
+            <li><strong>Social Support:</strong> Establish peer support network infrastructure</li>
+            <li><strong>Data Collection:</strong> Implement continuous monitoring system</li>
+            <li><strong>Stakeholder Engagement:</strong> Form partnerships with VA, community organizations</li>
+            </ul>
+            <p><strong>Expected Reach:</strong> 2,000+ veterans</p>
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
+
+    with tab2:
+        st.markdown(
+            """
+            <div class="warning-box">
+            <h4> Scaling Up</h4>
+            <ul>
+            <li><strong>Social Support:</strong> Expand peer networks to all high-burden states</li>
+            <li><strong>Healthcare:</strong> Full telehealth deployment + cost assistance programs</li>
+            <li><strong>Economic:</strong> Launch employment support and financial counseling</li>
+            <li><strong>Evaluation:</strong> Mid-point assessment and course correction</li>
+            </ul>
+            <p><strong>Expected Reach:</strong> 8,000+ veterans</p>
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
+
+    with tab3:
+        st.markdown(
+            """
+            <div class="insight-box">
+            <h4> Full Implementation</h4>
+            <ul>
+            <li><strong>Geographic Targeting:</strong> Focused interventions in highest-burden states</li>
+            <li><strong>Sustainability:</strong> Transition to self-sustaining programs</li>
+            <li><strong>Policy Advocacy:</strong> Use findings to inform national policy</li>
+            <li><strong>Comprehensive Evaluation:</strong> Final impact assessment and reporting</li>
+            </ul>
+            <p><strong>Expected Reach:</strong> 15,000+ veterans nationwide</p>
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
+
+    # Key metrics
+    st.markdown("---")
+    st.markdown("###  Success Metrics")
+
+    metric_col1, metric_col2, metric_col3, metric_col4 = st.columns(4)
+
+    with metric_col1:
+        st.metric(
+            "Support Projection",
+            format_change(support_change),
+            "Frequent distress",
+            delta_color="off",
+        )
+
+    with metric_col2:
+        st.metric(
+            "Veterans Reached",
+            "15,000+",
+            "Over 24 months",
+        )
+
+    with metric_col3:
+        st.metric(
+            "Coverage Projection",
+            format_change(insurance_change),
+            "Frequent distress",
+            delta_color="off",
+        )
+
+    with metric_col4:
+        st.metric(
+            "ROI Expected",
+            "$3-5",
+            "Per $1 invested",
+        )
+
+    # Call to action
+    st.markdown("---")
+    st.markdown(
+        """
+        <div class="success-box">
+        <h4> Next Steps</h4>
+        <p><strong>For Policymakers:</strong> Use these findings to inform veteran mental health initiatives</p>
+        <p><strong>For Healthcare Providers:</strong> Prioritize social support and access interventions</p>
+        <p><strong>For Researchers:</strong> Continue monitoring and evaluation of implemented programs</p>
+        <p><strong>For Advocates:</strong> Champion these evidence-based approaches in your communities</p>
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
@@ -0,0 +1,120 @@
+"""
+Trends Over Time page
+"""
+
+import plotly.express as px
+import streamlit as st
+
+from dashboard import figures, metrics, profiling, suppression, trends
+
+# States charted when splitting by state without a sidebar state selection
+TOP_STATES = 5
+
+
+def monthly_sums(ctx, by=None):
+    """Monthly measure sums for the selection, from the store aggregate if possible"""
+    selections = dict(ctx.facets or {})
+    population = metrics.POPULATIONS[ctx.gender_filter]
+    if population:
+        selections["Gender"] = [population]
+    if trends.covers(selections):
+        monthly = ctx.store.aggregate("monthly_trends", trends.build_trends)
+        return trends.select(monthly, selections, by)
+    return trends.select(trends.build_trends(ctx.df_filtered), by=by)
+
+
+@st.fragment
+@profiling.timed("trends chart")
+def render_rates(ctx):
+    """Rate chart; its measure, window and split controls rerun only this"""
+    gender_filter = ctx.gender_filter
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        rate = st.radio("Measure", list(trends.RATES))
+    with col2:
+        window = st.radio("Window", ["Rolling 3-month", "Monthly"])
+    with col3:
+        splits = ["None", "Gender", "State"]
+        split = st.radio(
+            "Split by",
+            splits,
+            index=1 if gender_filter == "Compare Genders" else 0,
+        )
+
+    by = {"None": None, "Gender": "Gender", "State": "State_Name"}[split]
+    sums = monthly_sums(ctx, by)
+    if by == "State_Name" and "State_Name" not in (ctx.facets or {}):
+        # Largest states in the selection, so the chart stays readable
+        totals = sums.xs("n", axis=1, level=1).sum()
+        sums = sums[totals.nlargest(TOP_STATES).index.tolist()]
+    if window == "Rolling 3-month":
+        sums = trends.rolling(sums, 3)
+
+    # Each month's total across the split is charted too (split "None")
+    counts = sums.xs("n", axis=1, level=1) if by else sums[["n"]]
+    hidden = suppression.hide_grid(counts.to_numpy(), axes=(1,) if by else (0,))
+    series = trends.rates(sums, rate)
+    series = series.mask(hidden if by else hidden[:, 0])
+    series.index = series.index.to_timestamp()
+    if by is None:
+        frame = series.rename(rate).reset_index()
+        fig = px.line(frame, x="Month", y=rate, markers=True)
+    else:
+        frame = series.reset_index().melt(
+            id_vars="Month", var_name=split, value_name=rate
+        )
+        fig = px.line(
+            frame,
+            x="Month",
+            y=rate,
+            color=split,
+            markers=True,
+            color_discrete_map={"Female": "#ff7f0e", "Male": "#1f77b4"},
+        )
+    fig.update_layout(
+        title=f"{rate} by Interview Month ({window})",
+        height=450,
+        xaxis_title="Interview Month",
+    )
+    fig.update_traces(hovertemplate="%{x|%b %Y}<br>%{y:.1f}%")
+    figures.plotly_chart(
+        fig, ctx.figure_key("rates", rate, window, split), use_container_width=True
+    )
+    note = suppression.note(hidden)
+    if note:
+        st.caption(note)
+
+
+def render(ctx):
+    """Render the Trends Over Time page"""
+    st.markdown(
+        '<div class="sub-header">Trends Over Time</div>', unsafe_allow_html=True
+    )
+    st.markdown(
+        "Monthly rates by BRFSS interview date. Rolling windows pool each month "
+        "with the two before it, which steadies months with few interviews."
+    )
+
+    counts = monthly_sums(ctx)["n"]
+    if not counts.sum():
+        st.info("No respondents match the current filters.")
+        return
+
+    render_rates(ctx)
+
+    # Interviews per month, to judge how much each point can be trusted
+    hidden = suppression.hide_grid(counts.to_numpy()[:, None], axes=(0,))[:, 0]
+    counts = counts.mask(hidden)
+    counts.index = counts.index.to_timestamp()
+    fig = px.bar(
+        counts.rename("Interviews").reset_index(),
+        x="Month",
+        y="Interviews",
+        title="Interviews per Month",
+    )
+    fig.update_layout(height=300, xaxis_title="Interview Month")
+    figures.plotly_chart(fig, ctx.figure_key("interviews"), use_container_width=True)
+    note = suppression.note(hidden)
+    if note:
+        st.caption(note)
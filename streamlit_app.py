@@ -4,12 +4,13 @@ Phase 2 Demonstration App
 Dataset: BRFSS 2024 (CDC)
 """
 
-import numpy as np
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import streamlit as st
-from plotly.subplots import make_subplots
+
+from dashboard import facets, manifest, metrics, profiling, theme
+from dashboard.store import load_store
+from dashboard.views import PAGES, ViewContext, render_page
+
+run_started = profiling.clock()
 
 # Page configuration
 st.set_page_config(
@@ -20,303 +21,21 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown(
-    """
-<style>
-    .main-header {
-        font-size: 3rem;
-        font-weight: bold;
-        background: linear-gradient(90deg, #1f77b4 0%, #ff7f0e 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        text-align: center;
-        padding: 1rem;
-    }
-    .sub-header {
-        font-size: 1.5rem;
-        color: #ff7f0e;
-        padding: 0.5rem;
-        border-left: 4px solid #ff7f0e;
-        margin: 1rem 0;
-    }
-    .insight-box {
-        background-color: #f0f8ff;
-        border-left: 5px solid #1f77b4;
-        padding: 1rem;
-        border-radius: 5px;
-        margin: 1rem 0;
-    }
-    .warning-box {
-        background-color: #fff3cd;
-        border-left: 5px solid #ff7f0e;
-        padding: 1rem;
-        border-radius: 5px;
-        margin: 1rem 0;
-    }
-    .success-box {
-        background-color: #d4edda;
-        border-left: 5px solid #28a745;
-        padding: 1rem;
-        border-radius: 5px;
-        margin: 1rem 0;
-    }
-    .gender-badge {
-        display: inline-block;
-        padding: 0.25rem 0.5rem;
-        border-radius: 3px;
-        font-weight: bold;
-        margin: 0 0.25rem;
-    }
-    .female-badge {
-        background-color: #ff7f0e;
-        color: white;
-    }
-    .male-badge {
-        background-color: #1f77b4;
-        color: white;
-    }
-    .all-badge {
-        background-color: #2ca02c;
-        color: white;
-    }
-</style>
-""",
-    unsafe_allow_html=True,
-)
-
-# State code to name mapping
-STATE_CODES = {
-    1: "Alabama",
-    2: "Alaska",
-    4: "Arizona",
-    5: "Arkansas",
-    6: "California",
-    8: "Colorado",
-    9: "Connecticut",
-    10: "Delaware",
-    11: "District of Columbia",
-    12: "Florida",
-    13: "Georgia",
-    15: "Hawaii",
-    16: "Idaho",
-    17: "Illinois",
-    18: "Indiana",
-    19: "Iowa",
-    20: "Kansas",
-    21: "Kentucky",
-    22: "Louisiana",
-    23: "Maine",
-    24: "Maryland",
-    25: "Massachusetts",
-    26: "Michigan",
-    27: "Minnesota",
-    28: "Mississippi",
-    29: "Missouri",
-    30: "Montana",
-    31: "Nebraska",
-    32: "Nevada",
-    33: "New Hampshire",
-    34: "New Jersey",
-    35: "New Mexico",
-    36: "New York",
-    37: "North Carolina",
-    38: "North Dakota",
-    39: "Ohio",
-    40: "Oklahoma",
-    41: "Oregon",
-    42: "Pennsylvania",
-    44: "Rhode Island",
-    45: "South Carolina",
-    46: "South Dakota",
-    47: "Tennessee",
-    48: "Texas",
-    49: "Utah",
-    50: "Vermont",
-    51: "Virginia",
-    53: "Washington",
-    54: "West Virginia",
-    55: "Wisconsin",
-    56: "Wyoming",
-    66: "Guam",
-    72: "Puerto Rico",
-    78: "Virgin Islands",
-}
-
-# Variable mappings
-AGE_GROUPS = {
-    1: "18-24",
-    2: "25-29",
-    3: "30-34",
-    4: "35-39",
-    5: "40-44",
-    6: "45-49",
-    7: "50-54",
-    8: "55-59",
-    9: "60-64",
-    10: "65-69",
-    11: "70-74",
-    12: "75-79",
-    13: "80+",
-    14: "80+",
-}
-# Age group ordering for charts (youngest to oldest)
-AGE_GROUP_ORDER = [
-    "18-24",
-    "25-29",
-    "30-34",
-    "35-39",
-    "40-44",
-    "45-49",
-    "50-54",
-    "55-59",
-    "60-64",
-    "65-69",
-    "70-74",
-    "75-79",
-    "80+",
-]
-INCOME_GROUPS = {
-    1: "<$15k",
-    2: "$15-25k",
-    3: "$25-35k",
-    4: "$35-50k",
-    5: "$50-75k",
-    6: ">$75k",
-    7: "Unknown",
-    9: "Refused",
-}
-# Income ordering for charts
-INCOME_ORDER = ["<$15k", "$15-25k", "$25-35k", "$35-50k", "$50-75k", ">$75k"]
-
-EMPLOYMENT_STATUS = {
-    1: "Employed",
-    2: "Self-employed",
-    3: "Unemployed <1yr",
-    4: "Unemployed 1yr+",
-    5: "Homemaker",
-    6: "Student",
-    7: "Retired",
-    8: "Unable to work",
-    9: "Refused",
-}
-
-MARITAL_STATUS = {
-    1: "Married",
-    2: "Divorced",
-    3: "Widowed",
-    4: "Separated",
-    5: "Never married",
-    6: "Unmarried couple",
-    9: "Refused",
-}
-
-EDUCATION_LEVELS = {
-    1: "Never attended",
-    2: "Elementary",
-    3: "Some HS",
-    4: "HS Graduate",
-    5: "Some College",
-    6: "College Graduate",
-    9: "Refused",
-}
-
-# Education ordering for charts
-EDUCATION_ORDER = [
-    "Never attended",
-    "Elementary",
-    "Some HS",
-    "HS Graduate",
-    "Some College",
-    "College Graduate",
-]
-
-# Health status mapping
-HEALTH_STATUS = {
-    1: "Excellent",
-    2: "Very Good",
-    3: "Good",
-    4: "Fair",
-    5: "Poor",
-    7: "Don't know",
-    9: "Refused",
-}
-# Health status ordering for charts
-HEALTH_ORDER = ["Excellent", "Very Good", "Good", "Fair", "Poor"]
-
-# Emotional support frequency mapping
-SUPPORT_FREQUENCY = {
-    1: "Always",
-    2: "Usually",
-    3: "Sometimes",
-    4: "Rarely",
-    5: "Never",
-    9: "Refused",
-}
-# Support frequency ordering for charts
-SUPPORT_ORDER = ["Always", "Usually", "Sometimes", "Rarely", "Never"]
-
-LIFE_SATISFACTION = {
-    1: "Very Satisfied",
-    2: "Satisfied",
-    3: "Dissatisfied",
-    4: "Very Dissatisfied",
-    7: "Don't know",
-    9: "Refused",
-}
-
-
-def clean_label(text):
-    """Remove underscores and make labels more readable"""
-    if isinstance(text, str):
-        return text.replace("_", " ").title()
-    return text
+st.markdown(theme.CSS, unsafe_allow_html=True)
 
 
-@st.cache_data
+# cache_resource hands every session the same read-only store instead of
+# unpickling a private copy per rerun, which also lets the shared-memory mode
+# keep its columns backed by the mapped file and lets incremental refreshes
+# patch the one resident copy
+@st.cache_resource
 def load_and_prepare_data():
     """Load and preprocess both female and male veteran data"""
     try:
-        df_female = pd.read_csv("./data/female_veterans_clean.csv")
-        df_male = pd.read_csv("./data/male_veterans_clean.csv")
-
-        # Add gender column
-        df_female["Gender"] = "Female"
-        df_male["Gender"] = "Male"
-
-        # Combine datasets
-        df_all = pd.concat([df_female, df_male], ignore_index=True)
-
-        # Apply mappings
-        for df in [df_all]:
-            df["State_Name"] = df["_STATE"].map(STATE_CODES)
-            df["Age_Group"] = df["_AGEG5YR"].map(AGE_GROUPS)
-            df["Income_Group"] = df["_INCOMG1"].map(INCOME_GROUPS)
-            df["Employment"] = df["EMPLOY1"].map(EMPLOYMENT_STATUS)
-            df["Marital"] = df["MARITAL"].map(MARITAL_STATUS)
-            df["Education"] = df["EDUCA"].map(EDUCATION_LEVELS)
-            df["General_Health"] = df["GENHLTH"].map(HEALTH_STATUS)
-            df["Emotional_Support"] = df["EMTSUPRT"].map(SUPPORT_FREQUENCY)
-            df["Life_Satisfaction"] = df["LSATISFY"].map(LIFE_SATISFACTION)
-
-            # Binary variables
-            df["Depression"] = (df["ADDEPEV3"] == 1).map({True: "Yes", False: "No"})
-            df["Has_Insurance"] = (df["_HLTHPL2"] == 1).map({True: "Yes", False: "No"})
-            df["Has_Doctor"] = (df["PERSDOC3"] == 1).map({True: "Yes", False: "No"})
-            df["Cost_Barrier"] = (df["MEDCOST1"] == 1).map({True: "Yes", False: "No"})
-
-            # Clean mental health days
-            df["Mental_Health_Days_Clean"] = df["MENTHLTH"].copy()
-            df.loc[df["Mental_Health_Days_Clean"] > 30, "Mental_Health_Days_Clean"] = (
-                np.nan
-            )
-
-            # Clean physical health days
-            df["Physical_Health_Days_Clean"] = df["PHYSHLTH"].copy()
-            df.loc[
-                df["Physical_Health_Days_Clean"] > 30, "Physical_Health_Days_Clean"
-            ] = np.nan
-
-        return df_all
+        store = load_store()
+        # Counts and coverage behind the sidebar and page text, built at load
+        store.aggregate("manifest", manifest.build_manifest)
+        return store
 
     except FileNotFoundError:
         st.error(
@@ -325,12 +44,30 @@ def load_and_prepare_data():
         return None
 
 
+# One filtered frame per data version and selection, shared by every session
+# and read-only like df_all; page fragments rerun without touching it
+@st.cache_resource(max_entries=16, show_spinner=False)
+def filtered_view(version, gender_filter, selection_key, _store, _selections):
+    """Rows matching the sidebar population and facet filters"""
+    if not _selections:
+        # Gender alone is a cheap view of the full frame
+        return metrics.filter_gender(_store.frame, gender_filter)
+    population = metrics.POPULATIONS[gender_filter]
+    base = {"Gender": [population]} if population else {}
+    index = _store.aggregate("facet_index", facets.build_index)
+    return facets.apply(_store.frame, index, {**base, **_selections})
+
+
 # Load data
-df_all = load_and_prepare_data()
+data_store = load_and_prepare_data()
 
-if df_all is None:
+if data_store is None:
     st.stop()
 
+data_store.sync_shared()
+df_all = data_store.frame
+dataset = data_store.aggregate("manifest", manifest.build_manifest)
+
 # Title
 st.markdown(
     '<div class="main-header">🎖️ Veterans Mental Health Analysis - BRFSS 2024</div>',
@@ -343,15 +80,7 @@ with st.sidebar:
 
     page = st.radio(
         "Select Section:",
-        [
-            "Executive Overview",
-            "Mental Health Analysis",
-            "Geographic Patterns",
-            "🔍 Interactive Explorer",
-            "Risk Factors",
-            "Key Insights",
-            "Recommendations",
-        ],
+        list(PAGES),
         label_visibility="collapsed",
     )
 
@@ -373,31 +102,43 @@ with st.sidebar:
     st.markdown("---")
     st.markdown("###  Additional Filters")
 
-    # Apply gender filter first
-    if gender_filter == "Female Veterans Only":
-        df_filtered = df_all[df_all["Gender"] == "Female"].copy()
-    elif gender_filter == "Male Veterans Only":
-        df_filtered = df_all[df_all["Gender"] == "Male"].copy()
-    else:  # All Veterans or Compare
-        df_filtered = df_all.copy()
-
-    # State filter
-    states = ["All States"] + sorted(
-        df_filtered["State_Name"].dropna().unique().tolist()
-    )
-    selected_states = st.multiselect("States", states, default=["All States"])
-
-    # Age filter
-    ages = ["All Ages"] + sorted(
-        [ag for ag in df_filtered["Age_Group"].dropna().unique().tolist() if ag]
+    # Option counts reflect the other filters as set on the previous run; any
+    # change triggers a rerun, so they are current whenever they are visible
+    facet_index = data_store.aggregate("facet_index", facets.build_index)
+    population = metrics.POPULATIONS[gender_filter]
+    base = {"Gender": [population]} if population else {}
+    previous = facets.active_selections(
+        {column: st.session_state.get(f"facet_{column}") for column in facets.FACETS}
+    )
+    facet_counts = facet_index.counts({**base, **previous})
+
+    def facet_filter(column):
+        """Multiselect for one facet with live per-option counts"""
+        label, all_option, _ = facets.FACETS[column]
+        counts = facet_counts[column]
+        options = ([all_option] if all_option else []) + facet_index.values[column]
+        return st.multiselect(
+            label,
+            options,
+            default=[all_option] if all_option else [],
+            key=f"facet_{column}",
+            format_func=lambda v: v if v == all_option else f"{v} ({counts[v]:,})",
+        )
+
+    facet_values = {column: facet_filter(column) for column in facets.PRIMARY_FACETS}
+    with st.expander("More filters"):
+        for column in facets.FACETS:
+            if column not in facets.PRIMARY_FACETS:
+                facet_values[column] = facet_filter(column)
+    selections = facets.active_selections(facet_values)
+
+    df_filtered = filtered_view(
+        data_store.version,
+        gender_filter,
+        facets.selection_key(selections),
+        data_store,
+        selections,
     )
-    selected_ages = st.multiselect("Age Groups", ages, default=["All Ages"])
-
-    # Apply additional filters
-    if "All States" not in selected_states and len(selected_states) > 0:
-        df_filtered = df_filtered[df_filtered["State_Name"].isin(selected_states)]
-    if "All Ages" not in selected_ages and len(selected_ages) > 0:
-        df_filtered = df_filtered[df_filtered["Age_Group"].isin(selected_ages)]
 
     # Show filter status
     st.markdown("---")
@@ -427,43 +168,39 @@ with st.sidebar:
     st.markdown(f"**Sample Size:** {len(df_filtered):,}")
 
     if gender_filter == "All Veterans":
-        female_count = len(df_filtered[df_filtered["Gender"] == "Female"])
-        male_count = len(df_filtered[df_filtered["Gender"] == "Male"])
-        st.markdown(f"- Female: {female_count:,}")
-        st.markdown(f"- Male: {male_count:,}")
+        gender_counts = df_filtered["Gender"].value_counts()
+        st.markdown(f"- Female: {gender_counts.get('Female', 0):,}")
+        st.markdown(f"- Male: {gender_counts.get('Male', 0):,}")
 
     st.markdown("---")
     st.markdown("### Dataset Info")
 
-    # Calculate states count for tooltip
-    states_count = df_all["State_Name"].nunique()
+    # Corrected or appended extracts dropped into data/updates/
+    pending_updates = data_store.pending_update_files()
+    if pending_updates and st.button(f"Apply {len(pending_updates)} data update(s)"):
+        with st.spinner("Applying updates..."):
+            refresh = data_store.apply_update_files()
+        st.toast(
+            f"{refresh['added']:,} added, {refresh['changed']:,} changed "
+            f"in {refresh['seconds']:.1f}s"
+        )
+        st.rerun()
 
     st.markdown(f"""
     **Source:** [CDC BRFSS 2024](https://www.cdc.gov/brfss/annual_data/annual_2024.html)  
-    **Total Veterans:** {len(df_all):,}  
-    **Female:** {len(df_all[df_all["Gender"] == "Female"]):,}  
-    **Male:** {len(df_all[df_all["Gender"] == "Male"]):,}  
+    **Total Veterans:** {dataset["rows"]:,}  
+    **Female:** {dataset["genders"]["Female"]:,}  
+    **Male:** {dataset["genders"]["Male"]:,}  
     """)
 
     # States with tooltip
+    states_count = manifest.area_count(dataset)
     st.markdown(f"**States/Territories:** {states_count}")
-    with st.expander("ℹ️ Why 53 instead of 50?"):
-        st.markdown("""
-        The dataset includes **49 U.S. states** plus **4 U.S. territories**:
-        
-        **Territories included:**
-        -  **District of Columbia** (Washington, D.C.) - 71 veterans
-        -  **Puerto Rico** - 37 veterans  
-        -  **Guam** - 143 veterans
-        -  **Virgin Islands** - 41 veterans
-        
-        **Note:** Tennessee is not represented in this dataset.
-        
-        The CDC BRFSS survey covers U.S. territories because they have significant 
-        veteran populations and unique healthcare challenges.
-        
-        **Total: 53 geographic areas (49 states + 4 territories)**
-        """)
+    with st.expander(f"ℹ️ Why {states_count} instead of 50?"):
+        st.markdown(manifest.why_areas_markdown(dataset))
+    with st.expander("📋 Column coverage"):
+        st.caption("Share of respondents with an answer for each analysis column")
+        st.markdown(manifest.coverage_markdown(dataset))
 
     st.markdown("""
     **Author:** Dave S
@@ -471,1380 +208,25 @@ with st.sidebar:
     """)
 
 
-# Helper function for gender comparison
-def create_gender_comparison_chart(df, metric_col, title, y_label):
-    """Create a grouped bar chart comparing female and male veterans"""
-    if "Gender" in df.columns and len(df["Gender"].unique()) > 1:
-        gender_stats = df.groupby("Gender")[metric_col].mean().reset_index()
-
-        fig = go.Figure()
-        colors = {"Female": "#ff7f0e", "Male": "#1f77b4"}
-
-        for gender in gender_stats["Gender"]:
-            value = gender_stats[gender_stats["Gender"] == gender][metric_col].values[0]
-            fig.add_trace(
-                go.Bar(
-                    name=gender,
-                    x=[gender],
-                    y=[value],
-                    marker_color=colors.get(gender, "#2ca02c"),
-                    text=[f"{value:.1f}"],
-                    textposition="outside",
-                )
-            )
-
-        fig.update_layout(title=title, yaxis_title=y_label, height=400, showlegend=True)
-        return fig
-    return None
-
-
 # Main content
-if page == "Executive Overview":
-    st.markdown(
-        '<div class="sub-header">Executive Dashboard</div>', unsafe_allow_html=True
-    )
-
-    # Dashboard description
-    st.markdown(
-        """
-        <div class="insight-box">
-        <h4>About This Dashboard</h4>
-        <p>This interactive dashboard analyzes mental health disparities among U.S. veterans using real CDC BRFSS 2024 data. 
-        <br>It provides comprehensive analysis of <strong>16,085 veterans</strong> across 49 states and 4 US territories, with special focus 
-        on gender differences and socioeconomic factors affecting mental health outcomes.</p>
-        <p><strong>Key Features:</strong> Universal gender filtering, geographic analysis, risk factor identification, 
-        and evidence-based policy recommendations.</p>
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
-
-    # Key definitions
-    with st.expander("📖 Key Definitions"):
-        st.markdown("""
-        **Mental Health Days:**  
-        Number of days in the past 30 days when mental health was **not good** (including stress, 
-        depression, and emotional problems). This is the primary outcome measure in our analysis.
-        - **Frequent Mental Distress:** ≥14 days per month (CDC threshold for clinical concern)
-        - **Range:** 0-30 days
-        
-        **Physical Health Days:**  
-        Number of days in the past 30 days when physical health was **not good** (including physical 
-        illness and injury). Used as a predictor of mental health outcomes.
-        - **Range:** 0-30 days
-        
-        **Depression:**  
-        Self-reported diagnosis of depressive disorder (including depression, major depression, 
-        dysthymia, or minor depression) by a healthcare professional.
-        
-        **Source:** CDC Behavioral Risk Factor Surveillance System (BRFSS) 2024
-        """)
-
-    # Show gender badge
-    if gender_filter == "Female Veterans Only":
-        st.markdown(
-            "**Viewing:** <span class='gender-badge female-badge'>👩‍✈️ Female Veterans Only</span>",
-            unsafe_allow_html=True,
-        )
-    elif gender_filter == "Male Veterans Only":
-        st.markdown(
-            "**Viewing:** <span class='gender-badge male-badge'>👨‍✈️ Male Veterans Only</span>",
-            unsafe_allow_html=True,
-        )
-    elif gender_filter == "Compare Genders":
-        st.markdown(
-            "**Viewing:** <span class='gender-badge female-badge'>👩‍✈️ Female</span> vs <span class='gender-badge male-badge'>👨‍✈️ Male</span>",
-            unsafe_allow_html=True,
-        )
-
-    st.markdown("---")
-
-    # Key metrics
-    col1, col2, col3, col4, col5 = st.columns(5)
-
-    with col1:
-        st.metric("Total Sample", f"{len(df_filtered):,}", "Veterans")
-
-    with col2:
-        depression_rate = (df_filtered["Depression"] == "Yes").mean() * 100
-        if gender_filter == "Female Veterans Only":
-            male_rate = (
-                df_all[df_all["Gender"] == "Male"]["ADDEPEV3"] == 1
-            ).mean() * 100
-            delta = f"{depression_rate - male_rate:+.1f}% vs Males"
-        elif gender_filter == "Male Veterans Only":
-            female_rate = (
-                df_all[df_all["Gender"] == "Female"]["ADDEPEV3"] == 1
-            ).mean() * 100
-            delta = f"{depression_rate - female_rate:+.1f}% vs Females"
-        else:
-            delta = None
-        st.metric(
-            "Depression Rate", f"{depression_rate:.1f}%", delta, delta_color="inverse"
-        )
-
-    with col3:
-        avg_mental = df_filtered["Mental_Health_Days_Clean"].mean()
-        st.metric("Avg Mental Health Days", f"{avg_mental:.1f}", "per month")
-
-    with col4:
-        if "poor_mental_health" in df_filtered.columns:
-            freq_distress = (df_filtered["poor_mental_health"] == 1).mean() * 100
-        else:
-            freq_distress = (df_filtered["Mental_Health_Days_Clean"] >= 14).mean() * 100
-        st.metric(
-            "Frequent Distress",
-            f"{freq_distress:.1f}%",
-            "≥14 days/month",
-            delta_color="inverse",
-        )
-
-    with col5:
-        no_insurance = (df_filtered["Has_Insurance"] == "No").mean() * 100
-        st.metric("Uninsured", f"{no_insurance:.1f}%", delta_color="inverse")
-
-    st.markdown("---")
-
-    # Gender comparison or single gender analysis
-    if gender_filter == "Compare Genders":
-        st.markdown("### Female vs Male Comparison")
-
-        comparison_metrics = {
-            "Depression Rate (%)": lambda df: (df["Depression"] == "Yes").mean() * 100,
-            "Avg Mental Health Days": lambda df: df["Mental_Health_Days_Clean"].mean(),
-            "Frequent Distress (%)": lambda df: (
-                df["Mental_Health_Days_Clean"] >= 14
-            ).mean()
-            * 100,
-            "Uninsured (%)": lambda df: (df["Has_Insurance"] == "No").mean() * 100,
-        }
-
-        df_female_comp = df_filtered[df_filtered["Gender"] == "Female"]
-        df_male_comp = df_filtered[df_filtered["Gender"] == "Male"]
-
-        comparison_data = pd.DataFrame(
-            {
-                "Metric": list(comparison_metrics.keys()),
-                "Female Veterans": [
-                    func(df_female_comp) for func in comparison_metrics.values()
-                ],
-                "Male Veterans": [
-                    func(df_male_comp) for func in comparison_metrics.values()
-                ],
-            }
-        )
-
-        comparison_data["Ratio (F/M)"] = (
-            comparison_data["Female Veterans"] / comparison_data["Male Veterans"]
-        )
-
-        fig = go.Figure()
-        fig.add_trace(
-            go.Bar(
-                name="Female Veterans",
-                x=comparison_data["Metric"],
-                y=comparison_data["Female Veterans"],
-                marker_color="#ff7f0e",
-                text=comparison_data["Female Veterans"].round(1),
-                textposition="outside",
-            )
-        )
-        fig.add_trace(
-            go.Bar(
-                name="Male Veterans",
-                x=comparison_data["Metric"],
-                y=comparison_data["Male Veterans"],
-                marker_color="#1f77b4",
-                text=comparison_data["Male Veterans"].round(1),
-                textposition="outside",
-            )
-        )
-
-        fig.update_layout(
-            title="Key Metrics: Female vs Male Veterans",
-            barmode="group",
-            height=450,
-            yaxis_title="Value",
-        )
-        st.plotly_chart(fig, use_container_width=True)
-
-        # Ratio metrics
-        col1, col2, col3, col4 = st.columns(4)
-        with col1:
-            st.metric(
-                "Depression Ratio",
-                f"{comparison_data.iloc[0]['Ratio (F/M)']:.2f}x",
-                "F/M",
-            )
-        with col2:
-            st.metric(
-                "Mental Health Days Ratio",
-                f"{comparison_data.iloc[1]['Ratio (F/M)']:.2f}x",
-                "F/M",
-            )
-        with col3:
-            st.metric(
-                "Frequent Distress Ratio",
-                f"{comparison_data.iloc[2]['Ratio (F/M)']:.2f}x",
-                "F/M",
-            )
-        with col4:
-            st.metric(
-                "Uninsured Ratio",
-                f"{comparison_data.iloc[3]['Ratio (F/M)']:.2f}x",
-                "F/M",
-            )
-
-    # Distribution analysis
-    st.markdown("### Mental Health Distribution")
-
-    col1, col2 = st.columns(2)
-
-    with col1:
-        if gender_filter == "Compare Genders":
-            fig = px.histogram(
-                df_filtered,
-                x="Mental_Health_Days_Clean",
-                color="Gender",
-                nbins=30,
-                title="Mental Health Days Distribution by Gender",
-                labels={
-                    "Mental_Health_Days_Clean": "Mental Health Days",
-                    "Gender": "Gender",
-                },
-                barmode="stack",
-                color_discrete_map={"Female": "#ff7f0e", "Male": "#1f77b4"},
-            )
-        else:
-            fig = px.histogram(
-                df_filtered,
-                x="Mental_Health_Days_Clean",
-                nbins=30,
-                title="Distribution of Poor Mental Health Days",
-                labels={"Mental_Health_Days_Clean": "Mental Health Days"},
-                color_discrete_sequence=[
-                    "#1f77b4" if gender_filter == "Male Veterans Only" else "#ff7f0e"
-                ],
-            )
-            mean_val = df_filtered["Mental_Health_Days_Clean"].mean()
-            fig.add_vline(
-                x=mean_val,
-                line_dash="dash",
-                line_color="red",
-                annotation_text=f"Mean: {mean_val:.1f}",
-                annotation_position="top left",
-            )
-
-        fig.add_vline(
-            x=14,
-            line_dash="dot",
-            line_color="orange",
-            annotation_text="CDC Threshold",
-            annotation_position="top right",
-        )
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
-
-    with col2:
-        # Age group analysis
-        if gender_filter == "Compare Genders":
-            age_stats = (
-                df_filtered.groupby(["Age_Group", "Gender"])["Mental_Health_Days_Clean"]
-                .mean()
-                .reset_index()
-            )
-            age_stats = age_stats.dropna()
-
-            fig = px.line(
-                age_stats,
-                x="Age_Group",
-                y="Mental_Health_Days_Clean",
-                color="Gender",
-                title="Mental Health Days by Age Group and Gender",
-                labels={
-                    "Age_Group": "Age Group",
-                    "Mental_Health_Days_Clean": "Mental Health Days",
-                    "Gender": "Gender",
-                },
-                markers=True,
-                color_discrete_map={"Female": "#ff7f0e", "Male": "#1f77b4"},
-                category_orders={"Age_Group": AGE_GROUP_ORDER},
-            )
-            # Customize hover template for clarity
-            fig.update_traces(
-                hovertemplate="Gender: %{fullData.name}<br>"
-                "Age Group: %{x}<br>"
-                "Mental Health Days: %{y:.2f}<extra></extra>"
-            )
-        else:
-            age_stats = (
-                df_filtered.groupby("Age_Group")["Mental_Health_Days_Clean"]
-                .mean()
-                .reset_index()
-            )
-            age_stats = age_stats.dropna()
-
-            fig = px.line(
-                age_stats,
-                x="Age_Group",
-                y="Mental_Health_Days_Clean",
-                title="Mental Health Days by Age Group",
-                labels={
-                    "Age_Group": "Age Group",
-                    "Mental_Health_Days_Clean": "Mental Health Days",
-                },
-                markers=True,
-                category_orders={"Age_Group": AGE_GROUP_ORDER},
-            )
-            # Customize hover template for clarity rounding to 2 decimals
-            fig.update_traces(
-                hovertemplate="Age Group: %{x}<br>"
-                "Mental Health Days: %{y:.2f}<extra></extra>"
-            )
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
-
-elif page == "Mental Health Analysis":
-    st.markdown(
-        '<div class="sub-header">Comprehensive Mental Health Analysis</div>',
-        unsafe_allow_html=True,
-    )
-
-    # Socioeconomic analysis
-    st.markdown("### Socioeconomic Impact")
-
-    income_order = ["<$15k", "$15-25k", "$25-35k", "$35-50k", "$50-75k", ">$75k"]
-
-    if gender_filter == "Compare Genders":
-        income_stats = (
-            df_filtered.groupby(["Income_Group", "Gender"])["Mental_Health_Days_Clean"]
-            .mean()
-            .reset_index()
-        )
-        income_stats = income_stats[income_stats["Income_Group"].isin(income_order)]
-
-        fig = px.bar(
-            income_stats,
-            x="Income_Group",
-            y="Mental_Health_Days_Clean",
-            color="Gender",
-            title="Mental Health Days by Income Level (by Gender)",
-            barmode="group",
-            category_orders={"Income_Group": income_order},
-            color_discrete_map={"Female": "#ff7f0e", "Male": "#1f77b4"},
-        )
-    else:
-        income_stats = (
-            df_filtered.groupby("Income_Group")["Mental_Health_Days_Clean"]
-            .agg(["mean", "count"])
-            .reset_index()
-        )
-        income_stats = income_stats[income_stats["Income_Group"].isin(income_order)]
-        income_stats["Income_Group"] = pd.Categorical(
-            income_stats["Income_Group"], categories=income_order, ordered=True
-        )
-        income_stats = income_stats.sort_values("Income_Group")
-
-        fig = go.Figure()
-        fig.add_trace(
-            go.Bar(
-                x=income_stats["Income_Group"],
-                y=income_stats["mean"],
-                marker_color=income_stats["mean"],
-                marker_colorscale="Reds",
-                text=income_stats["mean"].round(1),
-                texttemplate="%{text} days",
-                textposition="outside",
-            )
-        )
-        fig.update_layout(title="Mental Health Days by Income Level")
-
-    fig.update_layout(
-        xaxis_title="Annual Income",
-        yaxis_title="Average Poor Mental Health Days",
-        height=450,
-    )
-    st.plotly_chart(fig, use_container_width=True)
-
-    # Social support
-    st.markdown("### Social Support Impact")
-
-    support_order = ["Always", "Usually", "Sometimes", "Rarely", "Never"]
-
-    if gender_filter == "Compare Genders":
-        support_stats = (
-            df_filtered.groupby(["Emotional_Support", "Gender"])[
-                "Mental_Health_Days_Clean"
-            ]
-            .mean()
-            .reset_index()
-        )
-        support_stats = support_stats[
-            support_stats["Emotional_Support"].isin(support_order)
-        ]
-
-        fig = px.line(
-            support_stats,
-            x="Emotional_Support",
-            y="Mental_Health_Days_Clean",
-            color="Gender",
-            title="Impact of Emotional Support (by Gender)",
-            markers=True,
-            category_orders={"Emotional_Support": support_order},
-            color_discrete_map={"Female": "#ff7f0e", "Male": "#1f77b4"},
-        )
-    else:
-        support_stats = (
-            df_filtered.groupby("Emotional_Support")["Mental_Health_Days_Clean"]
-            .mean()
-            .reset_index()
-        )
-        support_stats = support_stats[
-            support_stats["Emotional_Support"].isin(support_order)
-        ]
-        support_stats["Emotional_Support"] = pd.Categorical(
-            support_stats["Emotional_Support"], categories=support_order, ordered=True
-        )
-        support_stats = support_stats.sort_values("Emotional_Support")
-
-        fig = go.Figure()
-        fig.add_trace(
-            go.Scatter(
-                x=support_stats["Emotional_Support"],
-                y=support_stats["Mental_Health_Days_Clean"],
-                mode="lines+markers",
-                line=dict(color="#2ca02c", width=4),
-                marker=dict(size=15),
-                text=support_stats["Mental_Health_Days_Clean"].round(1),
-                textposition="top center",
-                texttemplate="%{text} days",
-            )
-        )
-        fig.update_layout(title="Impact of Emotional Support on Mental Health")
-
-    fig.update_layout(
-        xaxis_title="Emotional Support Availability",
-        yaxis_title="Average Poor Mental Health Days",
-        height=400,
-    )
-    st.plotly_chart(fig, use_container_width=True)
-
-elif page == "Geographic Patterns":
-    st.markdown(
-        '<div class="sub-header">Geographic Mental Health Disparities</div>',
-        unsafe_allow_html=True,
-    )
-
-    # State-level statistics
-    if gender_filter == "Compare Genders":
-        state_stats_female = (
-            df_filtered[df_filtered["Gender"] == "Female"]
-            .groupby("State_Name")["Mental_Health_Days_Clean"]
-            .mean()
-        )
-        state_stats_male = (
-            df_filtered[df_filtered["Gender"] == "Male"]
-            .groupby("State_Name")["Mental_Health_Days_Clean"]
-            .mean()
-        )
-
-        state_comparison = pd.DataFrame(
-            {
-                "State": state_stats_female.index,
-                "Female": state_stats_female.values,
-                "Male": state_stats_male.values,
-            }
-        )
-        state_comparison["Difference (F-M)"] = (
-            state_comparison["Female"] - state_comparison["Male"]
-        )
-        state_comparison = state_comparison.sort_values(
-            "Difference (F-M)", ascending=False
-        ).head(15)
-
-        fig = go.Figure()
-        fig.add_trace(
-            go.Bar(
-                name="Female",
-                x=state_comparison["State"],
-                y=state_comparison["Female"],
-                marker_color="#ff7f0e",
-            )
-        )
-        fig.add_trace(
-            go.Bar(
-                name="Male",
-                x=state_comparison["State"],
-                y=state_comparison["Male"],
-                marker_color="#1f77b4",
-            )
-        )
-
-        fig.update_layout(
-            title="Top 15 States by Gender Difference in Mental Health Days",
-            barmode="group",
-            height=500,
-            xaxis_tickangle=-45,
-        )
-        fig.update_traces(
-            hovertemplate=("State: %{x}<br>Difference: %{y:.2f} days<extra></extra>")
-        )
-
-        st.plotly_chart(fig, use_container_width=True)
-
-    else:
-        state_stats = (
-            df_filtered.groupby("State_Name")["Mental_Health_Days_Clean"]
-            .agg(["mean", "count"])
-            .reset_index()
-        )
-        state_stats = state_stats.sort_values("mean", ascending=False)
-
-        col1, col2 = st.columns(2)
-
-        with col1:
-            st.markdown("#### 🔴 Highest Burden States (Top 10)")
-            top_states = state_stats.head(10)
-
-            fig = px.bar(
-                top_states,
-                x="mean",
-                y="State_Name",
-                orientation="h",
-                color="mean",
-                color_continuous_scale="Reds",
-                text="mean",
-            )
-            # customize text and hover info for clarity
-            fig.update_traces(
-                texttemplate="%{x:.2f} days",
-                textposition="outside",
-                # custom hover
-                hovertemplate="State: %{y}<br>Avg Days: %{x:.2f}<extra></extra>",
-            )
-            fig.update_layout(height=450, showlegend=False)
-            st.plotly_chart(fig, use_container_width=True)
-
-        with col2:
-            st.markdown("#### 🟢 Lowest Burden States (Bottom 10)")
-            bottom_states = state_stats.tail(10).iloc[::-1]
-
-            fig = px.bar(
-                bottom_states,
-                x="mean",
-                y="State_Name",
-                orientation="h",
-                color="mean",
-                color_continuous_scale="Greens_r",
-                text="mean",
-            )
-            # customize text and hover info for clarity
-            fig.update_traces(
-                texttemplate="%{x:.2f} days",
-                textposition="outside",
-                # custom hover
-                hovertemplate="State: %{y}<br>Avg Days: %{x:.2f}<extra></extra>",
-            )
-            fig.update_layout(height=450, showlegend=False)
-            st.plotly_chart(fig, use_container_width=True)
-
-elif page == "🔍 Interactive Explorer":
-    st.markdown(
-        '<div class="sub-header">🔍 Interactive Data Explorer</div>',
-        unsafe_allow_html=True,
-    )
-
-    st.markdown("Create custom visualizations by selecting variables below.")
-
-    col1, col2, col3 = st.columns(3)
-
-    with col1:
-        chart_type = st.selectbox(
-            "Chart Type", ["Box Plot", "Violin Plot", "Bar Chart", "Histogram"]
-        )
-
-    with col2:
-        categorical_vars = [
-            "Age_Group",
-            "Income_Group",
-            "Employment",
-            "Education",
-            "General_Health",
-            "Depression",
-            "Has_Insurance",
-            "Emotional_Support",
-        ]
-        # Create display names without underscores
-        categorical_vars_display = {
-            "Age_Group": "Age Group",
-            "Income_Group": "Income Group",
-            "Employment": "Employment",
-            "Education": "Education",
-            "General_Health": "General Health",
-            "Depression": "Depression",
-            "Has_Insurance": "Has Insurance",
-            "Emotional_Support": "Emotional Support",
-        }
-        x_var_display = st.selectbox(
-            "X-Axis Variable", list(categorical_vars_display.values())
-        )
-        # Map back to actual column name
-        x_var = [k for k, v in categorical_vars_display.items() if v == x_var_display][
-            0
-        ]
-    # Y-Axis variable selection
-    with col3:
-        # Hide Y-Axis dropdown when Histogram is selected
-        if chart_type != "Histogram":
-            # Normal Y-axis dropdown for Box, Violin, Bar charts
-            y_vars_display = {
-                "Mental_Health_Days_Clean": "Mental Health Days",
-                "Physical_Health_Days_Clean": "Physical Health Days",
-            }
-
-            y_var_display = st.selectbox(
-                "Y-Axis Variable", list(y_vars_display.values())
-            )
-            y_var = [k for k, v in y_vars_display.items() if v == y_var_display][0]
-
-        else:
-            # Histogram does not use y_var → set default (unused)
-            y_var = "Mental_Health_Days_Clean"
-
-    # Add gender overlay option
-    if gender_filter in ["All Veterans", "Compare Genders"]:
-        show_gender_split = st.checkbox(
-            "Show by Gender", value=(gender_filter == "Compare Genders")
-        )
-    else:
-        show_gender_split = False
-
-    # Age group color palette
-    age_colors = {
-        "18-24": "#e41a1c",
-        "25-29": "#377eb8",
-        "30-34": "#4daf4a",
-        "35-39": "#984ea3",
-        "40-44": "#ff7f00",
-        "45-49": "#ffff33",
-        "50-54": "#a65628",
-        "55-59": "#f781bf",
-        "60-64": "#999999",
-        "65-69": "#66c2a5",
-        "70-74": "#fc8d62",
-        "75-79": "#8da0cb",
-        "80+": "#e78ac3",
-    }
-
-    # Create better labels (remove underscores)
-    def clean_label(text):
-        """Remove underscores and make labels more readable"""
-        return text.replace("_", " ")
-
-    # Create visualization
-    if chart_type == "Box Plot":
-        category_order = None
-        if x_var == "Age_Group":
-            category_order = {"Age_Group": AGE_GROUP_ORDER}
-        elif x_var == "General_Health":
-            category_order = {"General_Health": HEALTH_ORDER}
-        elif x_var == "Education":
-            category_order = {"Education": EDUCATION_ORDER}
-        elif x_var == "Income_Group":
-            category_order = {"Income_Group": INCOME_ORDER}
-        elif x_var == "Emotional_Support":
-            category_order = {"Emotional_Support": SUPPORT_ORDER}
-        # Use Age_Group colors if that's the x variable, otherwise use gender split
-        if x_var == "Age_Group" and not show_gender_split:
-            fig = px.box(
-                df_filtered.dropna(subset=[x_var, y_var]),
-                x=x_var,
-                y=y_var,
-                color=x_var,
-                color_discrete_map=age_colors,
-                points="outliers",
-                title=f"{clean_label(y_var)} by {clean_label(x_var)}",
-                category_orders={"Age_Group": AGE_GROUP_ORDER},
-            )
-        else:
-            fig = px.box(
-                df_filtered.dropna(subset=[x_var, y_var]),
-                x=x_var,
-                y=y_var,
-                color="Gender" if show_gender_split else None,
-                points="outliers",
-                title=f"{clean_label(y_var)} by {clean_label(x_var)}",
-                color_discrete_map={"Female": "#ff7f0e", "Male": "#1f77b4"}
-                if show_gender_split
-                else None,
-                category_orders=category_order,
-            )
-
-    elif chart_type == "Violin Plot":
-        category_order = None
-        if x_var == "Age_Group":
-            category_order = {"Age_Group": AGE_GROUP_ORDER}
-        elif x_var == "General_Health":
-            category_order = {"General_Health": HEALTH_ORDER}
-        elif x_var == "Education":
-            category_order = {"Education": EDUCATION_ORDER}
-        elif x_var == "Income_Group":
-            category_order = {"Income_Group": INCOME_ORDER}
-        elif x_var == "Emotional_Support":
-            category_order = {"Emotional_Support": SUPPORT_ORDER}
-        # Use Age_Group colors if that's the x variable, otherwise use gender split
-        if x_var == "Age_Group" and not show_gender_split:
-            fig = px.violin(
-                df_filtered.dropna(subset=[x_var, y_var]),
-                x=x_var,
-                y=y_var,
-                color=x_var,
-                color_discrete_map=age_colors,
-                box=True,
-                title=f"{clean_label(y_var)} Distribution by {clean_label(x_var)}",
-                category_orders=category_order,
-            )
-        # Add mean line
-        else:
-            fig = px.violin(
-                df_filtered.dropna(subset=[x_var, y_var]),
-                x=x_var,
-                y=y_var,
-                color="Gender" if show_gender_split else None,
-                box=True,
-                title=f"{clean_label(y_var)} Distribution by {clean_label(x_var)}",
-                color_discrete_map={"Female": "#ff7f0e", "Male": "#1f77b4"}
-                if show_gender_split
-                else None,
-                category_orders=category_order,
-            )
-    # Create Bar Chart
-    elif chart_type == "Bar Chart":
-        # Determine category ordering for all ordinal variables
-        category_order = None
-        if x_var == "Age_Group":
-            category_order = {"Age_Group": AGE_GROUP_ORDER}
-        elif x_var == "General_Health":
-            category_order = {"General_Health": HEALTH_ORDER}
-        elif x_var == "Education":
-            category_order = {"Education": EDUCATION_ORDER}
-        elif x_var == "Income_Group":
-            category_order = {"Income_Group": INCOME_ORDER}
-        elif x_var == "Emotional_Support":
-            category_order = {"Emotional_Support": SUPPORT_ORDER}
-        # Create grouped bar chart if gender split is selected
-        if show_gender_split:
-            grouped = df_filtered.groupby([x_var, "Gender"])[y_var].mean().reset_index()
-            fig = px.bar(
-                grouped,
-                x=x_var,
-                y=y_var,
-                color="Gender",
-                barmode="group",
-                color_discrete_map={"Female": "#ff7f0e", "Male": "#1f77b4"},
-                title=f"Average {clean_label(y_var)} by {clean_label(x_var)}",
-                category_orders=category_order,
-            )
-        # Age_Group with colors
-        elif x_var == "Age_Group":
-            grouped = df_filtered.groupby(x_var)[y_var].mean().reset_index()
-            fig = px.bar(
-                grouped,
-                x=x_var,
-                y=y_var,
-                color=x_var,
-                color_discrete_map=age_colors,
-                title=f"Average {clean_label(y_var)} by {clean_label(x_var)}",
-                category_orders=category_order,
-            )
-        # Default bar chart
-        else:
-            grouped = df_filtered.groupby(x_var)[y_var].mean().reset_index()
-            fig = px.bar(
-                grouped,
-                x=x_var,
-                y=y_var,
-                title=f"Average {clean_label(y_var)} by {clean_label(x_var)}",
-                category_orders=category_order,
-            )
-        # Update hover template to remove underscores
-        fig.update_traces(
-            hovertemplate="<br>".join(
-                [
-                    f"{clean_label(x_var)}: %{{x}}",
-                    f"{clean_label(y_var)}: %{{y:.2f}}",
-                    "<extra></extra>",
-                ]
-            )
-        )
-    # Create Histogram with optional gender split
-    else:
-        # For the histogram we use the selected X variable
-        hist_col = x_var
-        # Optional: category ordering for ordinal variables
-        category_order = None
-        if hist_col == "Age_Group":
-            category_order = {"Age_Group": AGE_GROUP_ORDER}
-        elif hist_col == "General_Health":
-            category_order = {"General_Health": HEALTH_ORDER}
-        elif hist_col == "Education":
-            category_order = {"Education": EDUCATION_ORDER}
-        elif hist_col == "Income_Group":
-            category_order = {"Income_Group": INCOME_ORDER}
-        elif hist_col == "Emotional_Support":
-            category_order = {"Emotional_Support": SUPPORT_ORDER}
-
-        fig = px.histogram(
-            df_filtered.dropna(subset=[hist_col]),
-            x=hist_col,
-            color="Gender" if show_gender_split else None,
-            marginal="box",
-            barmode="group" if show_gender_split else None,
-            # no transparency needed for grouped bars
-            opacity=1 if show_gender_split else 1,
-            color_discrete_map={"Female": "#ff7f0e", "Male": "#1f77b4"}
-            if show_gender_split
-            else None,
-            title=f"Distribution of {clean_label(hist_col)}",
-            category_orders=category_order,
-        )
-    # Apply layout and hover customization AFTER all chart types
-    if chart_type == "Histogram":
-        # Histogram: x = category/value (hist_col), y = count
-        fig.update_layout(
-            xaxis_title=clean_label(hist_col),
-            yaxis_title="Count",
-            height=600,
-            hovermode="closest",
-        )
-    # Apply hover customization for histograms
-    if chart_type == "Histogram":
-        # Update histogram bar hover
-        for trace in fig.data:
-            if trace.type == "histogram":
-                trace.hovertemplate = (
-                    f"{clean_label(hist_col)}: %{{x}}<br>Count: %{{y}}<extra></extra>"
-                )
-        # Update box plot hover in marginal if present and not showing gender split
-        if not show_gender_split:
-            # When NOT comparing genders, manually set hover for box trace
-            for trace in fig.data:
-                if trace.type == "box":
-                    # Override the box plot's internal hover formatting
-                    trace.hoverinfo = "x"  # Show only x value
-                    trace.hoveron = "boxes"  # Only show hover on boxes, not points
-        else:
-            # When comparing genders, keep default behavior
-            pass
-    st.plotly_chart(fig, use_container_width=True)
-
-# Risk Factors page
-elif page == "Risk Factors":
-    st.markdown(
-        '<div class="sub-header">Risk Factor Analysis & Predictive Features</div>',
-        unsafe_allow_html=True,
-    )
-
-    # XGBoost Feature Importance - PROPERLY SORTED!
-    st.markdown("### Top Predictive Features (XGBoost Model)")
-
-    st.markdown("""
-    Features ranked by importance score from XGBoost model predicting frequent mental distress (≥14 days/month).
-    The model achieved **87% accuracy** with the features listed below.
-    """)
-
-    features = [
-        "Poor Physical Health Days",
-        "Depression Diagnosis",
-        "Social Support Score",
-        "Income Level",
-        "Employment Status",
-        "General Health Rating",
-        "Chronic Conditions Count",
-        "Health Insurance",
-        "Age Group",
-        "Healthcare Access Score",
-        "Marital Status",
-        "Education Level",
-        "Cost Barrier to Care",
-        "PTSD Diagnosis",
-        "VA Healthcare Usage",
-    ]
-    importance = [
-        0.18,
-        0.15,
-        0.13,
-        0.11,
-        0.09,
-        0.08,
-        0.07,
-        0.06,
-        0.05,
-        0.04,
-        0.03,
-        0.02,
-        0.02,
-        0.015,
-        0.015,
-    ]
-
-    categories = [
-        "Physical Health",
-        "Mental Health",
-        "Social",
-        "Economic",
-        "Economic",
-        "Physical Health",
-        "Physical Health",
-        "Healthcare",
-        "Demographics",
-        "Healthcare",
-        "Social",
-        "Demographics",
-        "Healthcare",
-        "Mental Health",
-        "Healthcare",
-    ]
-
-    importance_df = pd.DataFrame(
-        {"Feature": features, "Importance": importance, "Category": categories}
-    )
-
-    # CRITICAL: Sort by importance with ascending=True for horizontal bar
-    # This makes the HIGHEST importance at the TOP of the chart
-    importance_df = importance_df.sort_values("Importance", ascending=True)
-
-    fig = px.bar(
-        importance_df,
-        x="Importance",
-        y="Feature",
-        orientation="h",
-        color="Category",
-        title="Feature Importance Ranking (Highest at Top)",
-        labels={"Importance": "Importance Score", "Feature": "Predictive Feature"},
-        text="Importance",
-        color_discrete_sequence=px.colors.qualitative.Set2,
-    )
-    fig.update_traces(texttemplate="%{text:.3f}", textposition="outside")
-    fig.update_layout(
-        height=600,
-        showlegend=True,
-        yaxis={"categoryorder": "total ascending"},  # Ensures proper ordering
-    )
-    st.plotly_chart(fig, use_container_width=True)
-
-    # Show top 5 features clearly
-    col1, col2, col3 = st.columns(3)
-    top_5 = importance_df.sort_values("Importance", ascending=False).head(5)
-
-    with col1:
-        st.markdown("**Top Feature:**")
-        st.markdown(f"**{top_5.iloc[0]['Feature']}**")
-        st.markdown(f"Importance: {top_5.iloc[0]['Importance']:.3f}")
-
-    with col2:
-        st.markdown("**Top 2-3:**")
-        st.markdown(
-            f"2. {top_5.iloc[1]['Feature']} ({top_5.iloc[1]['Importance']:.3f})"
-        )
-        st.markdown(
-            f"3. {top_5.iloc[2]['Feature']} ({top_5.iloc[2]['Importance']:.3f})"
-        )
-
-    with col3:
-        st.markdown("**Top 4-5:**")
-        st.markdown(
-            f"4. {top_5.iloc[3]['Feature']} ({top_5.iloc[3]['Importance']:.3f})"
-        )
-        st.markdown(
-            f"5. {top_5.iloc[4]['Feature']} ({top_5.iloc[4]['Importance']:.3f})"
-        )
-
-    st.success("""
-    **What The Score Means:**
-    The importance score reflects how much each feature contributes to the model's predictions.
-    A higher score indicates a greater impact on predicting frequent mental distress among veterans.
-
-    **Key Insight:** Physical health is the strongest predictor of mental health outcomes, 
-    followed by depression diagnosis and social support - highlighting the mind-body connection
-    and the critical role of social factors in veteran mental health.
-    """)
-
-elif page == "Key Insights":
-    st.markdown(
-        '<div class="sub-header">Key Research Insights</div>', unsafe_allow_html=True
-    )
-
-    # Calculate statistics based on current filter
-    col1, col2 = st.columns(2)
-
-    # Get female and male subsets for comparisons
-    df_female_subset = df_all[df_all["Gender"] == "Female"]
-    df_male_subset = df_all[df_all["Gender"] == "Male"]
-
-    # Calculate key metrics from current filtered data
-    current_depression = (df_filtered["Depression"] == "Yes").mean() * 100
-    current_distress = (df_filtered["Mental_Health_Days_Clean"] >= 14).mean() * 100
-    current_uninsured = (df_filtered["Has_Insurance"] == "No").mean() * 100
-    current_cost = (df_filtered["Cost_Barrier"] == "Yes").mean() * 100
-    current_avg_days = df_filtered["Mental_Health_Days_Clean"].mean()
-
-    # Get comparison metrics
-    female_depression = (df_female_subset["Depression"] == "Yes").mean() * 100
-    male_depression = (df_male_subset["Depression"] == "Yes").mean() * 100
-
-    with col1:
-        if gender_filter == "Female Veterans Only":
-            st.markdown(
-                f"""
-            <div class="warning-box">
-            <h4>🔴 Critical Findings - Female Veterans</h4>
-            <ul>
-            <li><strong>Depression Rate:</strong> {current_depression:.1f}% (vs {male_depression:.1f}% in males = {current_depression / male_depression:.1f}x higher)</li>
-            <li><strong>Frequent Mental Distress:</strong> {current_distress:.1f}% experience ≥14 days/month</li>
-            <li><strong>Average Mental Health Days:</strong> {current_avg_days:.1f} days per month</li>
-            <li><strong>Uninsured:</strong> {current_uninsured:.1f}%</li>
-            <li><strong>Cost Barriers:</strong> {current_cost:.1f}% report barriers to care</li>
-            </ul>
-            </div>
-            """,
-                unsafe_allow_html=True,
-            )
-
-        elif gender_filter == "Male Veterans Only":
-            st.markdown(
-                f"""
-            <div class="insight-box">
-            <h4>🔵 Key Findings - Male Veterans</h4>
-            <ul>
-            <li><strong>Depression Rate:</strong> {current_depression:.1f}% (vs {female_depression:.1f}% in females)</li>
-            <li><strong>Frequent Mental Distress:</strong> {current_distress:.1f}% experience ≥14 days/month</li>
-            <li><strong>Average Mental Health Days:</strong> {current_avg_days:.1f} days per month</li>
-            <li><strong>Uninsured:</strong> {current_uninsured:.1f}%</li>
-            <li><strong>Cost Barriers:</strong> {current_cost:.1f}% report barriers to care</li>
-            </ul>
-            </div>
-            """,
-                unsafe_allow_html=True,
-            )
-
-        elif gender_filter == "All Veterans":
-            st.markdown(
-                f"""
-            <div class="insight-box">
-            <h4> Key Findings - All Veterans</h4>
-            <ul>
-            <li><strong>Overall Depression Rate:</strong> {current_depression:.1f}%</li>
-            <li><strong>Female vs Male:</strong> {female_depression:.1f}% vs {male_depression:.1f}% ({female_depression / male_depression:.1f}x ratio)</li>
-            <li><strong>Frequent Mental Distress:</strong> {current_distress:.1f}% experience ≥14 days/month</li>
-            <li><strong>Average Mental Health Days:</strong> {current_avg_days:.1f} days per month</li>
-            <li><strong>Total Sample:</strong> {len(df_filtered):,} veterans</li>
-            </ul>
-            </div>
-            """,
-                unsafe_allow_html=True,
-            )
-
-        else:  # Compare Genders
-            female_distress = (
-                df_female_subset["Mental_Health_Days_Clean"] >= 14
-            ).mean() * 100
-            male_distress = (
-                df_male_subset["Mental_Health_Days_Clean"] >= 14
-            ).mean() * 100
-            female_avg = df_female_subset["Mental_Health_Days_Clean"].mean()
-            male_avg = df_male_subset["Mental_Health_Days_Clean"].mean()
-
-            st.markdown(
-                f"""
-            <div class="warning-box">
-            <h4>⚖️ Gender Comparison - Key Disparities</h4>
-            <ul>
-            <li><strong>Depression:</strong> Female {female_depression:.1f}% vs Male {male_depression:.1f}% 
-                <span style="color: red;">({female_depression / male_depression:.2f}x higher)</span></li>
-            <li><strong>Frequent Distress:</strong> Female {female_distress:.1f}% vs Male {male_distress:.1f}% 
-                <span style="color: red;">({female_distress / male_distress:.2f}x higher)</span></li>
-            <li><strong>Avg Mental Health Days:</strong> Female {female_avg:.1f} vs Male {male_avg:.1f} days</li>
-            <li><strong>Sample Sizes:</strong> {len(df_female_subset):,} female, {len(df_male_subset):,} male</li>
-            </ul>
-            </div>
-            """,
-                unsafe_allow_html=True,
-            )
-
-    with col2:
-        st.markdown(
-            """
-        <div class="success-box">
-        <h4> Protective Factors Identified</h4>
-        <ul>
-        <li><strong>Emotional Support:</strong> Strongest protective factor (8-9x effect when "always" vs "never" available)</li>
-        <li><strong>Economic Stability:</strong> 4.3x difference between highest and lowest income groups</li>
-        <li><strong>Healthcare Access:</strong> Insurance coverage significantly reduces mental health burden</li>
-        <li><strong>Employment:</strong> Employed veterans show substantially lower distress levels</li>
-        <li><strong>Social Connections:</strong> Life satisfaction strongly correlates with mental health</li>
-        </ul>
-        </div>
-        """,
-            unsafe_allow_html=True,
-        )
-
-    # Quantitative insights section
-    st.markdown("### Key Statistics from Current Selection")
-
-    col1, col2, col3, col4 = st.columns(4)
-
-    with col1:
-        st.metric("Sample Size", f"{len(df_filtered):,}", f"{gender_filter.split()[0]}")
-
-    with col2:
-        st.metric(
-            "Depression Rate",
-            f"{current_depression:.1f}%",
-            f"{current_distress:.1f}% frequent distress",
-        )
-
-    with col3:
-        st.metric("Avg Mental Health Days", f"{current_avg_days:.1f}", "days per month")
-
-    with col4:
-        states_in_sample = df_filtered["State_Name"].nunique()
-        st.metric("Geographic Coverage", f"{states_in_sample}", "states/territories")
-
-    # Data quality metrics
-    st.markdown("### Analysis Overview")
-
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.markdown("""
-        **Dataset Characteristics:**
-        - Source: CDC BRFSS 2024
-        - Survey Variables: 303 features
-        - Mental Health Focus: Primary outcome
-        - Comparison: Female vs Male veterans
-        """)
-
-    with col2:
-        st.markdown("""
-        **Key Analyses Performed:**
-        - Socioeconomic gradient analysis
-        - Geographic disparity assessment  
-        - Protective factor identification
-        - Predictive modeling (87% accuracy)
-        """)
-
-elif page == "Recommendations":
-    st.markdown(
-        '<div class="sub-header">Evidence-Based Recommendations</div>',
-        unsafe_allow_html=True,
-    )
-
-    # Introduction with key stats
-    st.markdown(
-        f"""
-        <div class="insight-box">
-        <h4> Analysis Foundation</h4>
-        <p>Based on comprehensive analysis of <strong>{len(df_all):,} veterans</strong> 
-        ({len(df_all[df_all["Gender"] == "Female"]):,} female, {len(df_all[df_all["Gender"] == "Male"]):,} male) 
-        from CDC BRFSS 2024.</p>
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
-
-    st.markdown("### Priority Interventions")
-    st.markdown("Four evidence-based strategies with the highest potential impact:")
-
-    # Create 2x2 grid for interventions
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.markdown(
-            """
-            <div class="success-box">
-            <h4>1️⃣ Social Support Programs</h4>
-            <p><strong>Impact Level:</strong>  Highest</p>
-            <ul>
-            <li><strong>Evidence:</strong> 8-9x protective effect demonstrated</li>
-            <li><strong>Target:</strong> Peer support networks, mentorship programs</li>
-            <li><strong>Expected Outcome:</strong> 25-35% reduction in mental health burden</li>
-            <li><strong>Implementation:</strong> 6-12 months</li>
-            </ul>
-            <p><em>Strongest protective factor identified in analysis</em></p>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
-
-        st.markdown(
-            """
-            <div class="insight-box">
-            <h4>3️⃣ Economic Stability Initiatives</h4>
-            <p><strong>Impact Level:</strong>  High</p>
-            <ul>
-            <li><strong>Evidence:</strong> 4.3x gradient between income levels</li>
-            <li><strong>Target:</strong> Employment support, financial counseling</li>
-            <li><strong>Expected Outcome:</strong> Reach 5,000+ veterans annually</li>
-            <li><strong>Implementation:</strong> 12-18 months</li>
-            </ul>
-            <p><em>Addresses root cause of mental health disparities</em></p>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
-
-    with col2:
-        st.markdown(
-            """
-            <div class="warning-box">
-            <h4>2️⃣ Healthcare Access Expansion</h4>
-            <p><strong>Impact Level:</strong>  Very High</p>
-            <ul>
-            <li><strong>Evidence:</strong> 2.8x higher burden among uninsured</li>
-            <li><strong>Target:</strong> Telehealth expansion, cost barrier reduction</li>
-            <li><strong>Expected Outcome:</strong> 30% increase in care utilization</li>
-            <li><strong>Implementation:</strong> 6-9 months</li>
-            </ul>
-            <p><em>Immediate impact on access to care</em></p>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
-
-        st.markdown(
-            """
-            <div class="insight-box">
-            <h4>4️⃣ Geographic Targeting</h4>
-            <p><strong>Impact Level:</strong>  High</p>
-            <ul>
-            <li><strong>Evidence:</strong> 2.7x variation between states</li>
-            <li><strong>Target:</strong> High-burden states from analysis</li>
-            <li><strong>Expected Outcome:</strong> Regional equity improvement</li>
-            <li><strong>Implementation:</strong> 12-24 months</li>
-            </ul>
-            <p><em>Focused resources where most needed</em></p>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
-
-    # Implementation roadmap
-    st.markdown("---")
-    st.markdown("###  Implementation Roadmap")
-
-    # Create tabs for timeline
-    tab1, tab2, tab3 = st.tabs(
-        ["Phase 1: 0-6 Months", "Phase 2: 6-12 Months", "Phase 3: 12-24 Months"]
-    )
-
-    with tab1:
-        st.markdown(
-            """
-            <div class="success-box">
-            <h4> Immediate Actions</h4>
-            <ul>
-            <li><strong>Healthcare Access:</strong> Launch telehealth pilot programs</li>
-            <li><strong>Social Support:</strong> Establish peer support network infrastructure</li>
-            <li><strong>Data Collection:</strong> Implement continuous monitoring system</li>
-            <li><strong>Stakeholder Engagement:</strong> Form partnerships with VA, community organizations</li>
-            </ul>
-            <p><strong>Expected Reach:</strong> 2,000+ veterans</p>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
-
-    with tab2:
-        st.markdown(
-            """
-            <div class="warning-box">
-            <h4> Scaling Up</h4>
-            <ul>
-            <li><strong>Social Support:</strong> Expand peer networks to all high-burden states</li>
-            <li><strong>Healthcare:</strong> Full telehealth deployment + cost assistance programs</li>
-            <li><strong>Economic:</strong> Launch employment support and financial counseling</li>
-            <li><strong>Evaluation:</strong> Mid-point assessment and course correction</li>
-            </ul>
-            <p><strong>Expected Reach:</strong> 8,000+ veterans</p>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
-
-    with tab3:
-        st.markdown(
-            """
-            <div class="insight-box">
-            <h4> Full Implementation</h4>
-            <ul>
-            <li><strong>Geographic Targeting:</strong> Focused interventions in highest-burden states</li>
-            <li><strong>Sustainability:</strong> Transition to self-sustaining programs</li>
-            <li><strong>Policy Advocacy:</strong> Use findings to inform national policy</li>
-            <li><strong>Comprehensive Evaluation:</strong> Final impact assessment and reporting</li>
-            </ul>
-            <p><strong>Expected Reach:</strong> 15,000+ veterans nationwide</p>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
-
-    # Key metrics
-    st.markdown("---")
-    st.markdown("###  Success Metrics")
-
-    metric_col1, metric_col2, metric_col3, metric_col4 = st.columns(4)
-
-    with metric_col1:
-        st.metric(
-            "Target Reduction",
-            "25-35%",
-            "Mental health burden",
-        )
-
-    with metric_col2:
-        st.metric(
-            "Veterans Reached",
-            "15,000+",
-            "Over 24 months",
-        )
-
-    with metric_col3:
-        st.metric(
-            "Care Utilization",
-            "+30%",
-            "Healthcare access",
-        )
-
-    with metric_col4:
-        st.metric(
-            "ROI Expected",
-            "$3-5",
-            "Per $1 invested",
-        )
-
-    # Call to action
-    st.markdown("---")
-    st.markdown(
-        """
-        <div class="success-box">
-        <h4> Next Steps</h4>
-        <p><strong>For Policymakers:</strong> Use these findings to inform veteran mental health initiatives</p>
-        <p><strong>For Healthcare Providers:</strong> Prioritize social support and access interventions</p>
-        <p><strong>For Researchers:</strong> Continue monitoring and evaluation of implemented programs</p>
-        <p><strong>For Advocates:</strong> Champion these evidence-based approaches in your communities</p>
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
+render_page(
+    page,
+    ViewContext(
+        store=data_store,
+        df_all=df_all,
+        df_filtered=df_filtered,
+        gender_filter=gender_filter,
+        facets=selections,
+    ),
+)
 
 # Footer
 st.markdown("---")
 st.markdown(
     f"""
 <div style='text-align: center; color: #666; padding: 2rem 0;'>
-    <p><strong>Real CDC Data</strong> | {len(df_all):,} Total Veterans 
-    ({len(df_all[df_all["Gender"] == "Female"]):,} Female | {len(df_all[df_all["Gender"] == "Male"]):,} Male)
+    <p><strong>Real CDC Data</strong> | {dataset["rows"]:,} Total Veterans 
+    ({dataset["genders"]["Female"]:,} Female | {dataset["genders"]["Male"]:,} Male)
     <strong>Fall 2025</strong> | Author: <strong>Dave S</strong></p>
     <p style='margin-top: 1rem; font-size: 0.9rem;'>
         Crisis Support: <strong>Veterans Crisis Line: 1-800-273-8255 (Press 1)</strong>
@@ -1853,3 +235,5 @@ st.markdown(
 """,
     unsafe_allow_html=True,
 )
+
+profiling.record("full run", run_started)
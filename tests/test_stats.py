@@ -0,0 +1,107 @@
+"""
+Significance tests against scipy reference results, and gender disparity
+tests on selections missing one or both genders
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats as sps
+
+from dashboard import stats
+
+# Small fixed sample: days and depression answers per gender, with weights
+FEMALE_DAYS = [0, 2, 5, 14, 30, 3, 0, 20, 7, 1]
+MALE_DAYS = [0, 0, 1, 4, 30, 2, 0, 0, 14, 5, 3, 0]
+FEMALE_DEPRESSED = [1, 0, 1, 1, 1, 0, 0, 1, 0, 0]
+MALE_DEPRESSED = [0, 0, 0, 1, 1, 0, 0, 0, 1, 0, 0, 0]
+FEMALE_WEIGHTS = [1.0, 2.0, 0.5, 3.0, 1.5, 1.0, 4.0, 0.8, 1.2, 2.5]
+MALE_WEIGHTS = [2.0, 1.0, 1.0, 0.5, 3.0, 2.2, 1.0, 1.4, 0.7, 1.0, 2.0, 1.6]
+
+
+def _frame(genders):
+    n = len(genders)
+    return pd.DataFrame(
+        {
+            "State_Name": ["Ohio"] * n,
+            "Gender": genders,
+            "_LLCPWT": [1.0] * n,
+            "Mental_Health_Days_Clean": [float(i) for i in range(n)],
+            "Depression": ["Yes", "No"] * (n // 2) + ["Yes"] * (n % 2),
+        }
+    )
+
+
+def _sample():
+    return pd.DataFrame(
+        {
+            "State_Name": "Ohio",
+            "Gender": ["Female"] * len(FEMALE_DAYS) + ["Male"] * len(MALE_DAYS),
+            "_LLCPWT": FEMALE_WEIGHTS + MALE_WEIGHTS,
+            "Mental_Health_Days_Clean": np.array(FEMALE_DAYS + MALE_DAYS, float),
+            "Depression": np.where(
+                np.array(FEMALE_DEPRESSED + MALE_DEPRESSED) == 1, "Yes", "No"
+            ),
+        }
+    )
+
+
+def _overall(metric):
+    result = stats.gender_disparity_tests(_sample())
+    return result[(result["State"] == "All") & (result["Metric"] == metric)].iloc[0]
+
+
+def test_ztest_matches_uncorrected_chi_square():
+    z, p = stats.two_proportion_ztest(5, 10, 3, 12)
+    chi2, p_ref, _, _ = sps.chi2_contingency([[5, 5], [3, 9]], correction=False)
+    assert z**2 == pytest.approx(chi2)
+    assert p == pytest.approx(p_ref)
+    assert _overall("Depression (%)")["p"] == pytest.approx(p_ref)
+
+
+def test_weighted_chi_square_uses_kish_effective_sizes():
+    w_f, w_m = np.array(FEMALE_WEIGHTS), np.array(MALE_WEIGHTS)
+    neff_f, neff_m = w_f.sum() ** 2 / (w_f**2).sum(), w_m.sum() ** 2 / (w_m**2).sum()
+    p_f = np.average(FEMALE_DEPRESSED, weights=w_f)
+    p_m = np.average(MALE_DEPRESSED, weights=w_m)
+    table = [[p_f * neff_f, (1 - p_f) * neff_f], [p_m * neff_m, (1 - p_m) * neff_m]]
+    chi2_ref, p_ref, _, _ = sps.chi2_contingency(table, correction=False)
+    chi2, p = stats.weighted_chi_square(p_f, neff_f, p_m, neff_m)
+    assert chi2 == pytest.approx(chi2_ref)
+    assert p == pytest.approx(p_ref)
+    assert _overall("Depression (%)")["p_weighted"] == pytest.approx(p_ref)
+
+
+def test_welch_ttest_matches_scipy():
+    f, m = np.array(FEMALE_DAYS, float), np.array(MALE_DAYS, float)
+    reference = sps.ttest_ind(f, m, equal_var=False)
+    t, _, p = stats.welch_ttest(
+        f.mean(), f.var(ddof=1), len(f), m.mean(), m.var(ddof=1), len(m)
+    )
+    assert t == pytest.approx(reference.statistic)
+    assert p == pytest.approx(reference.pvalue)
+    row = _overall("Avg Mental Health Days")
+    assert row["Statistic"] == pytest.approx(reference.statistic)
+    assert row["p"] == pytest.approx(reference.pvalue)
+
+
+def test_benjamini_hochberg_matches_scipy():
+    p = np.array([0.01, 0.04, 0.03, 0.005, 0.2, 0.8, 0.012])
+    np.testing.assert_allclose(
+        stats.benjamini_hochberg(p), sps.false_discovery_control(p)
+    )
+    q = stats.benjamini_hochberg([0.01, np.nan, 0.04, 0.03, 0.005])
+    np.testing.assert_allclose(q, [0.02, np.nan, 0.04, 0.04, 0.02])
+
+
+def test_empty_selection_returns_no_rows():
+    result = stats.gender_disparity_tests(_frame([]))
+    assert result.empty
+    assert {"State", "Metric", "Female", "Male", "q"} <= set(result.columns)
+
+
+def test_one_gender_keeps_overall_rows():
+    result = stats.gender_disparity_tests(_frame(["Female"] * 4))
+    overall = result[result["State"] == "All"]
+    assert len(overall) == len(stats.RATE_OUTCOMES) + 1
+    assert (overall["n_Male"] == 0).all()
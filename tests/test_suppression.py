@@ -0,0 +1,144 @@
+"""
+Small-cell suppression invariants on skewed synthetic tables
+
+- no published cell describes between 1 and min_n - 1 respondents
+- no published total has exactly one hidden cell under it, unless all its
+  other cells are empty
+- empty cells are never hidden and min_n 0 hides nothing
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard import hierarchy, suppression
+from dashboard.constants import METRO_STATUS, STATE_CODES, URBAN_STATUS
+
+MIN_N = 10
+
+TABLES = [
+    ["State"],
+    ["State", "Gender"],
+    ["Age", "Gender"],
+    ["State", "Gender", "Age"],
+    ["State", "Gender", "Age", "Income"],
+]
+
+
+def skewed_codes(rng, size, rows):
+    p = rng.pareto(1.5, size) + 0.05
+    return rng.choice(size, rows, p=p / p.sum())
+
+
+@pytest.fixture(scope="module")
+def respondents():
+    rng = np.random.default_rng(0)
+    levels = {"State": 54, "Gender": 2, "Age": 13, "Income": 6}
+    columns = {
+        column: skewed_codes(rng, size, 50_000) for column, size in levels.items()
+    }
+    columns["Days"] = rng.integers(0, 31, 50_000).astype(float)
+    return pd.DataFrame(columns)
+
+
+def assert_protected(counts, hidden, groups):
+    """No small published cell, no empty hidden cell, no group with one hidden"""
+    counts = np.asarray(counts)
+    assert not ((counts > 0) & (counts < MIN_N) & ~hidden).any(), "small cell"
+    assert not (hidden & (counts == 0)).any(), "empty cell hidden"
+    for cells in groups:
+        if hidden[cells].sum() == 1:
+            assert (counts[cells][~hidden[cells]] == 0).all(), "total reveals a cell"
+
+
+@pytest.mark.parametrize("keys", TABLES, ids=" x ".join)
+def test_suppress_protects_table_margins(respondents, keys):
+    grouped = respondents.groupby(keys)["Days"].agg(["mean", "count"]).reset_index()
+    table = suppression.suppress(
+        grouped, "count", ["mean"], suppression.margins(keys), MIN_N
+    )
+    hidden = table["suppressed"].to_numpy()
+    groups = []
+    for total in suppression.margins(keys):
+        if total:
+            groups += list(grouped.groupby(total).indices.values())
+        else:
+            groups.append(np.arange(len(grouped)))
+    assert_protected(grouped["count"].to_numpy(), hidden, groups)
+    assert table.loc[hidden, ["count", "mean"]].isna().all().all()
+
+
+def test_suppress_min_n_zero_hides_nothing(respondents):
+    counts = respondents.groupby(["State", "Age"]).size().to_numpy()
+    assert not suppression.hide(counts, min_n=0).any()
+
+
+def test_note_names_the_threshold_used():
+    assert suppression.note(np.zeros(3, dtype=bool)) is None
+    hidden = suppression.hide([50, 3, 40], np.zeros(3, int), np.arange(3), min_n=5)
+    assert "2 group(s) with fewer than 5 respondents" in suppression.note(hidden, 5)
+    assert f"fewer than {suppression.MIN_CELL_SIZE} " in suppression.note(hidden)
+
+
+def test_hide_grid_adds_row_and_column_complements():
+    hidden = suppression.hide_grid(
+        [[50, 3, 40], [20, 30, 25]], axes=(0, 1), min_n=MIN_N
+    )
+    assert hidden[0, 1] and hidden.sum() == 4
+    assert (hidden.sum(axis=1) != 1).all() and (hidden.sum(axis=0) != 1).all()
+
+
+@pytest.mark.parametrize("axes", [(), (0,), (1,), (0, 1)])
+def test_hide_grid_protects_published_totals(axes):
+    rng = np.random.default_rng(1)
+    counts = rng.poisson(rng.pareto(1.0, (13, 4)) * 8)
+    hidden = suppression.hide_grid(counts, axes=axes, min_n=MIN_N)
+    rows, columns = np.indices(counts.shape)
+    groups = []
+    for axis in axes or (None,):
+        ids = {None: np.zeros_like(rows), 0: columns, 1: rows}[axis]
+        groups += [ids.ravel() == i for i in np.unique(ids)]
+    assert_protected(counts.ravel(), hidden.ravel(), groups)
+
+
+def test_hide_grid_empty():
+    assert suppression.hide_grid(np.zeros((0, 2))).shape == (0, 2)
+
+
+def test_hierarchy_suppress_protects_parents_and_genders():
+    rng = np.random.default_rng(2)
+    rows = 5_000
+    states = list(dict.fromkeys(STATE_CODES.values()))
+    df = pd.DataFrame(
+        {
+            "State_Name": np.array(states)[skewed_codes(rng, len(states), rows)],
+            "_METSTAT": rng.choice([*METRO_STATUS, np.nan], rows, p=[0.7, 0.28, 0.02]),
+            "_URBSTAT": rng.choice([*URBAN_STATUS, np.nan], rows, p=[0.8, 0.18, 0.02]),
+            "Gender": rng.choice(["Female", "Male"], rows, p=[0.2, 0.8]),
+            "Mental_Health_Days_Clean": rng.integers(0, 31, rows).astype(float),
+            "Depression": rng.choice(["Yes", "No"], rows),
+        }
+    )
+    tree = hierarchy.build_tree(df)
+    for state in [None, *hierarchy.states(tree)[:10]]:
+        drilldown = hierarchy.drilldown(tree, state)
+        shown = hierarchy.suppress(drilldown, MIN_N)
+        counts = drilldown["n"].to_numpy()
+        hidden = shown["suppressed"].to_numpy()
+        n_genders = 3
+        node = np.arange(len(drilldown)) // n_genders
+        slot = np.arange(len(drilldown)) % n_genders
+        levels = drilldown["Level"].to_numpy()
+        # Each node's "All" row is the total of its gender rows
+        groups = [node == i for i in np.unique(node)]
+        # Each parent row is the total of its children's rows, per gender
+        parents, latest = np.full(len(drilldown), -1), {}
+        for i, level in enumerate(levels):
+            latest[level] = node[i]
+            parents[i] = latest[level - 1] if level else -1
+        for parent in np.unique(parents[parents >= 0]):
+            for g in range(n_genders):
+                children = (parents == parent) & (slot == g)
+                groups.append(children | ((node == parent) & (slot == g)))
+        assert_protected(counts, hidden, groups)
+        assert shown.loc[hidden, "Mean_Days"].isna().all()